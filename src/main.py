@@ -25,8 +25,7 @@ def main() -> None:
     if not check_audio_with_prompt():
         sys.exit(1)
 
-    file_path = sys.argv[1] if len(sys.argv) > 1 else None
-    main_window = ApplicationWindow(file_path)
+    main_window = ApplicationWindow(sys.argv[1:])
     main_window.resize(1280, 720)
     main_window.show()
 
@@ -1,5 +1,11 @@
 import logging
+import os
+import threading
+from collections import OrderedDict
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from PySide6 import QtCore, QtMultimedia
@@ -7,8 +13,23 @@ from PySide6.QtMultimedia import QMediaPlayer
 from PySide6.QtMultimediaWidgets import QGraphicsVideoItem
 from PySide6.QtWidgets import QApplication
 
+from playback_clock import PlaybackClock
+from playlist import Playlist, expand_media_paths
+from resume_store import ResumePosition, ResumeStore, file_key
+from seek_engine import SeekEngine
+from settings.setting_keys import SettingKeys
+from settings.settings_manager import settings_manager
 from subtitle.subtitle import Subtitle
-from subtitle.subtitle_loader import load_subtitles
+from subtitle.subtitle_loader import (
+    SubtitleTrack,
+    find_subtitle_tracks,
+    load_subtitle_track,
+    split_subdirectories,
+)
+from subtitle.subtitle_reloader import SubtitleReloader
+from subtitle.subtitle_search_index import SubtitleSearchIndex
+from subtitle.subtitle_timing import SubtitleTiming, subtitle_timing_store
+from thumbnail.thumbnail_provider import ThumbnailProvider
 
 logger = logging.getLogger(__name__)
 
@@ -29,14 +50,82 @@ if TYPE_CHECKING:
     from widgets.video_display import VideoDisplay
 
 
-class MediaController:
+SUBTITLE_TRACK_CACHE_SIZE = 8
+# Previous restarts the current item unless it has only just begun
+PREVIOUS_RESTART_MS = 3000
+# Positions are remembered past the opening and short of the end only
+RESUME_MIN_MS = 10_000
+RESUME_END_MARGIN_MS = 30_000
+RESUME_CHECKPOINT_MS = 1000
+
+_subtitle_executor = ThreadPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="subtitle-loader"
+)
+
+
+class MediaController(QtCore.QObject):
+    subtitles_changed = QtCore.Signal(object)
+    subtitle_timing_changed = QtCore.Signal(object)
+    subtitle_tracks_changed = QtCore.Signal()
+    search_index_changed = QtCore.Signal(object)
+    _subtitle_tracks_found = QtCore.Signal(int, object, object)
+    _subtitles_loaded = QtCore.Signal(int, object, object)
+    _search_index_built = QtCore.Signal(int, object, object)
+    _prefetch_tracks_found = QtCore.Signal(int, object, object)
+    _prefetch_subtitles_loaded = QtCore.Signal(int, object, object)
+
     def __init__(self, video_item: QGraphicsVideoItem) -> None:
+        super().__init__()
         self.mediaPlayer = QtMultimedia.QMediaPlayer()
         self.audioOutput = QtMultimedia.QAudioOutput()
         self.audioOutput.setVolume(1.0)
         self.mediaPlayer.setAudioOutput(self.audioOutput)
         self.mediaPlayer.setVideoOutput(video_item)
-        self.subtitles = None
+        self.playback_clock = PlaybackClock(self.mediaPlayer, self)
+        self.seek_engine = SeekEngine(self.mediaPlayer, self.playback_clock, self)
+        self.thumbnail_provider = ThumbnailProvider(self)
+        self.mediaPlayer.durationChanged.connect(self.thumbnail_provider.set_duration)
+        self.mediaPlayer.mediaStatusChanged.connect(self._on_media_status_changed)
+
+        self.resume_store = ResumeStore(parent=self)
+        self._resume_key: str | None = None
+        self._pending_resume_ms: int | None = None
+        self.playback_clock.subscribe(self._checkpoint_position, RESUME_CHECKPOINT_MS)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._save_position_on_exit)
+
+        # Plays nothing; it opens and probes the next playlist item ahead of time
+        self.playlist = Playlist(self)
+        self._preload_player = QtMultimedia.QMediaPlayer(self)
+        self._preload_player.mediaStatusChanged.connect(self._on_preload_status_changed)
+        self._preload_path: str | None = None
+        self._prefetch_generation = 0
+        # Prefetched subtitle loads by track, with the media they were found
+        # for; they outlive load_media when it switches to that media
+        self._prefetch_loads: dict[SubtitleTrack, tuple[str, Future[object]]] = {}
+        self._prefetch_cancel_events: dict[str, threading.Event] = {}
+        self._prefetch_tracks_found.connect(self._on_prefetch_tracks_found)
+        self._prefetch_subtitles_loaded.connect(self._on_prefetch_subtitles_loaded)
+        self.subtitles: Subtitle | None = None
+
+        self._subtitle_generation = 0
+        self._subtitle_cancel_event = threading.Event()
+        self._subtitle_futures: list[Future[object]] = []
+        self._subtitles_loaded.connect(self._on_subtitles_loaded)
+        self._subtitle_tracks_found.connect(self._on_subtitle_tracks_found)
+
+        self.subtitle_tracks: list[SubtitleTrack] = []
+        self._loaded_subtitle_tracks: dict[SubtitleTrack, Subtitle | None] = {}
+        self._selected_subtitle_track: SubtitleTrack | None = None
+        self._subtitle_track_cache: OrderedDict[SubtitleTrack, Subtitle] = OrderedDict()
+        self.subtitle_reloader = SubtitleReloader(self)
+        self.subtitle_reloader.subtitles_replaced.connect(self._on_subtitles_replaced)
+        self.subtitle_reloader.subtitles_patched.connect(self._build_search_index)
+
+        self.search_index: SubtitleSearchIndex | None = None
+        self._search_index_generation = 0
+        self._search_index_built.connect(self._on_search_index_built)
 
         self.mpris = None
         if MPRIS_AVAILABLE:
@@ -55,11 +144,30 @@ class MediaController:
         self.mediaPlayer.mediaStatusChanged.connect(
             lambda status: video_display.set_media_status(status)
         )
-        self.mediaPlayer.positionChanged.connect(
-            lambda pos: video_display.update_subtitle(pos, self.subtitles)
+        subtitle_scheduler = video_display.subtitle_scheduler
+        self.playback_clock.subscribe(subtitle_scheduler.check_position)
+        for clock_signal in (
+            self.mediaPlayer.playbackStateChanged,
+            self.mediaPlayer.mediaStatusChanged,
+            self.mediaPlayer.playbackRateChanged,
+        ):
+            clock_signal.connect(
+                lambda _: subtitle_scheduler.set_clock(
+                    self.mediaPlayer.position(),
+                    self._is_media_advancing(),
+                    self.mediaPlayer.playbackRate(),
+                )
+            )
+        self.subtitles_changed.connect(
+            lambda subtitles: video_display.set_subtitles(
+                subtitles, self.mediaPlayer.position()
+            )
+        )
+        self.subtitle_timing_changed.connect(
+            lambda _: subtitle_scheduler.sync(self.mediaPlayer.position())
         )
-        self.mediaPlayer.positionChanged.connect(
-            lambda pos: video_controls.set_current_time(pos / 1000)
+        self.subtitle_reloader.subtitles_patched.connect(
+            lambda _: video_display.refresh_subtitles(self.mediaPlayer.position())
         )
         self.mediaPlayer.durationChanged.connect(
             lambda dur: video_controls.set_duration(dur / 1000)
@@ -76,16 +184,387 @@ class MediaController:
             lambda: self.on_metadata_update(set_main_window_title)
         )
 
+    def play_files(self, paths: list[str]) -> None:
+        media_paths = expand_media_paths(paths)
+        if media_paths:
+            self.playlist.set_items(media_paths)
+            self.load_media(media_paths[0])
+
+    def next_track(self) -> None:
+        file_path = self.playlist.advance(1)
+        if file_path is not None:
+            self.load_media(file_path)
+
+    def previous_track(self) -> None:
+        file_path = self.playlist.peek(-1)
+        if file_path is None or self.mediaPlayer.position() > PREVIOUS_RESTART_MS:
+            self.seek_engine.seek_to(0)
+        else:
+            self.playlist.advance(-1)
+            self.load_media(file_path)
+
     def load_media(self, file_path: str) -> None:
+        self._checkpoint_position()
+        self._resume_key = file_key(Path(file_path))
+        self._pending_resume_ms = self._stored_resume_position()
+        self.seek_engine.reset()
+        self._cancel_prefetch(keep={file_path})
+        self.thumbnail_provider.set_media(file_path)
+        if file_path == self._preload_path:
+            # Known from the preload, so cached thumbnails show up right away
+            self.thumbnail_provider.set_duration(self._preload_player.duration())
+        self._preload_path = None
+        self._preload_player.setSource(QtCore.QUrl())
         self.mediaPlayer.setSource(QtCore.QUrl.fromLocalFile(file_path))
-        subs_content = load_subtitles(file_path)
-        if subs_content:
-            self.subtitles = Subtitle(subs_content)
+        self._set_subtitles(None)
+        self._load_subtitles_async(file_path)
 
         if self.mpris:
             self.mpris.update_metadata(file_path)
 
-        self.mediaPlayer.play()
+        # With a stored position, playback starts once the media is loaded and
+        # has been moved there, so the opening frame never shows
+        if self._pending_resume_ms is None:
+            self.mediaPlayer.play()
+
+    def _on_media_status_changed(self, status: QMediaPlayer.MediaStatus) -> None:
+        if status == QMediaPlayer.MediaStatus.LoadedMedia:
+            if self._pending_resume_ms is not None:
+                self.seek_engine.seek_to(self._pending_resume_ms)
+                self._pending_resume_ms = None
+                self.mediaPlayer.play()
+        elif status == QMediaPlayer.MediaStatus.EndOfMedia:
+            if self._resume_key is not None:
+                self.resume_store.forget(self._resume_key)
+            self.next_track()
+        elif status == QMediaPlayer.MediaStatus.BufferedMedia:
+            self._preload_next()
+
+    def _stored_resume_position(self) -> int | None:
+        if self._resume_key is None or not settings_manager.get_bool(
+            SettingKeys.SAVE_POSITION_ON_EXIT
+        ):
+            return None
+        stored = self.resume_store.load(self._resume_key)
+        if stored is None or stored.position_ms < RESUME_MIN_MS:
+            return None
+        if stored.position_ms > stored.duration_ms - RESUME_END_MARGIN_MS:
+            return None
+        return stored.position_ms
+
+    def _checkpoint_position(self, _position_ms: int = 0) -> None:
+        # Only the newest position per file is kept in memory; the store
+        # writes them out in batches. A seek on its way counts as arrived.
+        if self._resume_key is None or self._pending_resume_ms is not None:
+            return
+        if not settings_manager.get_bool(SettingKeys.SAVE_POSITION_ON_EXIT):
+            return
+        duration_ms = self.mediaPlayer.duration()
+        if duration_ms <= 0:
+            return
+        position_ms = self.seek_engine.target_ms()
+        if RESUME_MIN_MS <= position_ms <= duration_ms - RESUME_END_MARGIN_MS:
+            self.resume_store.record(
+                self._resume_key, ResumePosition(position_ms, duration_ms)
+            )
+        else:
+            self.resume_store.forget(self._resume_key)
+
+    def _save_position_on_exit(self) -> None:
+        self._checkpoint_position()
+        self.resume_store.close()
+
+    def _preload_next(self) -> None:
+        # Warms up the next item while this one plays: the second player opens
+        # and probes it, and its subtitles are parsed into the track cache
+        file_path = self.playlist.peek(1)
+        if file_path is None or file_path == self._preload_path:
+            return
+        self._preload_path = file_path
+        self._preload_player.setSource(QtCore.QUrl.fromLocalFile(file_path))
+
+        self._prefetch_generation += 1
+        playing_path = self.mediaPlayer.source().toLocalFile()
+        self._cancel_prefetch(keep={playing_path, file_path})
+        subdirectories = split_subdirectories(
+            settings_manager.get_str(SettingKeys.SUBTITLE_SUBDIRECTORIES)
+        )
+        self._submit_subtitle_job(
+            self._prefetch_generation,
+            self._prefetch_tracks_found,
+            find_subtitle_tracks,
+            file_path,
+            subdirectories,
+        )
+
+    def _on_preload_status_changed(self, status: QMediaPlayer.MediaStatus) -> None:
+        if status == QMediaPlayer.MediaStatus.LoadedMedia:
+            logger.debug(
+                "Preloaded %s (%d ms)",
+                self._preload_path,
+                self._preload_player.duration(),
+            )
+
+    def _on_prefetch_tracks_found(
+        self, generation: int, file_path: str, tracks: list[SubtitleTrack] | None
+    ) -> None:
+        if generation != self._prefetch_generation:
+            return
+        cancel_event = self._prefetch_cancel_events.setdefault(
+            file_path, threading.Event()
+        )
+        for track in tracks or []:
+            if (
+                track not in self._subtitle_track_cache
+                and track not in self._prefetch_loads
+            ):
+                future = self._submit_subtitle_job(
+                    generation,
+                    self._prefetch_subtitles_loaded,
+                    load_subtitle_track,
+                    track,
+                    cancel_event.is_set,
+                )
+                self._prefetch_loads[track] = (file_path, future)
+
+    def _on_prefetch_subtitles_loaded(
+        self, _generation: int, track: SubtitleTrack, subtitles: Subtitle | None
+    ) -> None:
+        # Not tied to a prefetch generation: a load that finishes after playback
+        # moved on to its media is handed to that media's track list
+        if self._prefetch_loads.pop(track, None) is None:
+            return
+        if subtitles is not None:
+            self._cache_subtitle_track(track, subtitles)
+        if track in self.subtitle_tracks and track not in self._loaded_subtitle_tracks:
+            self._loaded_subtitle_tracks[track] = subtitles
+            self._apply_subtitle_track_selection()
+            self.subtitle_tracks_changed.emit()
+
+    def _cancel_prefetch(self, keep: set[str]) -> None:
+        # Drops prefetched loads for media that is neither playing nor up next
+        for track, (media_path, future) in list(self._prefetch_loads.items()):
+            if media_path not in keep:
+                future.cancel()
+                del self._prefetch_loads[track]
+        for media_path in list(self._prefetch_cancel_events):
+            if media_path not in keep:
+                self._prefetch_cancel_events.pop(media_path).set()
+
+    def _cache_subtitle_track(self, track: SubtitleTrack, subtitles: Subtitle) -> None:
+        self._subtitle_track_cache[track] = subtitles
+        self._subtitle_track_cache.move_to_end(track)
+        while len(self._subtitle_track_cache) > SUBTITLE_TRACK_CACHE_SIZE:
+            self._subtitle_track_cache.popitem(last=False)
+
+    def _load_subtitles_async(self, file_path: str) -> None:
+        self._subtitle_cancel_event.set()
+        for future in self._subtitle_futures:
+            future.cancel()
+        self._subtitle_futures = []
+
+        self._subtitle_generation += 1
+        generation = self._subtitle_generation
+        self._subtitle_cancel_event = threading.Event()
+
+        self.subtitle_tracks = []
+        self._loaded_subtitle_tracks = {}
+        self._selected_subtitle_track = None
+        self.subtitle_tracks_changed.emit()
+
+        # Settings are read here because QSettings objects aren't shared across
+        # threads
+        subdirectories = split_subdirectories(
+            settings_manager.get_str(SettingKeys.SUBTITLE_SUBDIRECTORIES)
+        )
+        future = self._submit_subtitle_job(
+            generation,
+            self._subtitle_tracks_found,
+            find_subtitle_tracks,
+            file_path,
+            subdirectories,
+        )
+        self._subtitle_futures.append(future)
+
+    def _submit_subtitle_job(
+        self,
+        generation: int,
+        result_signal: QtCore.SignalInstance,
+        job: Callable[..., object],
+        *args: object,
+    ) -> Future[object]:
+        future = _subtitle_executor.submit(job, *args)
+        future.add_done_callback(
+            lambda future: self._on_subtitle_future_done(
+                generation, result_signal, args[0], future
+            )
+        )
+        return future
+
+    def _on_subtitle_future_done(
+        self,
+        generation: int,
+        result_signal: QtCore.SignalInstance,
+        key: object,
+        future: Future[object],
+    ) -> None:
+        # Runs on the worker thread; the signal queues the result to the GUI thread
+        if future.cancelled():
+            return
+
+        try:
+            result = future.result()
+        except Exception:
+            logger.exception("Failed to load subtitles")
+            result = None
+
+        result_signal.emit(generation, key, result)
+
+    def _on_subtitle_tracks_found(
+        self, generation: int, _file_path: str, tracks: list[SubtitleTrack] | None
+    ) -> None:
+        if generation != self._subtitle_generation:
+            return
+
+        # Every track is loaded up front so switching later is just a lookup
+        self.subtitle_tracks = tracks or []
+        for track in self.subtitle_tracks:
+            subtitle = self._subtitle_track_cache.get(track)
+            if subtitle is not None:
+                self._subtitle_track_cache.move_to_end(track)
+                self._loaded_subtitle_tracks[track] = subtitle
+            elif track not in self._prefetch_loads:
+                # A prefetch still loading this track delivers it when done
+                future = self._submit_subtitle_job(
+                    generation,
+                    self._subtitles_loaded,
+                    load_subtitle_track,
+                    track,
+                    self._subtitle_cancel_event.is_set,
+                )
+                self._subtitle_futures.append(future)
+
+        self._apply_subtitle_track_selection()
+        self.subtitle_tracks_changed.emit()
+
+    def _on_subtitles_loaded(
+        self, generation: int, track: SubtitleTrack, subtitles: Subtitle | None
+    ) -> None:
+        if generation != self._subtitle_generation:
+            return
+
+        self._loaded_subtitle_tracks[track] = subtitles
+        if subtitles is not None:
+            self._cache_subtitle_track(track, subtitles)
+
+        self._apply_subtitle_track_selection()
+        self.subtitle_tracks_changed.emit()
+
+    def _apply_subtitle_track_selection(self) -> None:
+        track = self._selected_subtitle_track
+        if track is None:
+            # Default to the first readable track in discovery order, waiting for
+            # earlier tracks to finish so a later one never flashes up first
+            for candidate in self.subtitle_tracks:
+                if candidate not in self._loaded_subtitle_tracks:
+                    return
+                if self._loaded_subtitle_tracks[candidate] is not None:
+                    track = candidate
+                    break
+
+        if track is None:
+            return
+        subtitles = self._loaded_subtitle_tracks.get(track)
+        if subtitles is not None and subtitles is not self.subtitles:
+            self._set_subtitles(subtitles)
+
+    def select_subtitle_track(self, track: SubtitleTrack) -> None:
+        self._selected_subtitle_track = track
+        self._apply_subtitle_track_selection()
+        self.subtitle_tracks_changed.emit()
+
+    def is_subtitle_track_loading(self, track: SubtitleTrack) -> bool:
+        return track not in self._loaded_subtitle_tracks
+
+    def is_subtitle_track_readable(self, track: SubtitleTrack) -> bool:
+        return self._loaded_subtitle_tracks.get(track) is not None
+
+    @property
+    def current_subtitle_track(self) -> SubtitleTrack | None:
+        for track, subtitles in self._loaded_subtitle_tracks.items():
+            if subtitles is not None and subtitles is self.subtitles:
+                return track
+        return None
+
+    def _set_subtitles(self, subtitles: Subtitle | None) -> None:
+        self.subtitles = subtitles
+        self.subtitle_reloader.watch(subtitles)
+        self.subtitles_changed.emit(subtitles)
+        self._build_search_index(subtitles)
+
+    def _build_search_index(self, subtitles: Subtitle | None) -> None:
+        # Built on a worker so that a large file doesn't hold up playback; until
+        # it is ready searching reports that it is still indexing. The worker
+        # gets its own copy of the columns, which patches change in place.
+        self._search_index_generation += 1
+        self.search_index = None
+        self.search_index_changed.emit(None)
+        if subtitles is not None:
+            future = self._submit_subtitle_job(
+                self._search_index_generation,
+                self._search_index_built,
+                SubtitleSearchIndex,
+                subtitles.columns.snapshot(),
+            )
+            self._subtitle_futures.append(future)
+
+    def _on_search_index_built(
+        self, generation: int, _columns: object, index: SubtitleSearchIndex | None
+    ) -> None:
+        if generation != self._search_index_generation:
+            return
+        self.search_index = index
+        self.search_index_changed.emit(index)
+
+    def seek_to_subtitle(self, cue_id: int) -> None:
+        if self.subtitles is None or cue_id >= len(self.subtitles.columns):
+            return
+        start_ms = self.subtitles.columns.start_times[cue_id]
+        self.seek_engine.seek_to(self.subtitles.timing.to_media_time(start_ms))
+
+    def _on_subtitles_replaced(self, old: Subtitle, new: Subtitle) -> None:
+        # The edited file couldn't be patched and was loaded again as a whole
+        for tracks in (self._loaded_subtitle_tracks, self._subtitle_track_cache):
+            for track, subtitles in tracks.items():
+                if subtitles is old:
+                    tracks[track] = new
+        if self.subtitles is old:
+            self._set_subtitles(new)
+        self.subtitle_tracks_changed.emit()
+
+    def adjust_subtitle_delay(self, delta_ms: int) -> None:
+        if self.subtitles:
+            timing = self.subtitles.timing
+            self._set_subtitle_timing(
+                replace(timing, delay_ms=timing.delay_ms + delta_ms)
+            )
+
+    def set_subtitle_rate(self, rate: float) -> None:
+        if self.subtitles:
+            self._set_subtitle_timing(replace(self.subtitles.timing, rate=rate))
+
+    def reset_subtitle_timing(self) -> None:
+        self._set_subtitle_timing(SubtitleTiming())
+
+    def _set_subtitle_timing(self, timing: SubtitleTiming) -> None:
+        # Retiming only swaps the lookup transform, the cue arrays stay as parsed
+        if not self.subtitles or self.subtitles.timing == timing:
+            return
+
+        self.subtitles.timing = timing
+        if self.subtitles.path:
+            subtitle_timing_store.save(self.subtitles.path, timing)
+        self.subtitle_timing_changed.emit(timing)
 
     def on_metadata_update(self, set_main_window_title: Callable[str]) -> None:
         title = (
@@ -103,6 +582,14 @@ class MediaController:
         else:
             self.mediaPlayer.play()
 
+    def _is_media_advancing(self) -> bool:
+        return (
+            self.mediaPlayer.playbackState()
+            == QtMultimedia.QMediaPlayer.PlaybackState.PlayingState
+            and self.mediaPlayer.mediaStatus()
+            != QtMultimedia.QMediaPlayer.MediaStatus.StalledMedia
+        )
+
     @staticmethod
     def is_media_loaded(status: QMediaPlayer.MediaStatus) -> bool:
         return status in (
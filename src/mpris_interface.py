@@ -32,6 +32,9 @@ class MPRISInterface(dbus.service.Object):
         player = media_controller.mediaPlayer
         player.playbackStateChanged.connect(self._on_playback_state_changed)
         player.durationChanged.connect(lambda: self._notify_property("Metadata"))
+        media_controller.playlist.changed.connect(
+            lambda: self._notify_property("CanGoNext", "CanGoPrevious")
+        )
 
     # noinspection PyUnusedLocal
     def _on_playback_state_changed(self, state: QMediaPlayer.PlaybackState) -> None:  # noqa: ARG002
@@ -81,22 +84,20 @@ class MPRISInterface(dbus.service.Object):
 
     @dbus.service.method(dbus_interface=PLAYER_IFACE)
     def Next(self) -> None:  # noqa: N802
-        pass
+        self.media_controller.next_track()
 
     @dbus.service.method(dbus_interface=PLAYER_IFACE)
     def Previous(self) -> None:  # noqa: N802
-        pass
+        self.media_controller.previous_track()
 
     @dbus.service.method(dbus_interface=PLAYER_IFACE, in_signature="x")
     def Seek(self, offset_microseconds: int) -> None:  # noqa: N802
-        player = self.media_controller.mediaPlayer
-        current_pos = player.position() * 1000
-        player.setPosition(int((current_pos + offset_microseconds) / 1000))
+        self.media_controller.seek_engine.seek_by(int(offset_microseconds / 1000))
 
     # noinspection PyUnusedLocal
     @dbus.service.method(dbus_interface=PLAYER_IFACE, in_signature="ox")
     def SetPosition(self, track_id: object, position_microseconds: int) -> None:  # noqa: N802, ARG002
-        self.media_controller.mediaPlayer.setPosition(int(position_microseconds / 1000))
+        self.media_controller.seek_engine.seek_to(int(position_microseconds / 1000))
 
     @dbus.service.method(dbus_interface=PLAYER_IFACE, in_signature="s")
     def OpenUri(self, uri: str) -> None:  # noqa: N802
@@ -174,6 +175,14 @@ class MPRISInterface(dbus.service.Object):
     def CanControl(self) -> bool:  # noqa: N802
         return True
 
+    @property
+    def CanGoNext(self) -> bool:  # noqa: N802
+        return self.media_controller.playlist.peek(1) is not None
+
+    @property
+    def CanGoPrevious(self) -> bool:  # noqa: N802
+        return self.media_controller.playlist.peek(-1) is not None
+
     # D-Bus Properties interface
     # noinspection PyUnusedLocal
     @dbus.service.method(
@@ -197,6 +206,8 @@ class MPRISInterface(dbus.service.Object):
                     "CanPause": self.CanPause,
                     "CanSeek": self.CanSeek,
                     "CanControl": self.CanControl,
+                    "CanGoNext": self.CanGoNext,
+                    "CanGoPrevious": self.CanGoPrevious,
                 },
                 signature="sv",
             )
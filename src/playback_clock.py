@@ -0,0 +1,81 @@
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from PySide6 import QtCore
+
+if TYPE_CHECKING:
+    from PySide6.QtMultimedia import QMediaPlayer
+
+
+class ClockSubscription:
+    # Calls back when the position moves into another step of granularity_ms,
+    # e.g. 1000 for a label showing whole seconds, or on every update when it
+    # is 0. While paused nothing is called; resuming catches up at once.
+
+    __slots__ = ("_active", "_callback", "_clock", "_granularity_ms", "_step")
+
+    def __init__(
+        self,
+        clock: "PlaybackClock",
+        callback: Callable[[int], None],
+        granularity_ms: int,
+    ) -> None:
+        self._clock = clock
+        self._callback = callback
+        self._granularity_ms = granularity_ms
+        self._active = True
+        self._step: int | None = None
+
+    def set_granularity(self, granularity_ms: int) -> None:
+        if granularity_ms != self._granularity_ms:
+            self._granularity_ms = granularity_ms
+            self._step = None
+            self.deliver(self._clock.position_ms)
+
+    def set_active(self, active: bool) -> None:
+        if active == self._active:
+            return
+        self._active = active
+        if active:
+            self._step = None
+            self.deliver(self._clock.position_ms)
+
+    def deliver(self, position_ms: int) -> None:
+        if not self._active:
+            return
+        step = (
+            position_ms // self._granularity_ms if self._granularity_ms else position_ms
+        )
+        if step != self._step:
+            self._step = step
+            self._callback(position_ms)
+
+
+class PlaybackClock(QtCore.QObject):
+    # The single listener of the player's position updates, fanning each one
+    # out to subscribers at the rate they need instead of every one of them
+    # reacting to every update
+
+    def __init__(
+        self, player: "QMediaPlayer", parent: QtCore.QObject | None = None
+    ) -> None:
+        super().__init__(parent)
+        self.position_ms = player.position()
+        self._subscriptions: list[ClockSubscription] = []
+        player.positionChanged.connect(self._on_position_changed)
+
+    def subscribe(
+        self, callback: Callable[[int], None], granularity_ms: int = 0
+    ) -> ClockSubscription:
+        subscription = ClockSubscription(self, callback, granularity_ms)
+        self._subscriptions.append(subscription)
+        subscription.deliver(self.position_ms)
+        return subscription
+
+    def unsubscribe(self, subscription: ClockSubscription) -> None:
+        self._subscriptions.remove(subscription)
+
+    def _on_position_changed(self, position_ms: int) -> None:
+        self.position_ms = position_ms
+        for subscription in self._subscriptions:
+            subscription.deliver(position_ms)
@@ -0,0 +1,62 @@
+import re
+from collections.abc import Iterable
+from pathlib import Path
+
+from PySide6 import QtCore
+
+VIDEO_EXTENSIONS = frozenset({".mp4", ".mkv", ".avi", ".webm", ".mov"})
+
+_DIGITS_PATTERN = re.compile(r"(\d+)")
+
+
+def _natural_key(path: Path) -> list[str | int]:
+    # "Episode 2" sorts before "Episode 10"
+    return [
+        int(part) if part.isdigit() else part.casefold()
+        for part in _DIGITS_PATTERN.split(path.name)
+    ]
+
+
+def expand_media_paths(paths: Iterable[str]) -> list[str]:
+    # Folders stand for the video files directly inside them, in name order
+    media_paths: list[str] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            media_paths.extend(
+                str(child.absolute())
+                for child in sorted(path.iterdir(), key=_natural_key)
+                if child.suffix.lower() in VIDEO_EXTENSIONS and child.is_file()
+            )
+        else:
+            media_paths.append(str(path.absolute()))
+    return media_paths
+
+
+class Playlist(QtCore.QObject):
+    changed = QtCore.Signal()
+
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.items: list[str] = []
+        self.current_index = -1
+
+    def set_items(self, items: list[str], current_index: int = 0) -> None:
+        self.items = items
+        self.current_index = current_index if items else -1
+        self.changed.emit()
+
+    def current(self) -> str | None:
+        return self.peek(0)
+
+    def peek(self, offset: int) -> str | None:
+        index = self.current_index + offset
+        if self.current_index >= 0 and 0 <= index < len(self.items):
+            return self.items[index]
+        return None
+
+    def advance(self, offset: int) -> str | None:
+        item = self.peek(offset)
+        if item is not None:
+            self.current_index += offset
+            self.changed.emit()
+        return item
@@ -0,0 +1,206 @@
+from typing import TYPE_CHECKING, NamedTuple
+
+from PySide6 import QtCore, QtGui
+
+if TYPE_CHECKING:
+    from subtitle.subtitle_markup import StyledRun
+
+# Same inset QTextDocument uses, so the layout box keeps its old geometry
+TEXT_MARGIN = 4.0
+GLYPH_CACHE_SIZE = 4096
+MAX_BMP_CODE_POINT = 0xFFFF
+
+_GlyphKey = tuple[str, str, QtGui.QFont.Style, float, int, int]
+
+# Glyph outlines at the origin, shared by all cues and threads
+_glyph_paths: dict[_GlyphKey, QtGui.QPainterPath] = {}
+
+
+class OutlinedText(NamedTuple):
+    # One path per glyph: stroking many small paths rasterizes several times
+    # faster than stroking a single path holding the whole text
+    glyphs: tuple[QtGui.QPainterPath, ...]
+    colors: tuple[int | None, ...]  # per glyph, None for the default color
+    inked_rect: QtCore.QRectF  # glyph outlines only, without the pen
+    size: QtCore.QSizeF  # layout box including margins
+
+
+def outline_pen(outline_color: QtGui.QColor, outline_width: int) -> QtGui.QPen:
+    if outline_width <= 0:
+        return QtGui.QPen(QtCore.Qt.PenStyle.NoPen)
+    return QtGui.QPen(
+        outline_color,
+        outline_width,
+        QtCore.Qt.PenStyle.SolidLine,
+        QtCore.Qt.PenCapStyle.RoundCap,
+        QtCore.Qt.PenJoinStyle.RoundJoin,
+    )
+
+
+def _glyph_path(raw_font: QtGui.QRawFont, glyph_index: int) -> QtGui.QPainterPath:
+    key = (
+        raw_font.familyName(),
+        raw_font.styleName(),
+        # Synthesized italics keep the style name of the upright face
+        raw_font.style(),
+        raw_font.pixelSize(),
+        raw_font.weight(),
+        glyph_index,
+    )
+    path = _glyph_paths.get(key)
+    if path is None:
+        if len(_glyph_paths) >= GLYPH_CACHE_SIZE:
+            _glyph_paths.clear()
+        path = _glyph_paths[key] = raw_font.pathForGlyph(glyph_index)
+    return path
+
+
+def _utf16_runs(
+    text: str, runs: "tuple[StyledRun, ...]"
+) -> "tuple[int, tuple[StyledRun, ...]]":
+    # QTextLayout positions count UTF-16 code units, while runs count code
+    # points; characters outside the BMP take two units
+    if len(text.encode("utf-16-le")) == 2 * len(text):
+        return len(text), runs
+    offsets = [0]
+    for char in text:
+        offsets.append(offsets[-1] + (2 if ord(char) > MAX_BMP_CODE_POINT else 1))
+    return offsets[-1], tuple(
+        run._replace(
+            start=offsets[run.start],
+            length=offsets[run.start + run.length] - offsets[run.start],
+        )
+        for run in runs
+    )
+
+
+def _format_range(run: "StyledRun") -> QtGui.QTextLayout.FormatRange:
+    char_format = QtGui.QTextCharFormat()
+    if run.bold:
+        char_format.setFontWeight(QtGui.QFont.Weight.Bold)
+    char_format.setFontItalic(run.italic)
+    char_format.setFontUnderline(run.underline)
+    format_range = QtGui.QTextLayout.FormatRange()
+    format_range.start = run.start
+    format_range.length = run.length
+    format_range.format = char_format
+    return format_range
+
+
+def _color_segments(
+    text_length: int, runs: "tuple[StyledRun, ...]"
+) -> list[tuple[int, int, int | None]]:
+    # (start, length, color) covering the whole text, adjacent runs of the
+    # same color merged so glyphs are collected in as few passes as possible
+    segments: list[tuple[int, int, int | None]] = []
+    position = 0
+    for run in runs:
+        if run.start > position:
+            segments.append((position, run.start - position, None))
+        if segments and segments[-1][2] == run.color:
+            start, length, color = segments.pop()
+            segments.append((start, length + run.length, color))
+        else:
+            segments.append((run.start, run.length, run.color))
+        position = run.start + run.length
+    if position < text_length:
+        segments.append((position, text_length - position, None))
+    return segments
+
+
+def layout_outlined_text(
+    text: str,
+    font: QtGui.QFont,
+    text_width: float,
+    runs: "tuple[StyledRun, ...]" = (),
+) -> OutlinedText:
+    # Centered, word wrapped lines like a QTextDocument of the same width,
+    # without the document. A negative width disables wrapping.
+    # U+2028 is a forced line break for QTextLayout, unlike "\n"
+    layout = QtGui.QTextLayout(text.replace("\n", "\u2028"), font)
+    text_length, runs = _utf16_runs(text, runs)
+    if runs:
+        layout.setFormats([_format_range(run) for run in runs])
+    text_option = QtGui.QTextOption(QtCore.Qt.AlignmentFlag.AlignHCenter)
+    text_option.setWrapMode(QtGui.QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere)
+    if text_width < 0:
+        text_option.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
+        text_option.setWrapMode(QtGui.QTextOption.WrapMode.NoWrap)
+    layout.setTextOption(text_option)
+    line_width = max(0.0, text_width - 2 * TEXT_MARGIN)
+
+    y = 0.0
+    natural_width = 0.0
+    layout.beginLayout()
+    while (line := layout.createLine()).isValid():
+        if text_width >= 0:
+            line.setLineWidth(line_width)
+        line.setPosition(QtCore.QPointF(TEXT_MARGIN, TEXT_MARGIN + y))
+        y += line.height()
+        natural_width = max(natural_width, line.naturalTextWidth())
+    layout.endLayout()
+
+    glyphs = []
+    colors = []
+    inked_rect = QtCore.QRectF()
+    for start, length, color in _color_segments(text_length, runs):
+        for glyph_run in layout.glyphRuns(start, length):
+            raw_font = glyph_run.rawFont()
+            positions = glyph_run.positions()
+            for glyph_index, position in zip(
+                glyph_run.glyphIndexes(), positions, strict=True
+            ):
+                glyph = _glyph_path(raw_font, glyph_index).translated(position)
+                if not glyph.isEmpty():
+                    glyphs.append(glyph)
+                    colors.append(color)
+                    inked_rect = inked_rect.united(glyph.boundingRect())
+
+            if glyph_run.underline() and positions:
+                # Outlined like the glyphs, so it is added as one more path
+                bounds = glyph_run.boundingRect()
+                underline = QtGui.QPainterPath()
+                underline.addRect(
+                    bounds.left(),
+                    positions[0].y() + raw_font.underlinePosition(),
+                    bounds.width(),
+                    raw_font.lineThickness(),
+                )
+                glyphs.append(underline)
+                colors.append(color)
+                inked_rect = inked_rect.united(underline.boundingRect())
+
+    box_width = text_width if text_width >= 0 else natural_width + 2 * TEXT_MARGIN
+    return OutlinedText(
+        tuple(glyphs),
+        tuple(colors),
+        inked_rect,
+        QtCore.QSizeF(box_width, y + 2 * TEXT_MARGIN),
+    )
+
+
+def paint_outlined_text(
+    painter: QtGui.QPainter,
+    text: OutlinedText,
+    text_color: QtGui.QColor,
+    pen: QtGui.QPen,
+) -> None:
+    # All fills first, then all outlines on top, which is how QPainter draws a
+    # single path with both a brush and a pen
+    painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+    painter.setPen(QtCore.Qt.PenStyle.NoPen)
+    painter.setBrush(text_color)
+    brush_color = None
+    for glyph, color in zip(text.glyphs, text.colors, strict=True):
+        if color != brush_color:
+            painter.setBrush(
+                text_color if color is None else QtGui.QColor.fromRgba(color)
+            )
+            brush_color = color
+        painter.drawPath(glyph)
+
+    if pen.style() != QtCore.Qt.PenStyle.NoPen:
+        painter.setPen(pen)
+        painter.setBrush(QtCore.Qt.BrushStyle.NoBrush)
+        for glyph in text.glyphs:
+            painter.drawPath(glyph)
@@ -1,8 +1,40 @@
 from collections.abc import Callable
 
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QMouseEvent
-from PySide6.QtWidgets import QSlider, QStyle, QStyleOptionSlider, QToolTip, QWidget
+from PySide6.QtCore import QEvent, QPoint, Qt
+from PySide6.QtGui import QHideEvent, QImage, QMouseEvent, QPixmap
+from PySide6.QtWidgets import (
+    QLabel,
+    QSlider,
+    QStyle,
+    QStyleOptionSlider,
+    QToolTip,
+    QVBoxLayout,
+    QWidget,
+)
+
+PREVIEW_MARGIN = 4
+
+
+class _PreviewPopup(QWidget):
+    # A tooltip-like window with a picture above the hovered time
+    def __init__(self, parent: QWidget) -> None:
+        super().__init__(parent, Qt.WindowType.ToolTip)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+        layout.setSpacing(2)
+        self.image_label = QLabel()
+        layout.addWidget(self.image_label)
+        self.text_label = QLabel()
+        self.text_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.text_label)
+        self.image: QImage | None = None
+
+    def set_content(self, image: QImage, text: str) -> None:
+        if image is not self.image:
+            self.image = image
+            self.image_label.setPixmap(QPixmap.fromImage(image))
+        self.text_label.setText(text)
+        self.adjustSize()
 
 
 class ClickableSlider(QSlider):
@@ -12,10 +44,16 @@ class ClickableSlider(QSlider):
         super().__init__(orientation, parent)
         self.setMouseTracking(True)
         self._format_callback: Callable[[int], str] | None = None
+        self._preview_callback: Callable[[int], QImage | None] | None = None
+        self._preview_popup: _PreviewPopup | None = None
 
     def set_tooltip_formatter(self, callback: Callable[[int], str]) -> None:
         self._format_callback = callback
 
+    def set_preview_provider(self, callback: Callable[[int], QImage | None]) -> None:
+        # Looked up on every hover move, so it has to answer from memory
+        self._preview_callback = callback
+
     def mousePressEvent(self, event: QMouseEvent) -> None:  # noqa: N802
         if event.button() == Qt.MouseButton.LeftButton:
             opt = QStyleOptionSlider()
@@ -84,6 +122,36 @@ class ClickableSlider(QSlider):
         else:
             tooltip_text = str(value)
 
-        QToolTip.showText(event.globalPosition().toPoint(), tooltip_text, self)
+        image = self._preview_callback(value) if self._preview_callback else None
+        if image is not None:
+            QToolTip.hideText()
+            self._show_preview(int(event.position().x()), image, tooltip_text)
+        else:
+            self._hide_preview()
+            QToolTip.showText(event.globalPosition().toPoint(), tooltip_text, self)
 
         super().mouseMoveEvent(event)
+
+    def _show_preview(self, x: int, image: QImage, text: str) -> None:
+        if self._preview_popup is None:
+            self._preview_popup = _PreviewPopup(self)
+        popup = self._preview_popup
+        popup.set_content(image, text)
+        popup.move(
+            self.mapToGlobal(
+                QPoint(x - popup.width() // 2, -popup.height() - PREVIEW_MARGIN)
+            )
+        )
+        popup.show()
+
+    def _hide_preview(self) -> None:
+        if self._preview_popup is not None:
+            self._preview_popup.hide()
+
+    def leaveEvent(self, event: QEvent) -> None:  # noqa: N802
+        self._hide_preview()
+        super().leaveEvent(event)
+
+    def hideEvent(self, event: QHideEvent) -> None:  # noqa: N802
+        self._hide_preview()
+        super().hideEvent(event)
@@ -0,0 +1,160 @@
+import hashlib
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from PySide6 import QtCore
+
+logger = logging.getLogger(__name__)
+
+DATABASE_NAME = "resume.sqlite3"
+# Positions are only kept in memory in between, so a crash loses at most this
+FLUSH_INTERVAL_MS = 5000
+BUSY_TIMEOUT_S = 2.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    file_key TEXT PRIMARY KEY,
+    position_ms INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL
+) WITHOUT ROWID
+"""
+_UPSERT = """
+INSERT INTO positions (file_key, position_ms, duration_ms, updated_at)
+VALUES (?, ?, ?, ?)
+ON CONFLICT (file_key) DO UPDATE SET
+    position_ms = excluded.position_ms,
+    duration_ms = excluded.duration_ms,
+    updated_at = excluded.updated_at
+"""
+
+_writer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resume-writer")
+
+
+class ResumePosition(NamedTuple):
+    position_ms: int
+    duration_ms: int
+
+
+def file_key(media_path: Path) -> str | None:
+    # The same file moved or rewritten starts over
+    try:
+        stat = media_path.stat()
+        identity = f"{media_path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+    except OSError:
+        return None
+    return hashlib.sha1(identity.encode(), usedforsecurity=False).hexdigest()
+
+
+def _default_database_path() -> Path:
+    location = QtCore.QStandardPaths.writableLocation(
+        QtCore.QStandardPaths.StandardLocation.AppDataLocation
+    )
+    return Path(location) / DATABASE_NAME
+
+
+class ResumeStore(QtCore.QObject):
+    # Playback positions per media file in SQLite. The WAL journal keeps the
+    # database consistent through crashes and kill -9 with a cheap commit, and
+    # lookups go through the primary key index. Positions are recorded into
+    # memory and written out together every FLUSH_INTERVAL_MS, one transaction
+    # per batch, on a writer thread of their own.
+
+    def __init__(
+        self, database_path: Path | None = None, parent: QtCore.QObject | None = None
+    ) -> None:
+        super().__init__(parent)
+        self._database_path = database_path
+        # None marks a position to forget
+        self._pending: dict[str, ResumePosition | None] = {}
+        # The batch last handed to the writer, which may not be committed yet
+        self._flushing: dict[str, ResumePosition | None] = {}
+        self._reader: sqlite3.Connection | None = None
+        self._writer: sqlite3.Connection | None = None  # writer thread only
+
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+    @property
+    def database_path(self) -> Path:
+        if self._database_path is None:
+            self._database_path = _default_database_path()
+        return self._database_path
+
+    def _connect(self) -> sqlite3.Connection:
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(
+            self.database_path, timeout=BUSY_TIMEOUT_S, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only risks the last commits on power loss
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(_SCHEMA)
+        connection.commit()
+        return connection
+
+    def load(self, key: str) -> ResumePosition | None:
+        for positions in (self._pending, self._flushing):
+            if key in positions:
+                return positions[key]
+        try:
+            if self._reader is None:
+                self._reader = self._connect()
+            row = self._reader.execute(
+                "SELECT position_ms, duration_ms FROM positions WHERE file_key = ?",
+                (key,),
+            ).fetchone()
+        except (OSError, sqlite3.Error) as e:
+            logger.info("Failed to read resume position: %s", e)
+            return None
+        return ResumePosition(*row) if row else None
+
+    def record(self, key: str, position: ResumePosition | None) -> None:
+        self._pending[key] = position
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def forget(self, key: str) -> None:
+        self.record(key, None)
+
+    def flush(self, wait: bool = False) -> None:
+        self._flush_timer.stop()
+        if self._pending:
+            self._flushing = self._pending
+            self._pending = {}
+            future = _writer_executor.submit(self._write, self._flushing)
+            if wait:
+                future.result()
+
+    def close(self) -> None:
+        self.flush(wait=True)
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _write(self, batch: dict[str, ResumePosition | None]) -> None:
+        now = int(time.time())
+        try:
+            if self._writer is None:
+                self._writer = self._connect()
+            with self._writer:
+                self._writer.executemany(
+                    _UPSERT,
+                    [
+                        (key, position.position_ms, position.duration_ms, now)
+                        for key, position in batch.items()
+                        if position is not None
+                    ],
+                )
+                self._writer.executemany(
+                    "DELETE FROM positions WHERE file_key = ?",
+                    [(key,) for key, position in batch.items() if position is None],
+                )
+        except (OSError, sqlite3.Error) as e:
+            logger.info("Failed to save resume positions: %s", e)
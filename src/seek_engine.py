@@ -0,0 +1,158 @@
+import logging
+from collections import deque
+from typing import TYPE_CHECKING, NamedTuple
+
+from PySide6 import QtCore
+
+if TYPE_CHECKING:
+    from PySide6.QtMultimedia import QMediaPlayer
+
+    from playback_clock import PlaybackClock
+
+logger = logging.getLogger(__name__)
+
+# A seek has landed once the player reports a position this close to its
+# target that playback couldn't have reached on its own
+SEEK_ARRIVAL_TOLERANCE_MS = 500
+# Leeway around where playback would be without the seek, for update jitter
+TRAJECTORY_SLACK_MS = 250
+# Give up waiting for a seek that never reports back, e.g. one to where
+# playback already was
+SEEK_TIMEOUT_MS = 500
+SEEK_LATENCY_SAMPLES = 256
+
+
+class SeekMetrics(NamedTuple):
+    requested: int
+    issued: int
+    timed_out: int
+    median_ms: int | None
+    p95_ms: int | None
+    max_ms: int | None
+
+
+class SeekEngine(QtCore.QObject):
+    # Every seek goes through here. At most one is in flight with the player;
+    # requests made meanwhile only move the pending target, which is issued
+    # once the current seek lands. Relative seeks add up from wherever
+    # playback is headed, so held down keys aren't lost to a stale position.
+
+    def __init__(
+        self,
+        player: "QMediaPlayer",
+        clock: "PlaybackClock",
+        parent: QtCore.QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._player = player
+        self._in_flight_ms: int | None = None
+        self._pending_ms: int | None = None
+        # Where playback was when the seek in flight was issued
+        self._issue_position_ms = 0
+        self._issue_rate = 1.0
+
+        self._timeout_timer = QtCore.QTimer(self)
+        self._timeout_timer.setSingleShot(True)
+        self._timeout_timer.setInterval(SEEK_TIMEOUT_MS)
+        self._timeout_timer.timeout.connect(self._on_timeout)
+        self._latency_clock = QtCore.QElapsedTimer()
+
+        self._requested = 0
+        self._issued = 0
+        self._timed_out = 0
+        self._latencies: deque[int] = deque(maxlen=SEEK_LATENCY_SAMPLES)
+
+        clock.subscribe(self._on_position_changed)
+
+    def target_ms(self) -> int:
+        if self._pending_ms is not None:
+            return self._pending_ms
+        if self._in_flight_ms is not None:
+            return self._in_flight_ms
+        return self._player.position()
+
+    def seek_to(self, position_ms: int) -> None:
+        self._requested += 1
+        duration_ms = self._player.duration()
+        if duration_ms > 0:
+            position_ms = min(position_ms, duration_ms)
+        self._pending_ms = max(0, position_ms)
+        if self._in_flight_ms is None:
+            self._issue()
+
+    def seek_by(self, offset_ms: int) -> None:
+        self.seek_to(self.target_ms() + offset_ms)
+
+    def reset(self) -> None:
+        # Seeks meant for the previous media are dropped
+        self._timeout_timer.stop()
+        self._in_flight_ms = None
+        self._pending_ms = None
+
+    def metrics(self) -> SeekMetrics:
+        latencies = sorted(self._latencies)
+        if not latencies:
+            return SeekMetrics(
+                self._requested, self._issued, self._timed_out, None, None, None
+            )
+        return SeekMetrics(
+            self._requested,
+            self._issued,
+            self._timed_out,
+            latencies[len(latencies) // 2],
+            latencies[min(len(latencies) - 1, len(latencies) * 95 // 100)],
+            latencies[-1],
+        )
+
+    def _issue(self) -> None:
+        # State is settled before setPosition, which may report back at once
+        target_ms = self._pending_ms
+        if target_ms is None:
+            return
+        self._in_flight_ms = target_ms
+        self._pending_ms = None
+        self._issued += 1
+        self._issue_position_ms = self._player.position()
+        self._issue_rate = max(0.0, self._player.playbackRate())
+        self._latency_clock.start()
+        self._timeout_timer.start()
+        self._player.setPosition(target_ms)
+
+    def _has_landed(self, position_ms: int, elapsed_ms: int) -> bool:
+        # Updates from playback carrying on as before the seek don't count, or
+        # a nearby target would look reached by the next ordinary tick
+        target_ms = self._in_flight_ms
+        if target_ms is None:
+            return False
+        played_until_ms = self._issue_position_ms + elapsed_ms * self._issue_rate
+        on_trajectory = (
+            self._issue_position_ms - TRAJECTORY_SLACK_MS
+            <= position_ms
+            <= played_until_ms + TRAJECTORY_SLACK_MS
+        )
+        return (
+            not on_trajectory
+            and abs(position_ms - target_ms) <= SEEK_ARRIVAL_TOLERANCE_MS
+        )
+
+    def _on_position_changed(self, position_ms: int) -> None:
+        if self._in_flight_ms is None:
+            return
+        latency_ms = self._latency_clock.elapsed()
+        if self._has_landed(position_ms, latency_ms):
+            self._latencies.append(latency_ms)
+            logger.debug("Seek to %d ms landed in %d ms", position_ms, latency_ms)
+            self._finish(position_ms)
+
+    def _on_timeout(self) -> None:
+        self._timed_out += 1
+        logger.debug("Seek to %d ms didn't report back", self._in_flight_ms)
+        self._finish()
+
+    def _finish(self, landed_ms: int | None = None) -> None:
+        self._timeout_timer.stop()
+        self._in_flight_ms = None
+        if self._pending_ms == landed_ms:
+            self._pending_ms = None
+        if self._pending_ms is not None:
+            self._issue()
@@ -2,28 +2,42 @@ class SettingKeys:
     SHOW_MENU_BAR = "appearance/show_menu_bar"
     SEEK_STEP = "behavior/seek_step"
     SAVE_POSITION_ON_EXIT = "behavior/save_position_on_exit"
+    SUBTITLE_DELAY_STEP = "behavior/subtitle_delay_step"
     PLAY_PAUSE_SHORTCUT = "shortcuts/play_pause"
     SEEK_FORWARD_SHORTCUT = "shortcuts/seek_forward"
     SEEK_BACKWARD_SHORTCUT = "shortcuts/seek_backward"
     TOGGLE_MUTE_SHORTCUT = "shortcuts/toggle_mute"
     FULLSCREEN_SHORTCUT = "shortcuts/toggle_fullscreen"
     TOGGLE_SUBTITLES_SHORTCUT = "shortcuts/toggle_subtitles"
+    DECREASE_SUBTITLE_DELAY_SHORTCUT = "shortcuts/decrease_subtitle_delay"
+    INCREASE_SUBTITLE_DELAY_SHORTCUT = "shortcuts/increase_subtitle_delay"
     ENABLE_SUBTITLES = "subtitles/enable"
     SUBTITLE_FONT_SCALE = "subtitles/font_scale"
     SUBTITLE_OUTLINE_SIZE = "subtitles/outline_size"
+    SUBTITLE_SUBDIRECTORIES = "subtitles/subdirectories"
+    SUBTITLE_LOOKAHEAD = "subtitles/lookahead_seconds"
+    SUBTITLE_FRAME_SYNC = "subtitles/frame_sync"
+    SUBTITLE_SYNC_STATS = "subtitles/log_sync_stats"
 
 
 DEFAULTS = {
     SettingKeys.SHOW_MENU_BAR: True,
     SettingKeys.SEEK_STEP: 10,
     SettingKeys.SAVE_POSITION_ON_EXIT: False,
+    SettingKeys.SUBTITLE_DELAY_STEP: 100,
     SettingKeys.PLAY_PAUSE_SHORTCUT: "Space",
     SettingKeys.SEEK_FORWARD_SHORTCUT: "Right",
     SettingKeys.SEEK_BACKWARD_SHORTCUT: "Left",
     SettingKeys.TOGGLE_MUTE_SHORTCUT: "M",
     SettingKeys.FULLSCREEN_SHORTCUT: "F",
     SettingKeys.TOGGLE_SUBTITLES_SHORTCUT: "S",
+    SettingKeys.DECREASE_SUBTITLE_DELAY_SHORTCUT: "Z",
+    SettingKeys.INCREASE_SUBTITLE_DELAY_SHORTCUT: "X",
     SettingKeys.ENABLE_SUBTITLES: True,
     SettingKeys.SUBTITLE_FONT_SCALE: 4.0,
     SettingKeys.SUBTITLE_OUTLINE_SIZE: 5,
+    SettingKeys.SUBTITLE_SUBDIRECTORIES: "subs, subtitles",
+    SettingKeys.SUBTITLE_LOOKAHEAD: 10,
+    SettingKeys.SUBTITLE_FRAME_SYNC: False,
+    SettingKeys.SUBTITLE_SYNC_STATS: False,
 }
@@ -24,5 +24,7 @@ class ShortcutManager:
             SettingKeys.TOGGLE_MUTE_SHORTCUT,
             SettingKeys.FULLSCREEN_SHORTCUT,
             SettingKeys.TOGGLE_SUBTITLES_SHORTCUT,
+            SettingKeys.DECREASE_SUBTITLE_DELAY_SHORTCUT,
+            SettingKeys.INCREASE_SUBTITLE_DELAY_SHORTCUT,
         ]:
             setup_shortcuts(self.window)
@@ -1,26 +1,118 @@
-from bisect import bisect_right
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+from typing import Self
 
+from subtitle.subtitle_columns import SubtitleColumns
+from subtitle.subtitle_cursor import SubtitleCursor
 from subtitle.subtitle_entry import SubtitleEntry
-from subtitle.subtitle_parser import parse
+from subtitle.subtitle_parser import iter_parse_batches, iter_parse_file_batches
+from subtitle.subtitle_timeline import SubtitleTimeline
+from subtitle.subtitle_timing import SubtitleTiming
+
+ENTRY_CACHE_SIZE = 512
 
 
 class Subtitle:
-    def __init__(self, file_content: str) -> None:
-        entries = parse(file_content)
+    def __init__(
+        self,
+        source: str | Iterable[SubtitleEntry] | SubtitleColumns,
+        path: Path | None = None,
+    ) -> None:
+        self.path = path
+        self.timing = SubtitleTiming()
 
-        self._entries = sorted(entries, key=lambda e: e.start_ms)
-        self._start_times = [e.start_ms for e in self._entries]
+        if isinstance(source, SubtitleColumns):
+            self._columns = source
+        elif isinstance(source, str):
+            self._columns = SubtitleColumns.from_batches(iter_parse_batches([source]))
+        else:
+            self._columns = SubtitleColumns.from_entries(source)
 
-    def get_all_at_time(self, time_ms: int) -> list[SubtitleEntry]:
-        result = []
-        idx = bisect_right(self._start_times, time_ms) - 1
-
-        while idx >= 0:
-            entry = self._entries[idx]
-            if entry.is_displayed_at(time_ms):
-                result.append(entry)
-                idx -= 1
+        self._timeline = SubtitleTimeline(
+            self._columns.start_times, self._columns.end_times
+        )
+        self._entry_cache: OrderedDict[int, SubtitleEntry] = OrderedDict()
+
+    @classmethod
+    def from_file(cls, path: Path) -> Self:
+        return cls(SubtitleColumns.from_batches(iter_parse_file_batches(path)), path)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    @property
+    def columns(self) -> SubtitleColumns:
+        return self._columns
+
+    @property
+    def timeline(self) -> SubtitleTimeline:
+        return self._timeline
+
+    def entry(self, cue_id: int) -> SubtitleEntry:
+        entry = self._entry_cache.get(cue_id)
+        if entry is None:
+            entry = self._columns.entry(cue_id)
+            self._entry_cache[cue_id] = entry
+            if len(self._entry_cache) > ENTRY_CACHE_SIZE:
+                self._entry_cache.popitem(last=False)
+        else:
+            self._entry_cache.move_to_end(cue_id)
+        return entry
+
+    def cursor(self) -> SubtitleCursor:
+        return SubtitleCursor(self)
+
+    def cue_ids_starting_between(self, start_ms: int, end_ms: int) -> range:
+        # Media time bounds, both inclusive; cue ids are ordered by start time
+        start_times = self._columns.start_times
+        first = bisect_left(start_times, self.timing.to_subtitle_time(start_ms))
+        last = bisect_right(start_times, self.timing.to_subtitle_time(end_ms))
+        return range(first, last)
+
+    def replace_cues(
+        self,
+        cue_ids: Sequence[int],
+        entries: Sequence[SubtitleEntry],
+        precedes: Callable[[int], bool] = lambda _: True,
+    ) -> tuple[list[int], "array[int] | None"]:
+        # Swaps cues for edited ones. precedes(cue_id) tells whether a kept cue
+        # with the same start time as an entry comes before it in the file.
+        # Returns the cue id of each entry and, if cues had to be renumbered,
+        # the new id of every old cue (-1 if removed).
+        columns = self._columns
+        old_times = [(columns.start_times[i], columns.end_times[i]) for i in cue_ids]
+        renumbered = None
+        entry_ids = columns.replace_rows(cue_ids, entries, precedes)
+        if entry_ids is None:
+            renumbered, entry_ids = columns.splice(cue_ids, entries, precedes)
+            self._timeline.renumber(renumbered)
+            self._entry_cache.clear()
+
+        # Only the time spans the old and new cues covered need new display
+        # segments, so a cue moved far is patched at both ends but not between
+        windows: list[list[int]] = []
+        for start_ms, end_ms in sorted(
+            old_times + [(entry.start_ms, entry.end_ms) for entry in entries]
+        ):
+            if windows and start_ms <= windows[-1][1]:
+                windows[-1][1] = max(windows[-1][1], end_ms + 1)
             else:
-                break
+                windows.append([start_ms, max(start_ms, end_ms) + 1])
+        for window_start, window_end in windows:
+            self._timeline.patch(
+                columns.start_times,
+                columns.end_times,
+                entry_ids,
+                window_start,
+                window_end,
+            )
+        for cue_id in cue_ids:
+            self._entry_cache.pop(cue_id, None)
+        return entry_ids, renumbered
 
-        return list(reversed(result))
+    def get_all_at_time(self, time_ms: int) -> list[SubtitleEntry]:
+        subtitle_time = self.timing.to_subtitle_time(time_ms)
+        return [self.entry(i) for i in self._timeline.active_at(subtitle_time)]
@@ -0,0 +1,154 @@
+import itertools
+import logging
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+
+from subtitle.subtitle_columns import SubtitleColumns
+from utils.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+CACHE_MAGIC = b"UVPSUBC\x00"
+CACHE_VERSION = 2
+CACHE_SUFFIX = ".subc"
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# magic, version, byte order mark, cue count, unique text count, text blob length
+_HEADER = struct.Struct("=8sIIqqq")
+_BYTE_ORDER_MARK = 1
+
+
+def _encode(columns: SubtitleColumns) -> bytes:
+    blob = columns.text_blob.encode()
+    header = _HEADER.pack(
+        CACHE_MAGIC,
+        CACHE_VERSION,
+        _BYTE_ORDER_MARK,
+        len(columns),
+        len(columns.text_offsets) - 1,
+        len(blob),
+    )
+    return b"".join(
+        (
+            header,
+            columns.indices.tobytes(),
+            columns.start_times.tobytes(),
+            columns.end_times.tobytes(),
+            columns.text_offsets.tobytes(),
+            columns.text_ids.tobytes(),
+            blob,
+        )
+    )
+
+
+class _ColumnReader:
+    def __init__(self, data: mmap.mmap, offset: int) -> None:
+        self._data = data
+        self.offset = offset
+
+    def read(self, typecode: str, count: int) -> "array[int]":
+        column = array(typecode)
+        end = self.offset + count * column.itemsize
+        column.frombytes(self._data[self.offset : end])
+        self.offset = end
+        return column
+
+
+def _decode(data: mmap.mmap) -> SubtitleColumns:
+    magic, version, byte_order_mark, count, text_count, blob_length = (
+        _HEADER.unpack_from(data)
+    )
+    if (
+        magic != CACHE_MAGIC
+        or version != CACHE_VERSION
+        or byte_order_mark != _BYTE_ORDER_MARK
+        or min(count, text_count, blob_length) < 0
+    ):
+        msg = "Unrecognized subtitle cache header"
+        raise ValueError(msg)
+
+    blob_start = (
+        _HEADER.size
+        + (3 * count + text_count + 1) * array("q").itemsize
+        + count * array("I").itemsize
+    )
+    if len(data) != blob_start + blob_length:
+        msg = "Truncated subtitle cache file"
+        raise ValueError(msg)
+
+    reader = _ColumnReader(data, _HEADER.size)
+    columns = SubtitleColumns(
+        indices=reader.read("q", count),
+        start_times=reader.read("q", count),
+        end_times=reader.read("q", count),
+        text_offsets=reader.read("q", text_count + 1),
+        text_ids=reader.read("I", count),
+        text_blob=data[blob_start:].decode(),
+    )
+
+    text_offsets = columns.text_offsets
+    if (
+        text_offsets[0] != 0
+        or text_offsets[-1] != len(columns.text_blob)
+        or any(a > b for a, b in itertools.pairwise(text_offsets))
+        or (count and max(columns.text_ids) >= text_count)
+    ):
+        msg = "Corrupt subtitle cache text pool"
+        raise ValueError(msg)
+
+    return columns
+
+
+class SubtitleCache:
+    def __init__(
+        self, cache_dir: Path | None = None, max_bytes: int = CACHE_MAX_BYTES
+    ) -> None:
+        self._disk_cache = DiskCache("subtitles", CACHE_SUFFIX, max_bytes, cache_dir)
+
+    def _entry_path(self, subtitle_path: Path, stat: os.stat_result) -> Path:
+        # The stat is taken by the caller before reading the file, so a parse
+        # of contents saved over meanwhile is never filed under the newer version
+        return self._disk_cache.entry_path(
+            subtitle_path, f"{stat.st_size}:{stat.st_mtime_ns}"
+        )
+
+    def load(self, subtitle_path: Path, stat: os.stat_result) -> SubtitleColumns | None:
+        try:
+            entry_path = self._entry_path(subtitle_path, stat)
+        except OSError:
+            return None
+
+        try:
+            with (
+                entry_path.open("rb") as file,
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+            ):
+                columns = _decode(mapped)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, struct.error, UnicodeDecodeError):
+            logger.info("Discarding unreadable subtitle cache %s", entry_path)
+            entry_path.unlink(missing_ok=True)
+            return None
+
+        self._disk_cache.touch(entry_path)
+        return columns
+
+    def store(
+        self, subtitle_path: Path, stat: os.stat_result, columns: SubtitleColumns
+    ) -> None:
+        try:
+            entry_path = self._entry_path(subtitle_path, stat)
+        except OSError as e:
+            logger.info("Failed to write subtitle cache: %s", e)
+            return
+        self._disk_cache.write(
+            entry_path, lambda path: path.write_bytes(_encode(columns))
+        )
+
+
+# Global singleton
+subtitle_cache = SubtitleCache()
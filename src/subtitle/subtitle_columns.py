@@ -0,0 +1,272 @@
+import copy
+import itertools
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Self
+
+from subtitle.subtitle_entry import SubtitleEntry
+from subtitle.subtitle_markup import StyledRun, StyledText, has_markup, parse_markup
+from subtitle.subtitle_parser import SubtitleBatch
+from utils.numpy_support import NUMPY_AVAILABLE, np
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    # A NumPy index array, or a list of rows without NumPy
+    RowOrder = Sequence[int] | npt.NDArray[np.intp]
+
+
+def _stable_argsort(values: "array[int]") -> "RowOrder | None":
+    # Returns None when the values are already in order
+    if NUMPY_AVAILABLE:
+        keys = np.frombuffer(values, dtype=np.int64)
+        if bool(np.all(keys[:-1] <= keys[1:])):
+            return None
+        return np.argsort(keys, kind="stable")
+
+    if all(a <= b for a, b in itertools.pairwise(values)):
+        return None
+    return sorted(range(len(values)), key=values.__getitem__)
+
+
+def _always(_row: int) -> bool:
+    return True
+
+
+def _permute(values: "array[int]", order: "RowOrder") -> "array[int]":
+    if NUMPY_AVAILABLE:
+        permuted = np.frombuffer(values, dtype=np.dtype(values.typecode))[order]
+        return array(values.typecode, permuted.tobytes())
+    return array(values.typecode, (values[i] for i in order))
+
+
+@dataclass(slots=True)
+class SubtitleColumns:
+    # One row per cue, sorted by start time. Cue texts are deduplicated into a
+    # single pool: text_ids point into text_offsets, which slice text_blob.
+    # The pool keeps the raw text; texts with markup are parsed once when the
+    # columns are built and their plain text and styled runs kept in styled.
+    indices: "array[int]"
+    start_times: "array[int]"
+    end_times: "array[int]"
+    text_ids: "array[int]"
+    text_offsets: "array[int]"
+    text_blob: str
+    styled: dict[int, StyledText] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.styled = {}
+        if not has_markup(self.text_blob):
+            return
+
+        offsets = self.text_offsets
+        for text_id, (start, end) in enumerate(itertools.pairwise(offsets)):
+            styled = parse_markup(self.text_blob[start:end])
+            if styled is not None:
+                self.styled[text_id] = styled
+
+    @classmethod
+    def from_batches(cls, batches: Iterable[SubtitleBatch]) -> Self:
+        indices = array("q")
+        start_times = array("q")
+        end_times = array("q")
+        text_ids = array("I")
+        text_pool: dict[str, int] = {}
+
+        for batch in batches:
+            indices.extend(batch.indices)
+            start_times.extend(batch.start_times)
+            end_times.extend(batch.end_times)
+            text_ids.extend(
+                [text_pool.setdefault(t, len(text_pool)) for t in batch.texts]
+            )
+
+        order = _stable_argsort(start_times)
+        if order is not None:
+            indices = _permute(indices, order)
+            start_times = _permute(start_times, order)
+            end_times = _permute(end_times, order)
+            text_ids = _permute(text_ids, order)
+
+        text_offsets = array("q", [0])
+        for text in text_pool:
+            text_offsets.append(text_offsets[-1] + len(text))
+
+        return cls(
+            indices=indices,
+            start_times=start_times,
+            end_times=end_times,
+            text_ids=text_ids,
+            text_offsets=text_offsets,
+            text_blob="".join(text_pool),
+        )
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[SubtitleEntry]) -> Self:
+        batch = SubtitleBatch([], array("q"), array("q"), [])
+        for entry in entries:
+            batch.indices.append(entry.index)
+            batch.start_times.append(entry.start_ms)
+            batch.end_times.append(entry.end_ms)
+            batch.texts.append(entry.text)
+        return cls.from_batches([batch])
+
+    def __len__(self) -> int:
+        return len(self.start_times)
+
+    def snapshot(self) -> Self:
+        # A copy that later patches don't touch, for readers on other threads.
+        # The text blob is immutable and styled texts are only ever added.
+        columns = copy.copy(self)
+        columns.indices = self.indices[:]
+        columns.start_times = self.start_times[:]
+        columns.end_times = self.end_times[:]
+        columns.text_ids = self.text_ids[:]
+        columns.text_offsets = self.text_offsets[:]
+        columns.styled = dict(self.styled)
+        return columns
+
+    def text(self, cue_id: int) -> str:
+        # Display text, with any markup removed
+        text_id = self.text_ids[cue_id]
+        styled = self.styled.get(text_id)
+        if styled is not None:
+            return styled.text
+        return self._pooled_text(text_id)
+
+    def raw_text(self, cue_id: int) -> str:
+        # Text as it was in the file, markup included
+        return self._pooled_text(self.text_ids[cue_id])
+
+    def _pooled_text(self, text_id: int) -> str:
+        return self.text_blob[
+            self.text_offsets[text_id] : self.text_offsets[text_id + 1]
+        ]
+
+    def _add_text(self, text: str) -> int:
+        # The pool only grows; texts that patches replaced stay behind unused
+        text_id = len(self.text_offsets) - 1
+        self.text_blob += text
+        self.text_offsets.append(len(self.text_blob))
+        styled = parse_markup(text)
+        if styled is not None:
+            self.styled[text_id] = styled
+        return text_id
+
+    def replace_rows(
+        self,
+        rows: Sequence[int],
+        entries: Sequence[SubtitleEntry],
+        precedes: Callable[[int], bool] = _always,
+    ) -> list[int] | None:
+        # Overwrites rows with entries when the entries fit exactly into their
+        # places in start time order, so that every cue id stays valid.
+        # precedes(row) tells whether a kept row starting at the same time as
+        # an entry comes before the entries in file order, which is how such
+        # cues are ordered on load. Returns the row of each entry, or None if
+        # cues would have to move.
+        if len(rows) != len(entries):
+            return None
+
+        rows = sorted(rows)
+        order = sorted(range(len(entries)), key=lambda i: entries[i].start_ms)
+        new_starts = dict(zip(rows, (entries[i].start_ms for i in order), strict=True))
+        start_times = self.start_times
+        for row, start_ms in new_starts.items():
+            previous = row - 1
+            if previous >= 0 and previous not in new_starts:
+                previous_ms = start_times[previous]
+                if previous_ms > start_ms or (
+                    previous_ms == start_ms and not precedes(previous)
+                ):
+                    return None
+            elif previous >= 0 and new_starts[previous] > start_ms:
+                return None
+            following = row + 1
+            if following < len(self) and following not in new_starts:
+                following_ms = start_times[following]
+                if start_ms > following_ms or (
+                    start_ms == following_ms and precedes(following)
+                ):
+                    return None
+
+        entry_rows = [0] * len(entries)
+        for row, i in zip(rows, order, strict=True):
+            entry = entries[i]
+            self.indices[row] = entry.index
+            self.start_times[row] = entry.start_ms
+            self.end_times[row] = entry.end_ms
+            if entry.text != self._pooled_text(self.text_ids[row]):
+                self.text_ids[row] = self._add_text(entry.text)
+            entry_rows[i] = row
+        return entry_rows
+
+    def _insertion_row(self, start_ms: int, precedes: Callable[[int], bool]) -> int:
+        # After the rows starting earlier and the rows at the same start time
+        # that precede the entry in file order
+        row = bisect_left(self.start_times, start_ms)
+        end = bisect_right(self.start_times, start_ms, lo=row)
+        while row < end and precedes(row):
+            row += 1
+        return row
+
+    def splice(
+        self,
+        rows: Iterable[int],
+        entries: Sequence[SubtitleEntry],
+        precedes: Callable[[int], bool] = _always,
+    ) -> tuple["array[int]", list[int]]:
+        # Removes rows and merges entries in by start time, renumbering cues;
+        # precedes is as for replace_rows. Returns the new row of every old
+        # row (-1 if removed) and of each entry. Rows between two edits are
+        # copied as slices.
+        columns = (self.indices, self.start_times, self.end_times, self.text_ids)
+        new_columns = tuple(array(column.typecode) for column in columns)
+        new_indices, new_start_times, new_end_times, new_text_ids = new_columns
+        renumbered = array("q")
+        entry_rows = [0] * len(entries)
+
+        # (old row it goes before or removes, is removal, start time, which)
+        edits = sorted(
+            [
+                (self._insertion_row(entry.start_ms, precedes), 0, entry.start_ms, i)
+                for i, entry in enumerate(entries)
+            ]
+            + [(row, 1, 0, row) for row in set(rows)]
+        )
+        copied = 0
+        for row, is_removal, _, i in [*edits, (len(self), 0, 0, -1)]:
+            shift = len(new_start_times) - copied
+            for column, new_column in zip(columns, new_columns, strict=True):
+                new_column.extend(column[copied:row])
+            renumbered.extend(range(copied + shift, row + shift))
+            copied = row
+
+            if is_removal:
+                renumbered.append(-1)
+                copied += 1
+            elif i >= 0:
+                entry = entries[i]
+                entry_rows[i] = len(new_start_times)
+                new_indices.append(entry.index)
+                new_start_times.append(entry.start_ms)
+                new_end_times.append(entry.end_ms)
+                new_text_ids.append(self._add_text(entry.text))
+
+        self.indices, self.start_times, self.end_times, self.text_ids = new_columns
+        return renumbered, entry_rows
+
+    def runs(self, cue_id: int) -> tuple[StyledRun, ...]:
+        styled = self.styled.get(self.text_ids[cue_id])
+        return styled.runs if styled is not None else ()
+
+    def entry(self, cue_id: int) -> SubtitleEntry:
+        return SubtitleEntry(
+            index=self.indices[cue_id],
+            start_ms=self.start_times[cue_id],
+            end_ms=self.end_times[cue_id],
+            text=self.text(cue_id),
+            runs=self.runs(cue_id),
+        )
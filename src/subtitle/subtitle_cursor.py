@@ -0,0 +1,53 @@
+from typing import TYPE_CHECKING
+
+from subtitle.subtitle_entry import SubtitleEntry
+from subtitle.subtitle_timeline import EMPTY_SET_ID
+
+if TYPE_CHECKING:
+    from subtitle.subtitle import Subtitle
+
+
+class SubtitleCursor:
+    def __init__(self, subtitle: "Subtitle") -> None:
+        self._subtitle = subtitle
+        self._segment_index = -1
+        self._set_id = EMPTY_SET_ID
+
+    def reset(self) -> None:
+        # After the subtitle was edited; the next move_to reports the cues anew
+        self._segment_index = -1
+        self._set_id = -1
+
+    def move_to(self, time_ms: int) -> bool:
+        # time_ms is media time; the subtitle's timing maps it onto cue times
+        timeline = self._subtitle.timeline
+        subtitle_time = self._subtitle.timing.to_subtitle_time(time_ms)
+        self._segment_index = timeline.segment_index_at(
+            subtitle_time, self._segment_index
+        )
+
+        set_id = timeline.active_set_id(self._segment_index)
+        if set_id == self._set_id:
+            return False
+
+        self._set_id = set_id
+        return True
+
+    def change_ms(self) -> int | None:
+        # Media time at which the current active cues took effect
+        boundary = self._subtitle.timeline.segment_start(self._segment_index)
+        if boundary is None:
+            return None
+        return self._subtitle.timing.to_media_time(boundary)
+
+    def next_change_ms(self) -> int | None:
+        # Media time at which the active cues change next
+        boundary = self._subtitle.timeline.next_boundary(self._segment_index)
+        if boundary is None:
+            return None
+        return self._subtitle.timing.to_media_time(boundary)
+
+    @property
+    def entries(self) -> list[SubtitleEntry]:
+        cue_ids = self._subtitle.timeline.active_cues(self._set_id)
+        return [self._subtitle.entry(i) for i in cue_ids]
@@ -0,0 +1,118 @@
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+SUBTITLE_EXTENSIONS = [".srt", ".vtt"]
+DIRECTORY_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True, slots=True)
+class _DirectoryListing:
+    mtime_ns: int
+    subtitle_names: tuple[str, ...]
+    # casefolded name -> name as it appears on disk
+    subdirectories: dict[str, str]
+
+
+def _split_extension(name: str) -> tuple[str, str]:
+    stem, dot, extension = name.rpartition(".")
+    if not dot or not stem:
+        return name, ""
+    return stem, f".{extension.lower()}"
+
+
+def _scan(directory: Path, mtime_ns: int) -> _DirectoryListing:
+    subtitle_names: list[str] = []
+    subdirectories: dict[str, str] = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                subdirectories.setdefault(entry.name.casefold(), entry.name)
+            elif _split_extension(entry.name)[1] in SUBTITLE_EXTENSIONS:
+                subtitle_names.append(entry.name)
+    return _DirectoryListing(mtime_ns, tuple(subtitle_names), subdirectories)
+
+
+def _match_tags(name: str, video_stem: str) -> tuple[str, ...] | None:
+    # "movie.srt" has no tags, "movie.en.forced.srt" has ("en", "forced")
+    stem = _split_extension(name)[0]
+    if stem == video_stem:
+        return ()
+    if stem.startswith(f"{video_stem}."):
+        return tuple(tag for tag in stem[len(video_stem) + 1 :].split(".") if tag)
+    return None
+
+
+def _sort_key(name: str, tags: tuple[str, ...]) -> tuple[bool, tuple[str, ...], int]:
+    extension = _split_extension(name)[1]
+    return bool(tags), tags, SUBTITLE_EXTENSIONS.index(extension)
+
+
+class SubtitleDirectoryIndex:
+    # One scandir per directory, reused until the directory's mtime changes.
+    # Adding or removing a file updates the mtime, so a single stat per
+    # directory is enough to validate a listing regardless of how many
+    # candidate names are matched against it.
+
+    def __init__(self, max_directories: int = DIRECTORY_CACHE_SIZE) -> None:
+        self.max_directories = max_directories
+        self._listings: OrderedDict[Path, _DirectoryListing] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _listing(self, directory: Path) -> _DirectoryListing | None:
+        try:
+            mtime_ns = directory.stat().st_mtime_ns
+        except OSError:
+            return None
+
+        with self._lock:
+            listing = self._listings.get(directory)
+            if listing is not None and listing.mtime_ns == mtime_ns:
+                self._listings.move_to_end(directory)
+                return listing
+
+        try:
+            listing = _scan(directory, mtime_ns)
+        except OSError:
+            return None
+
+        with self._lock:
+            self._listings[directory] = listing
+            self._listings.move_to_end(directory)
+            while len(self._listings) > self.max_directories:
+                self._listings.popitem(last=False)
+        return listing
+
+    def find(self, video_path: Path, subdirectories: Iterable[str]) -> list[Path]:
+        video_dir = video_path.parent
+        listing = self._listing(video_dir)
+        if listing is None:
+            return []
+
+        search_dirs = [(video_dir, listing)]
+        seen_names = set()
+        for name in subdirectories:
+            actual_name = listing.subdirectories.get(name.casefold())
+            if actual_name is None or actual_name in seen_names:
+                continue
+            seen_names.add(actual_name)
+            sub_listing = self._listing(video_dir / actual_name)
+            if sub_listing is not None:
+                search_dirs.append((video_dir / actual_name, sub_listing))
+
+        paths: list[Path] = []
+        for search_dir, search_listing in search_dirs:
+            matches = [
+                (_sort_key(name, tags), name)
+                for name in search_listing.subtitle_names
+                if (tags := _match_tags(name, video_path.stem)) is not None
+            ]
+            paths.extend(search_dir / name for _, name in sorted(matches))
+        return paths
+
+
+# Global singleton
+subtitle_directory_index = SubtitleDirectoryIndex()
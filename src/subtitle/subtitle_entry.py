@@ -1,12 +1,15 @@
 from dataclasses import dataclass
 
+from subtitle.subtitle_markup import StyledRun
 
-@dataclass
+
+@dataclass(slots=True)
 class SubtitleEntry:
     index: int
     start_ms: int
     end_ms: int
     text: str
+    runs: tuple[StyledRun, ...] = ()
 
     @property
     def duration(self) -> float:
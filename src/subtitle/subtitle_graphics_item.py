@@ -1,14 +1,37 @@
-from PySide6 import QtCore
+from PySide6 import QtCore, QtGui, QtWidgets
 
-from primitive.graphics_outlined_text_item import GraphicsOutlinedTextItem
 from settings.setting_keys import SettingKeys
 from settings.settings_manager import settings_manager
+from subtitle.subtitle_markup import StyledRun
+from subtitle.subtitle_render_cache import (
+    SubtitleImage,
+    SubtitleRenderKey,
+    subtitle_render_cache,
+)
 
 
-class SubtitleGraphicsItem(GraphicsOutlinedTextItem):
-    def __init__(self) -> None:
+class SubtitleGraphicsItem(QtWidgets.QGraphicsItem):
+    # Draws cues as cached pre-rendered images, so showing a cue that was seen
+    # before with the same style and size is a blit instead of a text layout
+
+    def __init__(
+        self,
+        outline_color: QtGui.QColor | None = None,
+        text_color: QtGui.QColor | None = None,
+    ) -> None:
         super().__init__()
 
+        self.outline_width = settings_manager.get_int(SettingKeys.SUBTITLE_OUTLINE_SIZE)
+        self.outline_color = outline_color or QtGui.QColor("black")
+        self.text_color = text_color or QtGui.QColor("white")
+
+        self._font = QtGui.QFont()
+        self._text = ""
+        self._runs: tuple[StyledRun, ...] = ()
+        self._text_width = -1.0
+        self._device_pixel_ratio = 1.0
+        self._rendered: SubtitleImage | None = None
+
         self.setVisible(False)
         self._view_height = 600
         self.update_subtitle_style()
@@ -18,14 +41,39 @@ class SubtitleGraphicsItem(GraphicsOutlinedTextItem):
     def connect_signals(self) -> None:
         settings_manager.settings_changed.connect(self.on_settings_changed)
 
-    def setPlainText(self, text: str | None) -> None:  # noqa: N802
-        if text:
-            super().setPlainText(text)
+    def set_text(self, text: str | None, runs: tuple[StyledRun, ...] = ()) -> None:
+        if text and (text, runs) != (self._text, self._runs):
+            self._text = text
+            self._runs = runs
+            self._update_image()
         self.setVisible(bool(text))
 
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def setTextWidth(self, width: float) -> None:  # noqa: N802
+        if width != self._text_width:
+            self._text_width = width
+            self._update_image()
+
+    def set_device_pixel_ratio(self, device_pixel_ratio: float) -> None:
+        if device_pixel_ratio != self._device_pixel_ratio:
+            self._device_pixel_ratio = device_pixel_ratio
+            self._update_image()
+
     def on_settings_changed(self, key: str) -> None:
         if key == SettingKeys.SUBTITLE_FONT_SCALE:
             self.update_subtitle_style()
+        elif key == SettingKeys.SUBTITLE_OUTLINE_SIZE:
+            self.set_outline_width(
+                settings_manager.get_int(SettingKeys.SUBTITLE_OUTLINE_SIZE)
+            )
+
+    def set_outline_width(self, outline_width: int) -> None:
+        if outline_width != self.outline_width:
+            self.outline_width = outline_width
+            self._update_image()
 
     def set_view_height(self, height: int) -> None:
         if self._view_height != height:
@@ -38,11 +86,7 @@ class SubtitleGraphicsItem(GraphicsOutlinedTextItem):
         return max(12, min(calculated_size, 120))
 
     def update_subtitle_style(self, font_size: int | None = None) -> None:
-        font = self.font()
-
-        text_option = self.document().defaultTextOption()
-        text_option.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-        self.document().setDefaultTextOption(text_option)
+        font = QtGui.QFont(self._font)
 
         if font_size:
             font.setPointSize(font_size)
@@ -50,7 +94,43 @@ class SubtitleGraphicsItem(GraphicsOutlinedTextItem):
             font.setPointSize(self._calculate_font_size())
 
         font.setBold(True)
-        self.setFont(font)
+        if font != self._font:
+            self._font = font
+            self._update_image()
+
+    def render_key(
+        self, text: str, runs: tuple[StyledRun, ...] = ()
+    ) -> SubtitleRenderKey:
+        return SubtitleRenderKey(
+            text=text,
+            font=self._font.toString(),
+            outline_width=self.outline_width,
+            outline_color=self.outline_color.rgba(),
+            text_color=self.text_color.rgba(),
+            device_pixel_ratio=self._device_pixel_ratio,
+            text_width=self._text_width,
+            runs=runs,
+        )
+
+    def _update_image(self) -> None:
+        self.prepareGeometryChange()
+        self._rendered = None
+        if self._text:
+            self._rendered = subtitle_render_cache.get_or_render(
+                self.render_key(self._text, self._runs)
+            )
+        self.update()
+
+    def boundingRect(self) -> QtCore.QRectF:  # noqa: N802
+        if self._rendered is None:
+            return QtCore.QRectF()
+        return QtCore.QRectF(QtCore.QPointF(0, 0), self._rendered.size)
 
-        if self.toPlainText():
-            self.apply_outline_format()
+    def paint(
+        self,
+        painter: QtGui.QPainter,
+        _option: QtWidgets.QStyleOptionGraphicsItem,
+        _widget: QtWidgets.QWidget | None = None,
+    ) -> None:
+        if self._rendered is not None:
+            painter.drawImage(self._rendered.offset, self._rendered.image)
@@ -0,0 +1,119 @@
+import logging
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from settings.setting_keys import SettingKeys
+from settings.settings_manager import settings_manager
+from subtitle.subtitle_entry import SubtitleEntry
+from subtitle.subtitle_graphics_item import SubtitleGraphicsItem
+from subtitle.subtitle_markup import StyledRun
+from subtitle.subtitle_render_cache import SubtitleRenderKey
+
+logger = logging.getLogger(__name__)
+
+MAX_VISIBLE_CUES = 6
+BOTTOM_MARGIN = 0.05
+WIDTH_FRACTION = 0.9
+
+CueKey = tuple[int, int, str, tuple[StyledRun, ...]]
+
+
+def _cue_key(entry: SubtitleEntry) -> CueKey:
+    return entry.start_ms, entry.end_ms, entry.text, entry.runs
+
+
+class SubtitleLayer(QtWidgets.QGraphicsItem):
+    # Shows simultaneous cues stacked upwards from the bottom of the view, the
+    # earliest cue lowest. Cue items come from a small pool that only grows up
+    # to MAX_VISIBLE_CUES and are reused rather than added to and removed from
+    # the scene. A cue that stays on screen keeps its item, so only items for
+    # newly shown cues get new text.
+
+    def __init__(self, parent: QtWidgets.QGraphicsItem | None = None) -> None:
+        super().__init__(parent)
+        self.setFlag(QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemHasNoContents)
+
+        self._view_size = QtCore.QSizeF(800, 600)
+        self._device_pixel_ratio = 1.0
+        self._free_items: list[SubtitleGraphicsItem] = [self._create_item()]
+        self._active_items: dict[CueKey, SubtitleGraphicsItem] = {}
+
+        settings_manager.settings_changed.connect(self.on_settings_changed)
+
+    def _create_item(self) -> SubtitleGraphicsItem:
+        item = SubtitleGraphicsItem()
+        item.setParentItem(self)
+        item.set_device_pixel_ratio(self._device_pixel_ratio)
+        item.setTextWidth(self._view_size.width() * WIDTH_FRACTION)
+        item.set_view_height(int(self._view_size.height()))
+        return item
+
+    def _items(self) -> list[SubtitleGraphicsItem]:
+        return [*self._active_items.values(), *self._free_items]
+
+    def render_key(
+        self, text: str, runs: tuple[StyledRun, ...] = ()
+    ) -> SubtitleRenderKey:
+        # All items share the same style, any of them will do
+        return self._items()[0].render_key(text, runs)
+
+    def set_entries(self, entries: list[SubtitleEntry]) -> None:
+        # An empty cue has nothing to show and takes no room in the stack
+        entries = [entry for entry in entries if entry.text]
+        if len(entries) > MAX_VISIBLE_CUES:
+            logger.debug("Showing %d of %d cues", MAX_VISIBLE_CUES, len(entries))
+            entries = entries[:MAX_VISIBLE_CUES]
+
+        wanted = {_cue_key(entry): entry for entry in entries}
+        for key in [key for key in self._active_items if key not in wanted]:
+            item = self._active_items.pop(key)
+            item.setVisible(False)
+            self._free_items.append(item)
+
+        active_items = {}
+        for key, entry in wanted.items():
+            active_item = self._active_items.get(key)
+            if active_item is None:
+                active_item = (
+                    self._free_items.pop() if self._free_items else self._create_item()
+                )
+                active_item.set_text(entry.text, entry.runs)
+            active_items[key] = active_item
+        self._active_items = active_items
+        self._layout()
+
+    def on_settings_changed(self, key: str) -> None:
+        # Items react to style settings themselves, but in connection order;
+        # forwarding is idempotent and makes sure all sizes are final before
+        # the stack is laid out again
+        if key in (SettingKeys.SUBTITLE_FONT_SCALE, SettingKeys.SUBTITLE_OUTLINE_SIZE):
+            for item in self._items():
+                item.on_settings_changed(key)
+            self._layout()
+
+    def set_geometry(self, view_size: QtCore.QSizeF, device_pixel_ratio: float) -> None:
+        self._view_size = view_size
+        self._device_pixel_ratio = device_pixel_ratio
+        for item in self._items():
+            item.set_device_pixel_ratio(device_pixel_ratio)
+            item.setTextWidth(view_size.width() * WIDTH_FRACTION)
+            item.set_view_height(int(view_size.height()))
+        self._layout()
+
+    def _layout(self) -> None:
+        bottom = self._view_size.height() * (1 - BOTTOM_MARGIN)
+        for item in self._active_items.values():
+            rect = item.boundingRect()
+            bottom -= rect.height()
+            item.setPos((self._view_size.width() - rect.width()) / 2, bottom)
+
+    def boundingRect(self) -> QtCore.QRectF:  # noqa: N802
+        return QtCore.QRectF()
+
+    def paint(
+        self,
+        painter: QtGui.QPainter,
+        _option: QtWidgets.QStyleOptionGraphicsItem,
+        _widget: QtWidgets.QWidget | None = None,
+    ) -> None:
+        pass
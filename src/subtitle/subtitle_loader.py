@@ -1,36 +1,64 @@
+from collections.abc import Callable, Iterable
 from pathlib import Path
+from typing import NamedTuple
 
-SUBTITLE_EXTENSIONS = [".srt", ".vtt"]
+from subtitle.subtitle import Subtitle
+from subtitle.subtitle_cache import subtitle_cache
+from subtitle.subtitle_directory_index import subtitle_directory_index
+from subtitle.subtitle_timing import subtitle_timing_store
 
 
-def _find_subtitle_paths(video_path: Path) -> list[Path]:
-    video_name = video_path.stem
-    search_dirs = [video_path.parent, video_path.parent / "subs"]
+class SubtitleTrack(NamedTuple):
+    # Size and mtime are part of the identity, so an edited file is a new track
+    path: Path
+    label: str
+    size: int
+    mtime_ns: int
 
-    return [
-        sub_path
-        for search_dir in search_dirs
-        if search_dir.exists()
-        for ext in SUBTITLE_EXTENSIONS
-        if (sub_path := search_dir / f"{video_name}{ext}").exists()
-    ]
 
+def split_subdirectories(value: str) -> list[str]:
+    return [name.strip() for name in value.split(",") if name.strip()]
 
-def _find_subtitle_file(video_path: str) -> Path | None:
-    paths = _find_subtitle_paths(Path(video_path))
-    return paths[0] if paths else None
 
+def find_subtitle_tracks(
+    video_path: str, subdirectories: Iterable[str] = ("subs",)
+) -> list[SubtitleTrack]:
+    video_dir = Path(video_path).parent
+    tracks = []
+    for path in subtitle_directory_index.find(Path(video_path), subdirectories):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        label = path.relative_to(video_dir).as_posix()
+        tracks.append(SubtitleTrack(path, label, stat.st_size, stat.st_mtime_ns))
+    return tracks
 
-def _load_subtitle_file(subtitle_path: Path) -> str | None:
-    if not subtitle_path.exists():
-        return None
 
+def _never_cancelled() -> bool:
+    return False
+
+
+def load_subtitle_track(
+    track: SubtitleTrack, is_cancelled: Callable[[], bool] = _never_cancelled
+) -> Subtitle | None:
+    subtitle_path = track.path
     try:
-        return subtitle_path.read_text(encoding="utf-8")
-    except (OSError, UnicodeDecodeError):
+        stat = subtitle_path.stat()
+    except OSError:
         return None
 
+    cached_columns = subtitle_cache.load(subtitle_path, stat)
+    if cached_columns is not None:
+        subtitle = Subtitle(cached_columns, subtitle_path)
+    elif is_cancelled():
+        return None
+    else:
+        try:
+            subtitle = Subtitle.from_file(subtitle_path)
+        except (OSError, UnicodeDecodeError):
+            return None
+        subtitle_cache.store(subtitle_path, stat, subtitle.columns)
 
-def load_subtitles(video_path: str) -> str | None:
-    subtitle_path = _find_subtitle_file(video_path)
-    return _load_subtitle_file(subtitle_path) if subtitle_path else None
+    subtitle.timing = subtitle_timing_store.load(subtitle_path)
+    return subtitle
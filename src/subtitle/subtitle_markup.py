@@ -0,0 +1,155 @@
+import re
+from typing import NamedTuple
+
+# Colors are stored as 0xAARRGGBB, the layout QColor.fromRgba() expects
+NAMED_COLORS = {
+    "white": 0xFFFFFFFF,
+    "silver": 0xFFC0C0C0,
+    "gray": 0xFF808080,
+    "grey": 0xFF808080,
+    "black": 0xFF000000,
+    "red": 0xFFFF0000,
+    "maroon": 0xFF800000,
+    "yellow": 0xFFFFFF00,
+    "olive": 0xFF808000,
+    "lime": 0xFF00FF00,
+    "green": 0xFF008000,
+    "cyan": 0xFF00FFFF,
+    "aqua": 0xFF00FFFF,
+    "teal": 0xFF008080,
+    "blue": 0xFF0000FF,
+    "navy": 0xFF000080,
+    "magenta": 0xFFFF00FF,
+    "fuchsia": 0xFFFF00FF,
+    "purple": 0xFF800080,
+    "orange": 0xFFFFA500,
+    "pink": 0xFFFFC0CB,
+}
+
+ENTITIES = {
+    "amp": "&",
+    "lt": "<",
+    "gt": ">",
+    "nbsp": "\u00a0",
+    "lrm": "\u200e",
+    "rlm": "\u200f",
+}
+
+# <tag attrs>, </tag>, VTT timestamps like <00:01.500>, ASS style overrides
+# like {\an8} that SRT files often carry, and entities
+_TOKEN_PATTERN = re.compile(
+    r"<(/?)([A-Za-z]+)((?:[.\s][^>]*)?)>"
+    r"|<\d[\d:.]*>"
+    r"|\{\\[^}]*\}"
+    r"|&(amp|lt|gt|nbsp|lrm|rlm);"
+)
+_COLOR_ATTRIBUTE = re.compile(r"""color\s*=\s*["']?([#\w]+)""", re.IGNORECASE)
+_MARKUP_CHARS = ("<", "{", "&")
+_SHORT_HEX_DIGITS = 3
+_HEX_DIGITS = 6
+COLOR_TAGS = ("font", "c")
+
+
+class StyledRun(NamedTuple):
+    # A range of the plain text with a style other than the default
+    start: int
+    length: int
+    bold: bool
+    italic: bool
+    underline: bool
+    color: int | None
+
+
+class StyledText(NamedTuple):
+    text: str
+    runs: tuple[StyledRun, ...]
+
+
+def parse_color(value: str) -> int | None:
+    value = value.strip().lower()
+    if value in NAMED_COLORS:
+        return NAMED_COLORS[value]
+    if value.startswith("#"):
+        digits = value[1:]
+        if len(digits) == _SHORT_HEX_DIGITS:
+            digits = "".join(digit * 2 for digit in digits)
+        try:
+            rgb = int(digits, 16)
+        except ValueError:
+            return None
+        if len(digits) == _HEX_DIGITS:
+            return 0xFF000000 | rgb
+    return None
+
+
+def _tag_color(name: str, attributes: str) -> int | None:
+    if name == "font":
+        match = _COLOR_ATTRIBUTE.search(attributes)
+        return parse_color(match.group(1)) if match else None
+    # VTT class spans: <c.yellow.bg_black>, first known color class wins
+    for class_name in attributes.split(".")[1:]:
+        color = NAMED_COLORS.get(class_name.strip().lower())
+        if color is not None:
+            return color
+    return None
+
+
+def has_markup(text: str) -> bool:
+    return any(char in text for char in _MARKUP_CHARS)
+
+
+def parse_markup(text: str) -> StyledText | None:
+    # Returns None for text without any markup, which is the common case
+    if not has_markup(text):
+        return None
+
+    parts: list[str] = []
+    runs: list[StyledRun] = []
+    length = 0
+    depths = {"b": 0, "i": 0, "u": 0}
+    # Every opened font/c tag pushes, even without a usable color, so closing
+    # tags always pop their own entry
+    color_stack: list[tuple[str, int | None]] = []
+
+    def add_text(segment: str) -> None:
+        nonlocal length
+        if not segment:
+            return
+        parts.append(segment)
+        color = next((c for _, c in reversed(color_stack) if c is not None), None)
+        style = (depths["b"] > 0, depths["i"] > 0, depths["u"] > 0, color)
+        if any(style):
+            last = runs[-1] if runs else None
+            if last and last.start + last.length == length and last[2:] == style:
+                runs[-1] = last._replace(length=last.length + len(segment))
+            else:
+                runs.append(StyledRun(length, len(segment), *style))
+        length += len(segment)
+
+    position = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        add_text(text[position : match.start()])
+        position = match.end()
+
+        closing, name, attributes, entity = match.group(1, 2, 3, 4)
+        if entity:
+            add_text(ENTITIES[entity])
+            continue
+        if name is None:
+            continue  # timestamp or ASS override
+
+        name = name.lower()
+        if name in depths:
+            depths[name] = max(0, depths[name] + (-1 if closing else 1))
+        elif name in COLOR_TAGS:
+            if not closing:
+                color_stack.append((name, _tag_color(name, attributes or "")))
+            elif any(tag == name for tag, _ in color_stack):
+                while color_stack.pop()[0] != name:
+                    pass
+    add_text(text[position:])
+
+    plain_text = "".join(parts)
+    if plain_text == text and not runs:
+        return None
+    return StyledText(plain_text, tuple(runs))
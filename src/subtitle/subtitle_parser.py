@@ -1,7 +1,30 @@
 import re
+from array import array
+from collections.abc import Iterable, Iterator
 from enum import Enum, auto
+from pathlib import Path
+from typing import NamedTuple, TextIO
 
 from subtitle.subtitle_entry import SubtitleEntry
+from utils.numpy_support import NUMPY_AVAILABLE, np
+
+SRT_MIN_BLOCK_LINES = 3
+VTT_MIN_BLOCK_LINES = 2
+FORMAT_DETECTION_LENGTH = 20
+READ_CHUNK_SIZE = 256 * 1024
+
+_TIMESTAMP_PATTERN = re.compile(
+    r"(\d{2}):(\d{2}):(\d{2})[,.](\d{3})\s*-->\s*(\d{2}):(\d{2}):(\d{2})[,.](\d{3})"
+)
+_VTT_HEADER_PATTERN = re.compile(r"^WEBVTT[^\n]*\n\n?", flags=re.MULTILINE)
+
+# Vectorized path: canonical timestamp lines start with this fixed-width layout,
+# where "0" marks a digit and either "," or "." may separate the milliseconds
+_TIMESTAMP_TEMPLATE = "00:00:00,000 --> 00:00:00,000"
+
+# Each timestamp is 9 digits, HHMMSSmmm, weighted into milliseconds
+_DIGITS_PER_TIME = 9
+_DIGIT_WEIGHTS = (36_000_000, 3_600_000, 600_000, 60_000, 10_000, 1000, 100, 10, 1)
 
 
 class SubtitleFormat(Enum):
@@ -10,32 +33,154 @@ class SubtitleFormat(Enum):
     VTT = auto()
 
 
-def _parse_timestamp_line(line: str) -> tuple[int, int] | None:
-    timestamp_match = re.match(
-        r"(\d{2}):(\d{2}):(\d{2})[,.](\d{3})\s*-->\s*(\d{2}):(\d{2}):(\d{2})[,.](\d{3})",
-        line,
+class SubtitleBatch(NamedTuple):
+    indices: list[int]
+    start_times: "array[int]"
+    end_times: "array[int]"
+    texts: list[str]
+
+
+def _digits_to_ms(digits: str) -> int:
+    hours, minutes, seconds, millis = (
+        int(digits[0:2]),
+        int(digits[2:4]),
+        int(digits[4:6]),
+        int(digits[6:9]),
     )
+    return ((hours * 3600 + minutes * 60 + seconds) * 1000) + millis
+
+
+def _convert_timestamps(digits: list[str]) -> tuple["array[int]", "array[int]"]:
+    joined = "".join(digits)
 
-    if timestamp_match:
-        start_h, start_m, start_s, start_ms, end_h, end_m, end_s, end_ms = map(
-            int, timestamp_match.groups()
+    if NUMPY_AVAILABLE and joined.isascii():
+        codes = np.frombuffer(joined.encode("ascii"), dtype=np.uint8)
+        matrix = codes.reshape(-1, 2, _DIGITS_PER_TIME).astype(np.int64) - ord("0")
+        times = matrix @ np.array(_DIGIT_WEIGHTS, dtype=np.int64)
+        return (
+            array("q", times[:, 0].tobytes()),
+            array("q", times[:, 1].tobytes()),
         )
 
-        start_time_ms = ((start_h * 3600 + start_m * 60 + start_s) * 1000) + start_ms
-        end_time_ms = ((end_h * 3600 + end_m * 60 + end_s) * 1000) + end_ms
+    return (
+        array("q", [_digits_to_ms(d[:_DIGITS_PER_TIME]) for d in digits]),
+        array("q", [_digits_to_ms(d[_DIGITS_PER_TIME:]) for d in digits]),
+    )
+
+
+def _join_text(text_lines: list[str], strip_text: bool) -> str:
+    if strip_text:
+        text_lines = [line.strip() for line in text_lines]
+    return "\n".join(text_lines)
+
+
+def _canonical_blocks(
+    lines: list[str], min_block_lines: int
+) -> tuple["np.ndarray", "np.ndarray", "np.ndarray"] | None:
+    # Every line already stripped and blocks separated by exactly one blank line
+    if list(map(str.strip, lines)) != lines:
+        return None
+
+    lengths = np.fromiter(map(len, lines), dtype=np.int64, count=len(lines))
+    blank_rows = np.flatnonzero(lengths == 0)
+    block_starts = np.concatenate(([0], blank_rows + 1))
+    block_ends = np.concatenate((blank_rows, [len(lines)]))
+    if np.any(block_ends - block_starts < min_block_lines):
+        return None
+    return lengths, block_starts, block_ends
+
+
+def _template_timestamps(stamps: str) -> "np.ndarray | None":
+    # stamps holds one _TIMESTAMP_TEMPLATE sized prefix per cue
+    if not stamps.isascii():
+        return None
 
-        return start_time_ms, end_time_ms
+    template = np.frombuffer(_TIMESTAMP_TEMPLATE.encode("ascii"), dtype=np.uint8)
+    digit_columns = template == ord("0")
+    decimal_columns = (template == ord(","))[~digit_columns]
 
-    return None
+    matrix = np.frombuffer(stamps.encode("ascii"), dtype=np.uint8)
+    matrix = matrix.reshape(-1, len(template))
+    digit_chars = matrix[:, digit_columns]
+    separators = matrix[:, ~digit_columns]
+    separators_match = (separators == template[~digit_columns]) | (
+        decimal_columns & (separators == ord("."))
+    )
+    if not (
+        separators_match.all()
+        and ((digit_chars >= ord("0")) & (digit_chars <= ord("9"))).all()
+    ):
+        return None
+
+    digits = digit_chars.astype(np.int64) - ord("0")
+    return digits.reshape(-1, 2, _DIGITS_PER_TIME) @ np.array(
+        _DIGIT_WEIGHTS, dtype=np.int64
+    )
+
+
+def _vectorized_batch(
+    chunk: str, min_block_lines: int, first_vtt_index: int | None
+) -> SubtitleBatch | None:
+    # Handles canonical chunks in bulk and returns None for anything else, so
+    # the per-block parser below stays the single source of truth
+    lines = chunk.split("\n")
+    blocks = _canonical_blocks(lines, min_block_lines)
+    if blocks is None:
+        return None
+    lengths, block_starts, block_ends = blocks
+
+    if first_vtt_index is None:
+        try:
+            indices = [int(lines[row]) for row in block_starts.tolist()]
+        except ValueError:
+            return None
+        timestamp_rows = block_starts + 1
+    else:
+        has_arrow = np.fromiter(
+            ("-->" in lines[row] for row in block_starts.tolist()),
+            dtype=bool,
+            count=len(block_starts),
+        )
+        timestamp_rows = block_starts + (~has_arrow).astype(np.int64)
+        indices = list(range(first_vtt_index, first_vtt_index + len(block_starts)))
+
+    width = len(_TIMESTAMP_TEMPLATE)
+    if np.any(timestamp_rows >= block_ends) or np.any(lengths[timestamp_rows] < width):
+        return None
+
+    times = _template_timestamps(
+        "".join([lines[row][:width] for row in timestamp_rows.tolist()])
+    )
+    if times is None:
+        return None
+
+    line_offsets = np.concatenate(([0], np.cumsum(lengths + 1)))
+    text_starts = line_offsets[timestamp_rows + 1].tolist()
+    text_ends = (line_offsets[block_ends] - 1).tolist()
+    texts = [chunk[a:b] for a, b in zip(text_starts, text_ends, strict=True)]
+
+    return SubtitleBatch(
+        indices,
+        array("q", times[:, 0].tobytes()),
+        array("q", times[:, 1].tobytes()),
+        texts,
+    )
 
 
-def _parse_srt(content: str, strip_text: bool = True) -> list[SubtitleEntry]:
-    result = []
-    blocks = content.strip().split("\n\n")
+def _parse_srt_chunk(chunk: str, strip_text: bool) -> SubtitleBatch:
+    if NUMPY_AVAILABLE:
+        batch = _vectorized_batch(chunk.strip("\n"), SRT_MIN_BLOCK_LINES, None)
+        if batch:
+            return batch
 
-    for block in blocks:
+    indices = []
+    digits = []
+    texts = []
+    match_timestamp = _TIMESTAMP_PATTERN.match
+
+    for block in chunk.split("\n\n"):
         lines = block.strip().split("\n")
-        if len(lines) < 3:
+        if len(lines) < SRT_MIN_BLOCK_LINES:
             continue
 
         try:
@@ -43,54 +188,120 @@ def _parse_srt(content: str, strip_text: bool = True) -> list[SubtitleEntry]:
         except ValueError:
             continue
 
-        times = _parse_timestamp_line(lines[1])
-
-        if times:
-            start_ms, end_ms = times
-            text_lines = lines[2:]
-            if strip_text:
-                text_lines = [line.strip() for line in text_lines]
-            text = "\n".join(text_lines)
-
-            result.append(
-                SubtitleEntry(index=index, start_ms=start_ms, end_ms=end_ms, text=text)
-            )
-
-    return result
+        timestamp_match = match_timestamp(lines[1])
+        if timestamp_match:
+            indices.append(index)
+            digits.append("".join(timestamp_match.groups()))
+            texts.append(_join_text(lines[2:], strip_text))
 
+    return SubtitleBatch(indices, *_convert_timestamps(digits), texts)
 
-def _parse_vtt(content: str, strip_text: bool = True) -> list[SubtitleEntry]:
-    result = []
 
-    content = re.sub(r"^WEBVTT[^\n]*\n\n?", "", content, flags=re.MULTILINE)
+def _parse_vtt_chunk(chunk: str, first_index: int, strip_text: bool) -> SubtitleBatch:
+    chunk = _VTT_HEADER_PATTERN.sub("", chunk).strip("\n")
+    if NUMPY_AVAILABLE:
+        batch = _vectorized_batch(chunk, VTT_MIN_BLOCK_LINES, first_index)
+        if batch:
+            return batch
 
-    blocks = content.strip().split("\n\n")
-    index = 1
+    digits = []
+    texts = []
+    match_timestamp = _TIMESTAMP_PATTERN.match
 
-    for block in blocks:
+    for block in chunk.split("\n\n"):
         lines = block.strip().split("\n")
-        if len(lines) < 2:
+        if len(lines) < VTT_MIN_BLOCK_LINES:
             continue
 
         timestamp_line_idx = 0
-        if "-->" not in lines[0] and len(lines) > 1:
+        if "-->" not in lines[0]:
             timestamp_line_idx = 1
 
-        times = _parse_timestamp_line(lines[timestamp_line_idx])
+        timestamp_match = match_timestamp(lines[timestamp_line_idx])
+        if timestamp_match:
+            digits.append("".join(timestamp_match.groups()))
+            texts.append(_join_text(lines[timestamp_line_idx + 1 :], strip_text))
+
+    indices = list(range(first_index, first_index + len(texts)))
+    return SubtitleBatch(indices, *_convert_timestamps(digits), texts)
+
+
+def _read_chunks(file: TextIO) -> Iterator[str]:
+    # Chunks are cut on blank lines so that no cue block spans two chunks
+    remainder = ""
+    while chunk := file.read(READ_CHUNK_SIZE):
+        buffer = remainder + chunk
+        cut = buffer.rfind("\n\n")
+        if cut < 0:
+            remainder = buffer
+            continue
+
+        yield buffer[:cut]
+        remainder = buffer[cut + 2 :]
+
+    if remainder:
+        yield remainder
+
+
+def detect_format(text: str) -> SubtitleFormat:
+    if "WEBVTT" in text[:FORMAT_DETECTION_LENGTH]:
+        return SubtitleFormat.VTT
+    return SubtitleFormat.SRT
+
+
+def split_blocks(text: str) -> tuple[SubtitleFormat, list[str]]:
+    # The same blank line separated blocks the chunk parsers work on, in file
+    # order and without the VTT header. Each block holds at most one cue.
+    subtitle_format = detect_format(text)
+    if subtitle_format == SubtitleFormat.VTT:
+        text = _VTT_HEADER_PATTERN.sub("", text, count=1)
+    text = text.strip("\n")
+    return subtitle_format, text.split("\n\n") if text else []
 
-        if times:
-            start_ms, end_ms = times
-            text_lines = lines[timestamp_line_idx + 1 :]
-            if strip_text:
-                text_lines = [line.strip() for line in text_lines]
-            text = "\n".join(text_lines)
 
-            result.append(
-                SubtitleEntry(index=index, start_ms=start_ms, end_ms=end_ms, text=text)
+def iter_parse_batches(
+    chunks: Iterable[str],
+    subtitle_format: SubtitleFormat = SubtitleFormat.AUTO,
+    strip_text: bool = True,
+) -> Iterator[SubtitleBatch]:
+    next_vtt_index = 1
+
+    for chunk in chunks:
+        if subtitle_format == SubtitleFormat.AUTO:
+            subtitle_format = detect_format(chunk)
+
+        if subtitle_format == SubtitleFormat.VTT:
+            batch = _parse_vtt_chunk(chunk, next_vtt_index, strip_text)
+            next_vtt_index += len(batch.texts)
+        else:
+            batch = _parse_srt_chunk(chunk, strip_text)
+
+        yield batch
+
+
+def iter_parse_file_batches(
+    path: Path,
+    subtitle_format: SubtitleFormat = SubtitleFormat.AUTO,
+    strip_text: bool = True,
+) -> Iterator[SubtitleBatch]:
+    with path.open(encoding="utf-8") as file:
+        yield from iter_parse_batches(_read_chunks(file), subtitle_format, strip_text)
+
+
+def _iter_entries(batches: Iterable[SubtitleBatch]) -> Iterator[SubtitleEntry]:
+    for batch in batches:
+        for index, start_ms, end_ms, text in zip(*batch, strict=True):
+            yield SubtitleEntry(
+                index=index, start_ms=start_ms, end_ms=end_ms, text=text
             )
-            index += 1
 
-    return result
+
+def iter_parse_file(
+    path: Path,
+    subtitle_format: SubtitleFormat = SubtitleFormat.AUTO,
+    strip_text: bool = True,
+) -> Iterator[SubtitleEntry]:
+    return _iter_entries(iter_parse_file_batches(path, subtitle_format, strip_text))
 
 
 def parse(
@@ -98,14 +309,5 @@ def parse(
     subtitle_format: SubtitleFormat = SubtitleFormat.AUTO,
     strip_text: bool = True,
 ) -> list[SubtitleEntry]:
-    match subtitle_format:
-        case SubtitleFormat.SRT:
-            return _parse_srt(content, strip_text)
-        case SubtitleFormat.VTT:
-            return _parse_vtt(content, strip_text)
-        case _:
-            return (
-                _parse_vtt(content, strip_text)
-                if "WEBVTT" in content[:20]
-                else _parse_srt(content, strip_text)
-            )
+    batches = iter_parse_batches([content], subtitle_format, strip_text)
+    return list(_iter_entries(batches))
@@ -0,0 +1,146 @@
+import logging
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from PySide6 import QtCore
+
+from settings.setting_keys import SettingKeys
+from settings.settings_manager import settings_manager
+from subtitle.subtitle import Subtitle
+from subtitle.subtitle_markup import StyledRun
+from subtitle.subtitle_render_cache import (
+    SubtitleImage,
+    SubtitleRenderKey,
+    render_subtitle,
+    subtitle_render_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+PRERENDER_MAX_CUES = 64
+PRERENDER_BATCH_SIZE = 8
+
+_render_executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="subtitle-render"
+)
+
+
+class SubtitlePrerenderer(QtCore.QObject):
+    # Renders the cues starting within the lookahead window on a worker thread,
+    # so that when a cue boundary arrives the display only swaps in a cached
+    # image. The render cache itself is only touched on the GUI thread.
+
+    _rendered = QtCore.Signal(int, object)
+
+    def __init__(
+        self,
+        render_key: Callable[[str, tuple[StyledRun, ...]], SubtitleRenderKey],
+    ) -> None:
+        super().__init__()
+        self._render_key = render_key
+        self._subtitle: Subtitle | None = None
+        self._generation = 0
+        self._snapshot: tuple[object, ...] | None = None
+        self._scheduled_from = 0
+        self._scheduled_until = -1
+        self._rendered.connect(self._on_rendered)
+
+    def set_subtitle(self, subtitle: Subtitle | None) -> None:
+        self._subtitle = subtitle
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        # In-flight batches check the generation and stop early
+        self._generation += 1
+        self._snapshot = None
+        self._scheduled_until = -1
+
+    def update(self, position_ms: int) -> None:
+        subtitle = self._subtitle
+        if subtitle is None:
+            return
+
+        # Font scale, outline size and window size all end up in the render key
+        snapshot = (self._render_key("", ()), subtitle.timing)
+        if snapshot != self._snapshot:
+            self.invalidate()
+            self._snapshot = snapshot
+
+        lookahead_ms = settings_manager.get_int(SettingKeys.SUBTITLE_LOOKAHEAD) * 1000
+        if (
+            self._scheduled_from <= position_ms
+            and position_ms + lookahead_ms // 2 <= self._scheduled_until
+        ):
+            return
+
+        # Continue where the last window ended unless playback jumped
+        start_ms = position_ms
+        if self._scheduled_from <= position_ms <= self._scheduled_until:
+            start_ms = self._scheduled_until + 1
+        end_ms = position_ms + lookahead_ms
+        self._scheduled_from = position_ms
+        self._scheduled_until = end_ms
+
+        self._schedule(subtitle, subtitle.cue_ids_starting_between(start_ms, end_ms))
+
+    def _schedule(self, subtitle: Subtitle, cue_ids: range) -> None:
+        columns = subtitle.columns
+        keys = []
+        seen_texts = set()
+        for cue_id in cue_ids:
+            styled_text = (columns.text(cue_id), columns.runs(cue_id))
+            if styled_text in seen_texts:
+                continue
+            seen_texts.add(styled_text)
+
+            key = self._render_key(*styled_text)
+            if key not in subtitle_render_cache:
+                keys.append(key)
+                if len(keys) >= PRERENDER_MAX_CUES:
+                    break
+
+        generation = self._generation
+        for i in range(0, len(keys), PRERENDER_BATCH_SIZE):
+            batch = keys[i : i + PRERENDER_BATCH_SIZE]
+            future = _render_executor.submit(self._render, generation, batch)
+            future.add_done_callback(
+                lambda future: self._on_render_done(generation, future)
+            )
+
+    def _render(
+        self, generation: int, keys: list[SubtitleRenderKey]
+    ) -> list[tuple[SubtitleRenderKey, SubtitleImage]]:
+        rendered = []
+        for key in keys:
+            if generation != self._generation:
+                break
+            rendered.append((key, render_subtitle(key)))
+        return rendered
+
+    def _on_render_done(
+        self,
+        generation: int,
+        future: Future[list[tuple[SubtitleRenderKey, SubtitleImage]]],
+    ) -> None:
+        # Runs on the worker thread; the signal queues the result to the GUI thread
+        if future.cancelled():
+            return
+
+        try:
+            rendered = future.result()
+        except Exception:
+            logger.exception("Failed to pre-render subtitles")
+            return
+
+        self._rendered.emit(generation, rendered)
+
+    def _on_rendered(
+        self,
+        generation: int,
+        rendered: list[tuple[SubtitleRenderKey, SubtitleImage]],
+    ) -> None:
+        if generation != self._generation:
+            return
+        for key, image in rendered:
+            if key not in subtitle_render_cache:
+                subtitle_render_cache.put(key, image)
@@ -0,0 +1,306 @@
+import logging
+from array import array
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import NamedTuple
+
+from PySide6 import QtCore
+
+from subtitle.subtitle import Subtitle
+from subtitle.subtitle_columns import SubtitleColumns
+from subtitle.subtitle_entry import SubtitleEntry
+from subtitle.subtitle_parser import SubtitleFormat, parse, split_blocks
+
+logger = logging.getLogger(__name__)
+
+# Editors often save in several steps, e.g. truncate and write, or write a
+# temporary file and rename it over the original
+RELOAD_DELAY_MS = 150
+
+_reload_executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="subtitle-reload"
+)
+
+
+@dataclass(slots=True)
+class SubtitleBlocks:
+    # The file as last seen, one hash per block in file order, and the cue id
+    # each block became, or -1 for blocks without a cue
+    subtitle_format: SubtitleFormat
+    hashes: list[int]
+    cue_ids: "array[int]"
+
+
+class SubtitlePatch(NamedTuple):
+    # Blocks [first_block, first_block + removed_blocks) were replaced by
+    # blocks with the given hashes, which parsed into entries
+    first_block: int
+    removed_blocks: int
+    hashes: list[int]
+    entries: list[SubtitleEntry]
+    entry_blocks: list[int]  # block of each entry, relative to first_block
+
+
+def _read_blocks(path: Path) -> tuple[SubtitleFormat, list[str]]:
+    with path.open(encoding="utf-8") as file:
+        return split_blocks(file.read())
+
+
+def snapshot_blocks(path: Path, columns: SubtitleColumns) -> SubtitleBlocks | None:
+    # Returns None when the file no longer matches the loaded cues
+    subtitle_format, blocks = _read_blocks(path)
+    entries = parse("\n\n".join(blocks), subtitle_format)
+    cue_blocks: Sequence[int]
+    if len(entries) == len(blocks):
+        cue_blocks = range(len(blocks))
+    else:
+        cue_blocks = [
+            block_index
+            for block_index, block in enumerate(blocks)
+            for _ in parse(block, subtitle_format)
+        ]
+    if len(entries) != len(cue_blocks) or len(entries) != len(columns):
+        return None
+
+    # Cue ids are the stable start time order of the cues in file order
+    order = sorted(range(len(entries)), key=lambda i: entries[i].start_ms)
+    cue_ids = array("q", [-1]) * len(blocks)
+    for cue_id, i in enumerate(order):
+        entry = entries[i]
+        if (
+            entry.start_ms != columns.start_times[cue_id]
+            or entry.end_ms != columns.end_times[cue_id]
+            or entry.text != columns.raw_text(cue_id)
+        ):
+            return None
+        cue_ids[cue_blocks[i]] = cue_id
+    return SubtitleBlocks(subtitle_format, [hash(block) for block in blocks], cue_ids)
+
+
+def diff_blocks(path: Path, snapshot: SubtitleBlocks) -> SubtitlePatch | None:
+    # Parses only the blocks between the longest unchanged prefix and suffix.
+    # Returns None if the file has to be reloaded as a whole.
+    subtitle_format, blocks = _read_blocks(path)
+    if subtitle_format != snapshot.subtitle_format:
+        return None
+
+    hashes = [hash(block) for block in blocks]
+    old_hashes = snapshot.hashes
+    limit = min(len(hashes), len(old_hashes))
+    prefix = 0
+    while prefix < limit and hashes[prefix] == old_hashes[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and hashes[-1 - suffix] == old_hashes[-1 - suffix]:
+        suffix += 1
+
+    # VTT cues carry no number of their own and are counted in file order
+    vtt_index = 1 + sum(cue_id >= 0 for cue_id in snapshot.cue_ids[:prefix])
+    entries: list[SubtitleEntry] = []
+    entry_blocks = []
+    changed_blocks = blocks[prefix : len(blocks) - suffix]
+    for offset, block in enumerate(changed_blocks):
+        for entry in parse(block, subtitle_format):
+            if subtitle_format == SubtitleFormat.VTT:
+                entry.index = vtt_index + len(entries)
+            entries.append(entry)
+            entry_blocks.append(offset)
+
+    return SubtitlePatch(
+        prefix,
+        len(old_hashes) - prefix - suffix,
+        hashes[prefix : len(hashes) - suffix],
+        entries,
+        entry_blocks,
+    )
+
+
+def _reload(path: Path) -> tuple[Subtitle, SubtitleBlocks | None]:
+    subtitle = Subtitle.from_file(path)
+    return subtitle, snapshot_blocks(path, subtitle.columns)
+
+
+class SubtitleReloader(QtCore.QObject):
+    # Watches the file of the active subtitles. Edits are diffed block by block
+    # against a snapshot taken when watching started, and only blocks that
+    # differ are parsed and patched into the loaded Subtitle, so playback
+    # carries on with the same object. Only when the file can't be matched to
+    # the snapshot is it parsed again as a whole, into a new Subtitle.
+
+    subtitles_patched = QtCore.Signal(object)
+    subtitles_replaced = QtCore.Signal(object, object)
+    _snapshot_taken = QtCore.Signal(int, object)
+    _patch_ready = QtCore.Signal(int, object)
+    _reloaded = QtCore.Signal(int, object)
+
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._delay_timer = QtCore.QTimer(self)
+        self._delay_timer.setSingleShot(True)
+        self._delay_timer.setInterval(RELOAD_DELAY_MS)
+        self._delay_timer.timeout.connect(self._start_reload)
+
+        self._subtitle: Subtitle | None = None
+        self._snapshot: SubtitleBlocks | None = None
+        self._generation = 0
+        self._busy = False
+        self._changed = False
+
+        self._snapshot_taken.connect(self._on_snapshot_taken)
+        self._patch_ready.connect(self._on_patch_ready)
+        self._reloaded.connect(self._on_reloaded)
+
+    def watch(self, subtitle: Subtitle | None) -> None:
+        if subtitle is self._subtitle:
+            return
+
+        if self._watcher.files():
+            self._watcher.removePaths(self._watcher.files())
+        self._delay_timer.stop()
+        self._generation += 1
+        self._subtitle = subtitle
+        self._snapshot = None
+        self._busy = False
+        self._changed = False
+
+        if subtitle is not None and subtitle.path is not None:
+            self._watcher.addPath(str(subtitle.path))
+            self._submit(
+                self._snapshot_taken, snapshot_blocks, subtitle.path, subtitle.columns
+            )
+
+    def _on_file_changed(self, _path: str) -> None:
+        self._delay_timer.start()
+
+    def _start_reload(self) -> None:
+        path = self._subtitle.path if self._subtitle else None
+        if path is None:
+            return
+        # Replacing the file by renaming drops it from the watcher
+        if str(path) not in self._watcher.files() and path.exists():
+            self._watcher.addPath(str(path))
+
+        if self._busy:
+            self._changed = True
+        elif self._snapshot is not None:
+            self._submit(self._patch_ready, diff_blocks, path, self._snapshot)
+        else:
+            self._submit(self._reloaded, _reload, path)
+
+    def _submit(
+        self,
+        result_signal: QtCore.SignalInstance,
+        job: Callable[..., object],
+        *args: object,
+    ) -> None:
+        self._busy = True
+        generation = self._generation
+        future = _reload_executor.submit(job, *args)
+        future.add_done_callback(
+            lambda future: self._on_future_done(generation, result_signal, future)
+        )
+
+    def _on_future_done(
+        self,
+        generation: int,
+        result_signal: QtCore.SignalInstance,
+        future: Future[object],
+    ) -> None:
+        # Runs on the worker thread; the signal queues the result to the GUI thread
+        try:
+            result = future.result()
+        except Exception:
+            logger.exception("Failed to read changed subtitle file")
+            result = None
+        result_signal.emit(generation, result)
+
+    def _finish_job(self) -> None:
+        self._busy = False
+        if self._changed:
+            self._changed = False
+            self._start_reload()
+
+    def _on_snapshot_taken(
+        self, generation: int, snapshot: SubtitleBlocks | None
+    ) -> None:
+        subtitle = self._subtitle
+        if generation != self._generation or subtitle is None:
+            return
+        if snapshot is None:
+            # The file changed since the cues were loaded, e.g. while another
+            # track was active, so it is loaded again as a whole
+            self._submit(self._reloaded, _reload, subtitle.path)
+            return
+        self._snapshot = snapshot
+        self._finish_job()
+
+    def _on_patch_ready(self, generation: int, patch: SubtitlePatch | None) -> None:
+        subtitle = self._subtitle
+        if generation != self._generation or subtitle is None:
+            return
+
+        if patch is None:
+            self._submit(self._reloaded, _reload, subtitle.path)
+            return
+
+        if patch.removed_blocks or patch.hashes:
+            self._apply_patch(patch)
+            self.subtitles_patched.emit(subtitle)
+        self._finish_job()
+
+    def _apply_patch(self, patch: SubtitlePatch) -> None:
+        subtitle = self._subtitle
+        snapshot = self._snapshot
+        if subtitle is None or snapshot is None:
+            return
+        end_block = patch.first_block + patch.removed_blocks
+        removed_ids = [
+            i for i in snapshot.cue_ids[patch.first_block : end_block] if i >= 0
+        ]
+        before_ids: set[int] | None = None
+
+        def precedes(cue_id: int) -> bool:
+            # Only asked about cues tied with an entry, so rarely built
+            nonlocal before_ids
+            if before_ids is None:
+                before_ids = set(snapshot.cue_ids[: patch.first_block])
+            return cue_id in before_ids
+
+        entry_ids, renumbered = subtitle.replace_cues(
+            removed_ids, patch.entries, precedes
+        )
+        logger.debug(
+            "Patched %d cues over %d edited subtitle blocks",
+            len(patch.entries),
+            len(patch.hashes),
+        )
+
+        if renumbered is not None:
+            snapshot.cue_ids = array(
+                "q", [renumbered[i] if i >= 0 else -1 for i in snapshot.cue_ids]
+            )
+        cue_ids = array("q", [-1]) * len(patch.hashes)
+        for block, cue_id in zip(patch.entry_blocks, entry_ids, strict=True):
+            cue_ids[block] = cue_id
+        snapshot.cue_ids[patch.first_block : end_block] = cue_ids
+        snapshot.hashes[patch.first_block : end_block] = patch.hashes
+
+    def _on_reloaded(
+        self,
+        generation: int,
+        result: tuple[Subtitle, SubtitleBlocks | None] | None,
+    ) -> None:
+        old_subtitle = self._subtitle
+        if generation != self._generation or old_subtitle is None:
+            return
+
+        if result is not None:
+            subtitle, self._snapshot = result
+            subtitle.timing = old_subtitle.timing
+            self._subtitle = subtitle
+            self.subtitles_replaced.emit(old_subtitle, subtitle)
+        self._finish_job()
@@ -0,0 +1,103 @@
+import math
+from collections import OrderedDict
+from typing import NamedTuple
+
+from PySide6 import QtCore, QtGui
+
+from primitive.outlined_text import (
+    layout_outlined_text,
+    outline_pen,
+    paint_outlined_text,
+)
+from subtitle.subtitle_markup import StyledRun
+
+RENDER_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+class SubtitleRenderKey(NamedTuple):
+    text: str
+    font: str  # QFont.toString(), which includes the point size
+    outline_width: int
+    outline_color: int  # QColor.rgba()
+    text_color: int
+    device_pixel_ratio: float
+    text_width: float
+    runs: tuple[StyledRun, ...] = ()
+
+
+class SubtitleImage(NamedTuple):
+    # image covers only the inked part of the layout box, placed at offset
+    image: QtGui.QImage
+    offset: QtCore.QPointF
+    size: QtCore.QSizeF
+
+
+def render_subtitle(key: SubtitleRenderKey) -> SubtitleImage:
+    # Only touches QImage and glyph outlines, so it is safe off the GUI thread
+    font = QtGui.QFont()
+    font.fromString(key.font)
+    outlined_text = layout_outlined_text(key.text, font, key.text_width, key.runs)
+
+    # Snap to whole pixels so the image blits without resampling
+    margin = max(0, key.outline_width) / 2 + 1
+    inked = outlined_text.inked_rect.adjusted(-margin, -margin, margin, margin)
+    inked = QtCore.QRectF(inked.toAlignedRect())
+
+    dpr = key.device_pixel_ratio
+    image = QtGui.QImage(
+        max(1, math.ceil(inked.width() * dpr)),
+        max(1, math.ceil(inked.height() * dpr)),
+        QtGui.QImage.Format.Format_ARGB32_Premultiplied,
+    )
+    image.setDevicePixelRatio(dpr)
+    image.fill(QtCore.Qt.GlobalColor.transparent)
+
+    painter = QtGui.QPainter(image)
+    painter.translate(-inked.topLeft())
+    paint_outlined_text(
+        painter,
+        outlined_text,
+        QtGui.QColor.fromRgba(key.text_color),
+        outline_pen(QtGui.QColor.fromRgba(key.outline_color), key.outline_width),
+    )
+    painter.end()
+
+    return SubtitleImage(image, inked.topLeft(), outlined_text.size)
+
+
+class SubtitleRenderCache:
+    def __init__(self, max_bytes: int = RENDER_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._images: OrderedDict[SubtitleRenderKey, SubtitleImage] = OrderedDict()
+        self._total_bytes = 0
+
+    def __contains__(self, key: SubtitleRenderKey) -> bool:
+        return key in self._images
+
+    def get(self, key: SubtitleRenderKey) -> SubtitleImage | None:
+        rendered = self._images.get(key)
+        if rendered is not None:
+            self._images.move_to_end(key)
+        return rendered
+
+    def put(self, key: SubtitleRenderKey, rendered: SubtitleImage) -> None:
+        previous = self._images.pop(key, None)
+        if previous is not None:
+            self._total_bytes -= previous.image.sizeInBytes()
+
+        self._images[key] = rendered
+        self._total_bytes += rendered.image.sizeInBytes()
+        while self._total_bytes > self.max_bytes and len(self._images) > 1:
+            _, evicted = self._images.popitem(last=False)
+            self._total_bytes -= evicted.image.sizeInBytes()
+
+    def get_or_render(self, key: SubtitleRenderKey) -> SubtitleImage:
+        rendered = self.get(key)
+        if rendered is None:
+            rendered = render_subtitle(key)
+            self.put(key, rendered)
+        return rendered
+
+
+# Global singleton
+subtitle_render_cache = SubtitleRenderCache()
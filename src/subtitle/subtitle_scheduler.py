@@ -0,0 +1,125 @@
+import math
+
+from PySide6 import QtCore
+
+from subtitle.subtitle import Subtitle
+from subtitle.subtitle_cursor import SubtitleCursor
+
+DRIFT_TOLERANCE_MS = 100
+WAKE_INTERVAL_MS = 5000
+# While frames are arriving the timer only backs them up, so it fires a bit
+# after the boundary to let the frame that crosses it make the change
+FRAME_SYNC_GRACE_MS = 100
+FRAME_TIMEOUT_MS = 250
+
+
+class SubtitleScheduler(QtCore.QObject):
+    # Instead of looking up cues on every position notification, the media
+    # position is extrapolated from the last sync and a single precise timer is
+    # armed for the next cue boundary. Position notifications are only compared
+    # against the extrapolated clock to notice seeks and stalls.
+
+    cues_changed = QtCore.Signal(object)
+    position_advanced = QtCore.Signal(int)
+
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+        self._clock = QtCore.QElapsedTimer()
+        self._clock.start()
+        self._cursor: SubtitleCursor | None = None
+        self._anchor_position_ms = 0
+        self._anchor_clock_ms = 0
+        self._playing = False
+        self._rate = 1.0
+        self._target_ms: int | None = None
+        self._frame_sync = False
+        self._last_frame_clock_ms: int | None = None
+
+    def position_ms(self) -> int:
+        if not self._playing:
+            return self._anchor_position_ms
+        elapsed_ms = self._clock.elapsed() - self._anchor_clock_ms
+        return self._anchor_position_ms + int(elapsed_ms * self._rate)
+
+    def set_subtitles(self, subtitles: Subtitle | None, position_ms: int) -> None:
+        self._cursor = subtitles.cursor() if subtitles else None
+        self.cues_changed.emit([])
+        self.sync(position_ms)
+
+    def refresh(self, position_ms: int) -> None:
+        # Looks up the cues again after the subtitles changed in place
+        if self._cursor:
+            self._cursor.reset()
+        self.sync(position_ms)
+
+    def set_clock(self, position_ms: int, playing: bool, rate: float) -> None:
+        self._playing = playing
+        self._rate = rate
+        self.sync(position_ms)
+
+    def set_frame_sync(self, enabled: bool) -> None:
+        self._frame_sync = enabled
+        self._last_frame_clock_ms = None
+
+    def present_frame(self, frame_ms: int) -> None:
+        # The frame's own timestamp is the best clock there is: cue changes
+        # made here land in the same scene update as the frame they belong to
+        if not self._frame_sync:
+            return
+        self._last_frame_clock_ms = self._clock.elapsed()
+        self.sync(frame_ms)
+
+    def change_ms(self) -> int | None:
+        return self._cursor.change_ms() if self._cursor else None
+
+    def check_position(self, position_ms: int) -> None:
+        if abs(position_ms - self.position_ms()) > DRIFT_TOLERANCE_MS:
+            self.sync(position_ms)
+
+    def sync(self, position_ms: int) -> None:
+        self._anchor_position_ms = position_ms
+        self._anchor_clock_ms = self._clock.elapsed()
+        self._advance(position_ms)
+
+    def _on_timeout(self) -> None:
+        # Never act before the boundary the timer was armed for
+        position_ms = self.position_ms()
+        if self._target_ms is not None:
+            position_ms = max(position_ms, self._target_ms)
+        self._advance(position_ms)
+
+    def _advance(self, position_ms: int) -> None:
+        if self._cursor and self._cursor.move_to(position_ms):
+            self.cues_changed.emit(self._cursor.entries)
+        self.position_advanced.emit(position_ms)
+        self._arm(position_ms)
+
+    def _arm(self, position_ms: int) -> None:
+        self._timer.stop()
+        self._target_ms = None
+        if not self._playing or self._rate <= 0:
+            return
+
+        # Also wake up periodically so listeners of position_advanced, like the
+        # pre-renderer, keep up across long gaps between cues
+        target_ms = position_ms + WAKE_INTERVAL_MS
+        next_change_ms = self._cursor.next_change_ms() if self._cursor else None
+        if next_change_ms is not None:
+            target_ms = min(target_ms, next_change_ms)
+
+        self._target_ms = target_ms
+        delay_ms = math.ceil((target_ms - position_ms) / self._rate)
+        if self._is_frame_synced():
+            delay_ms += FRAME_SYNC_GRACE_MS
+        self._timer.start(max(0, delay_ms))
+
+    def _is_frame_synced(self) -> bool:
+        return (
+            self._last_frame_clock_ms is not None
+            and self._clock.elapsed() - self._last_frame_clock_ms < FRAME_TIMEOUT_MS
+        )
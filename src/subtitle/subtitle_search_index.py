@@ -0,0 +1,121 @@
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from itertools import compress, count, islice
+from operator import and_
+
+from subtitle.subtitle_columns import SubtitleColumns
+
+MAX_RESULTS = 200
+# Typing a query repeats its terms and extends their prefixes one at a time,
+# so the texts matching each term are kept, up to this many in total
+TERM_CACHE_TEXTS = 500_000
+
+_WORD_PATTERN = re.compile(r"\w+")
+_PREFIX_END = "\U0010ffff"
+
+
+def normalize(text: str) -> str:
+    # Case and accent insensitive: "Café" and "CAFE" both become "cafe"
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> list[str]:
+    return _WORD_PATTERN.findall(normalize(text))
+
+
+class SubtitleSearchIndex:
+    # Inverted index from normalized words to the texts of the pool that
+    # contain them. A query matches cues whose text has a word starting with
+    # each of its terms; the results are cue ids in time order.
+
+    def __init__(self, columns: SubtitleColumns) -> None:
+        self._text_ids = array("I", columns.text_ids)
+        # Most texts belong to one cue; repeated ones list all of theirs
+        self._first_cues: dict[int, int] = {}
+        self._repeated_cues: dict[int, list[int]] = {}
+        for cue_id, text_id in enumerate(self._text_ids):
+            first_cue = self._first_cues.setdefault(text_id, cue_id)
+            if first_cue != cue_id:
+                self._repeated_cues.setdefault(text_id, [first_cue]).append(cue_id)
+
+        postings: dict[str, list[int]] = {}
+        for text_id, cue_id in self._first_cues.items():
+            for word in set(tokenize(columns.text(cue_id))):
+                postings.setdefault(word, []).append(text_id)
+
+        self._words = sorted(postings)
+        self._postings = [array("I", postings[word]) for word in self._words]
+        self._term_cache: OrderedDict[tuple[int, int], frozenset[int]] = OrderedDict()
+        self._term_cache_texts = 0
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def search(self, query: str, limit: int = MAX_RESULTS) -> list[int]:
+        term_texts = []
+        for term in tokenize(query):
+            texts = self._texts_with_prefix(term)
+            if not texts:
+                return []
+            term_texts.append(texts)
+        if not term_texts:
+            return []
+
+        # Walking the cues in time order until enough match takes fewer steps
+        # the more texts match, while intersecting the term sets costs about
+        # as much as the smallest one is large. The number of matches is
+        # estimated with the terms taken as independent.
+        term_texts.sort(key=len)
+        text_count = len(self._first_cues)
+        expected_matches = float(len(term_texts[0]))
+        for texts in term_texts[1:]:
+            expected_matches *= len(texts) / text_count
+        scan_steps = len(term_texts) * limit * len(self._text_ids)
+        if scan_steps < expected_matches * len(term_texts[0]):
+            return self._scan(term_texts, limit)
+
+        text_ids = term_texts[0].intersection(*term_texts[1:])
+        if limit * len(self._text_ids) < len(text_ids) * len(text_ids):
+            return self._scan([text_ids], limit)
+
+        cue_ids = []
+        for text_id in text_ids:
+            repeated = self._repeated_cues.get(text_id)
+            if repeated is None:
+                cue_ids.append(self._first_cues[text_id])
+            else:
+                cue_ids.extend(repeated)
+        cue_ids.sort()
+        return cue_ids[:limit]
+
+    def _scan(self, term_texts: list[frozenset[int]], limit: int) -> list[int]:
+        matches = map(term_texts[0].__contains__, self._text_ids)
+        for texts in term_texts[1:]:
+            matches = map(and_, matches, map(texts.__contains__, self._text_ids))
+        return list(islice(compress(count(), matches), limit))
+
+    def _texts_with_prefix(self, term: str) -> frozenset[int]:
+        # Words starting with term are one range of the sorted word list
+        word_range = (
+            bisect_left(self._words, term),
+            bisect_left(self._words, term + _PREFIX_END),
+        )
+        texts = self._term_cache.get(word_range)
+        if texts is not None:
+            self._term_cache.move_to_end(word_range)
+            return texts
+
+        first, last = word_range
+        texts = frozenset().union(*self._postings[first:last])
+        self._term_cache[word_range] = texts
+        self._term_cache_texts += len(texts)
+        while self._term_cache_texts > TERM_CACHE_TEXTS and len(self._term_cache) > 1:
+            _, evicted = self._term_cache.popitem(last=False)
+            self._term_cache_texts -= len(evicted)
+        return texts
@@ -0,0 +1,90 @@
+import logging
+import statistics
+from bisect import bisect_left
+from collections import Counter, deque
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+FRAME_HISTORY = 240
+# A jump between consecutive frames larger than this is treated as a seek
+MAX_FRAME_GAP_MS = 250
+REPORT_INTERVAL = 50
+
+
+class PendingProbe(NamedTuple):
+    boundary_ms: int
+    shown_ms: int
+
+
+class SubtitleSyncProbe:
+    # Measures on which video frame each cue change became visible, relative
+    # to the first frame at or after the cue boundary. An error of 0 means the
+    # change landed on exactly the frame it belongs to; positive is late.
+    # Changes caused by seeks are discarded along with the frame history.
+
+    def __init__(self) -> None:
+        self._frames: deque[int] = deque(maxlen=FRAME_HISTORY)
+        # Boundaries of changes waiting for the frame that shows them
+        self._changed: list[int] = []
+        self._pending: list[PendingProbe] = []
+        self.errors_ms: list[int] = []
+        self.errors_frames: list[int] = []
+
+    def reset(self) -> None:
+        self._frames.clear()
+        self._changed.clear()
+        self._pending.clear()
+
+    def cue_changed(self, boundary_ms: int | None) -> None:
+        # Called when a change is applied; it becomes visible with the next frame
+        if boundary_ms is not None:
+            self._changed.append(boundary_ms)
+
+    def frame_presented(self, frame_ms: int) -> None:
+        if self._frames and not (0 <= frame_ms - self._frames[-1] <= MAX_FRAME_GAP_MS):
+            self.reset()
+        if not self._frames or frame_ms != self._frames[-1]:
+            self._frames.append(frame_ms)
+
+        self._pending.extend(PendingProbe(b, frame_ms) for b in self._changed)
+        self._changed.clear()
+        self._pending = [p for p in self._pending if not self._resolve(*p)]
+
+    def _resolve(self, boundary_ms: int, shown_ms: int) -> bool:
+        frames = list(self._frames)
+        ideal = bisect_left(frames, boundary_ms)
+        if ideal == len(frames):
+            return False  # the frame the change belongs to is still to come
+        if ideal == 0 and frames[0] != boundary_ms:
+            return True  # belongs to a frame from before the history, unknown
+
+        shown = bisect_left(frames, shown_ms)
+        self.errors_ms.append(shown_ms - frames[ideal])
+        self.errors_frames.append(shown - ideal)
+        if len(self.errors_ms) % REPORT_INTERVAL == 0:
+            self.log_report()
+        return True
+
+    def report(self) -> str | None:
+        if not self.errors_ms:
+            return None
+
+        count = len(self.errors_ms)
+        errors = sorted(self.errors_ms)
+        exact = self.errors_frames.count(0)
+        histogram = ", ".join(
+            f"{offset:+d}: {n}"
+            for offset, n in sorted(Counter(self.errors_frames).items())
+        )
+        return (
+            f"{count} cue changes, {exact / count:.0%} on the exact frame; "
+            f"error ms median {statistics.median(errors):g}, "
+            f"p95 {errors[min(count - 1, int(count * 0.95))]}, "
+            f"min {errors[0]}, max {errors[-1]}; frames [{histogram}]"
+        )
+
+    def log_report(self) -> None:
+        report = self.report()
+        if report:
+            logger.info("Subtitle presentation error: %s", report)
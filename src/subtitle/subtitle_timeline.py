@@ -0,0 +1,192 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Sequence
+
+from utils.numpy_support import NUMPY_AVAILABLE, np
+
+EMPTY_SET_ID = 0
+LOCAL_SEARCH_STEPS = 4
+
+
+def _sweep(
+    start_times: Sequence[int],
+    end_times: Sequence[int],
+    cue_ids: Sequence[int],
+    boundaries: Iterable[int],
+) -> Iterator[tuple[int, tuple[int, ...]]]:
+    # The cues of cue_ids active at each boundary, in cue id order. cue_ids must
+    # be sorted and every cue starting after the first boundary must start on
+    # a boundary.
+    by_start = sorted(cue_ids, key=lambda i: start_times[i])
+    by_end = sorted(cue_ids, key=lambda i: end_times[i])
+    active: dict[int, None] = {}
+    start_pos = end_pos = 0
+
+    for boundary in boundaries:
+        while end_pos < len(by_end) and end_times[by_end[end_pos]] < boundary:
+            active.pop(by_end[end_pos], None)
+            end_pos += 1
+        while (
+            start_pos < len(by_start) and start_times[by_start[start_pos]] <= boundary
+        ):
+            active[by_start[start_pos]] = None
+            start_pos += 1
+        yield boundary, tuple(active)
+
+
+class SubtitleTimeline:
+    # Display segments: between two consecutive boundaries the set of active cues
+    # is constant. End times are inclusive, as in SubtitleEntry.is_displayed_at.
+    # Distinct active sets are stored once, as slices of a flat cue id array, and
+    # each segment refers to its set by id.
+
+    def __init__(self, start_times: Sequence[int], end_times: Sequence[int]) -> None:
+        self._boundaries = array("q")
+        self._segment_set_ids = array("I")
+        self._set_offsets = array("q", [0, 0])
+        self._set_cues = array("I")
+        self._build(start_times, end_times)
+
+    def _build(self, start_times: Sequence[int], end_times: Sequence[int]) -> None:
+        cue_ids = [i for i in range(len(start_times)) if end_times[i] >= start_times[i]]
+        boundaries = sorted(
+            {start_times[i] for i in cue_ids} | {end_times[i] + 1 for i in cue_ids}
+        )
+
+        set_ids: dict[tuple[int, ...], int] = {(): EMPTY_SET_ID}
+        set_id = EMPTY_SET_ID
+        for boundary, active_set in _sweep(start_times, end_times, cue_ids, boundaries):
+            next_set_id = set_ids.get(active_set)
+            if next_set_id is None:
+                next_set_id = set_ids[active_set] = self._add_set(active_set)
+
+            if next_set_id != set_id:
+                self._boundaries.append(boundary)
+                self._segment_set_ids.append(next_set_id)
+                set_id = next_set_id
+
+    def renumber(self, new_ids: "array[int]") -> None:
+        # Maps every cue id through new_ids after cues were inserted or removed
+        # without changing their order. Removed cues map to -1; they can only
+        # be in sets of segments their change is about to patch, so any id
+        # will do for them meanwhile.
+        if not new_ids:
+            # Only stand-ins for cues removed before are left
+            self._set_cues = array("I", [0]) * len(self._set_cues)
+        elif NUMPY_AVAILABLE:
+            ids = np.frombuffer(new_ids, dtype=np.int64)[
+                np.frombuffer(self._set_cues, dtype=np.uint32)
+            ]
+            self._set_cues = array("I", np.maximum(ids, 0).astype(np.uint32).tobytes())
+        else:
+            self._set_cues = array("I", [max(0, new_ids[i]) for i in self._set_cues])
+
+    def patch(
+        self,
+        start_times: Sequence[int],
+        end_times: Sequence[int],
+        cue_ids: Iterable[int],
+        window_start: int,
+        window_end: int,
+    ) -> None:
+        # Recomputes only the segments in [window_start, window_end) after the
+        # cues in cue_ids changed, both before and after the change lying within
+        # the window. Sets no segment refers to anymore stay behind in the set
+        # arrays.
+        boundaries = self._boundaries
+        first = bisect_left(boundaries, window_start)
+        last = bisect_left(boundaries, window_end)
+        before_set_id = self.active_set_id(first - 1)
+        after_set_id = self.active_set_id(bisect_right(boundaries, window_end) - 1)
+
+        candidates = {
+            *self.active_at(window_start),
+            *range(
+                bisect_left(start_times, window_start),
+                bisect_left(start_times, window_end),
+            ),
+            *cue_ids,
+        }
+        # Removed cues renumbered to a stand-in may point past the last cue
+        cues = sorted(
+            i
+            for i in candidates
+            if i < len(start_times)
+            and start_times[i] <= end_times[i]
+            and start_times[i] < window_end
+            and end_times[i] >= window_start
+        )
+        points = sorted(
+            {window_start}
+            | {start_times[i] for i in cues if start_times[i] > window_start}
+            | {end_times[i] + 1 for i in cues if end_times[i] + 1 < window_end}
+        )
+
+        new_boundaries = array("q")
+        new_set_ids = array("I")
+        active_set = tuple(self.active_cues(before_set_id))
+        for point, next_set in _sweep(start_times, end_times, cues, points):
+            if next_set != active_set:
+                new_boundaries.append(point)
+                new_set_ids.append(self._add_set(next_set))
+                active_set = next_set
+
+        if active_set != tuple(self.active_cues(after_set_id)):
+            if last == len(boundaries) or boundaries[last] != window_end:
+                new_boundaries.append(window_end)
+                new_set_ids.append(after_set_id)
+        elif last < len(boundaries) and boundaries[last] == window_end:
+            last += 1  # the window now ends with the set that follows it
+
+        boundaries[first:last] = new_boundaries
+        self._segment_set_ids[first:last] = new_set_ids
+
+    def _add_set(self, cue_ids: tuple[int, ...]) -> int:
+        if not cue_ids:
+            return EMPTY_SET_ID
+        self._set_cues.extend(cue_ids)
+        self._set_offsets.append(len(self._set_cues))
+        return len(self._set_offsets) - 2
+
+    def __len__(self) -> int:
+        return len(self._segment_set_ids)
+
+    def active_at(self, time_ms: int) -> Sequence[int]:
+        return self.active_cues(self.active_set_id(self.segment_index_at(time_ms)))
+
+    def active_set_id(self, segment_index: int) -> int:
+        if segment_index < 0:
+            return EMPTY_SET_ID
+        return self._segment_set_ids[segment_index]
+
+    def segment_start(self, segment_index: int) -> int | None:
+        if segment_index < 0:
+            return None
+        return self._boundaries[segment_index]
+
+    def next_boundary(self, segment_index: int) -> int | None:
+        # Start of the segment after segment_index, i.e. the next time the
+        # active set changes
+        next_index = segment_index + 1
+        if next_index < len(self._boundaries):
+            return self._boundaries[next_index]
+        return None
+
+    def active_cues(self, set_id: int) -> Sequence[int]:
+        return self._set_cues[self._set_offsets[set_id] : self._set_offsets[set_id + 1]]
+
+    def segment_index_at(self, time_ms: int, hint: int = -1) -> int:
+        # Playback is mostly monotonic, so try stepping forward from the last
+        # segment before falling back to a binary search
+        boundaries = self._boundaries
+        idx = hint
+        for _ in range(LOCAL_SEARCH_STEPS):
+            if idx + 1 >= len(boundaries) or time_ms < boundaries[idx + 1]:
+                break
+            idx += 1
+
+        if (idx < 0 or boundaries[idx] <= time_ms) and (
+            idx + 1 >= len(boundaries) or time_ms < boundaries[idx + 1]
+        ):
+            return idx
+        return bisect_right(boundaries, time_ms) - 1
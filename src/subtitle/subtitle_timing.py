@@ -0,0 +1,85 @@
+import hashlib
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+from PySide6 import QtCore
+
+TIMING_SETTINGS_GROUP = "subtitle_timing"
+
+# Subtitle frame rate -> video frame rate
+RATE_PRESETS = {
+    "Original": 1.0,
+    "23.976 → 24 fps": 24000 / 1001 / 24,
+    "24 → 23.976 fps": 24 / (24000 / 1001),
+    "23.976 → 25 fps": 24000 / 1001 / 25,
+    "25 → 23.976 fps": 25 / (24000 / 1001),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class SubtitleTiming:
+    # A cue at subtitle time t is shown at media time t * rate + delay_ms
+    delay_ms: int = 0
+    rate: float = 1.0
+
+    @property
+    def is_identity(self) -> bool:
+        return self.delay_ms == 0 and self.rate == 1.0
+
+    def to_subtitle_time(self, media_ms: int) -> int:
+        if self.is_identity:
+            return media_ms
+        return math.floor((media_ms - self.delay_ms) / self.rate)
+
+    def to_media_time(self, subtitle_ms: int) -> int:
+        # The first media time that maps back to subtitle_ms or later, so a
+        # timer armed for a cue boundary never fires just short of it
+        if self.is_identity:
+            return subtitle_ms
+        media_ms = math.ceil(subtitle_ms * self.rate) + self.delay_ms
+        while self.to_subtitle_time(media_ms) < subtitle_ms:
+            media_ms += 1
+        while self.to_subtitle_time(media_ms - 1) >= subtitle_ms:
+            media_ms -= 1
+        return media_ms
+
+
+def _settings_key(subtitle_path: Path) -> str:
+    path_hash = hashlib.sha1(
+        str(subtitle_path.resolve()).encode(), usedforsecurity=False
+    ).hexdigest()[:16]
+    return f"{TIMING_SETTINGS_GROUP}/{path_hash}"
+
+
+class SubtitleTimingStore:
+    # Per-file timings live in their own QSettings file so they don't clutter
+    # the main configuration. A fresh QSettings is used per call because the
+    # loader reads timings from a worker thread.
+
+    def __init__(self, organization: str = "VideoPlayer") -> None:
+        self._organization = organization
+
+    def _settings(self) -> QtCore.QSettings:
+        return QtCore.QSettings(self._organization, "SubtitleTiming")
+
+    def load(self, subtitle_path: Path) -> SubtitleTiming:
+        value = self._settings().value(_settings_key(subtitle_path))
+        try:
+            delay_ms, rate = value
+            timing = SubtitleTiming(int(delay_ms), float(rate))
+        except (TypeError, ValueError):
+            return SubtitleTiming()
+        return timing if timing.rate > 0 else SubtitleTiming()
+
+    def save(self, subtitle_path: Path, timing: SubtitleTiming) -> None:
+        settings = self._settings()
+        key = _settings_key(subtitle_path)
+        if timing.is_identity:
+            settings.remove(key)
+        else:
+            settings.setValue(key, [timing.delay_ms, timing.rate])
+
+
+# Global singleton
+subtitle_timing_store = SubtitleTimingStore()
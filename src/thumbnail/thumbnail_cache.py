@@ -0,0 +1,119 @@
+import logging
+import math
+from pathlib import Path
+from typing import NamedTuple
+
+from PySide6 import QtCore, QtGui
+
+from utils.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+TILE_WIDTH = 160
+TILE_HEIGHT = 90
+SHEET_COLUMNS = 20
+MAX_TILES = 400
+MIN_INTERVAL_MS = 5000
+CACHE_SUFFIX = ".png"
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# PNG text chunk listing which tiles of the sheet hold a frame, as "0"/"1"
+_PRESENT_KEY = "uvp-thumbnails"
+
+
+class ThumbnailGrid(NamedTuple):
+    # Frames are taken every interval_ms, tile i showing time i * interval_ms
+    interval_ms: int
+    tiles: int
+
+    def tile_rect(self, index: int) -> QtCore.QRect:
+        row, column = divmod(index, SHEET_COLUMNS)
+        return QtCore.QRect(
+            column * TILE_WIDTH, row * TILE_HEIGHT, TILE_WIDTH, TILE_HEIGHT
+        )
+
+    def new_sheet(self) -> QtGui.QImage:
+        rows = math.ceil(self.tiles / SHEET_COLUMNS)
+        sheet = QtGui.QImage(
+            min(self.tiles, SHEET_COLUMNS) * TILE_WIDTH,
+            rows * TILE_HEIGHT,
+            QtGui.QImage.Format.Format_RGB888,
+        )
+        sheet.fill(QtCore.Qt.GlobalColor.black)
+        return sheet
+
+
+def grid_for_duration(duration_ms: int) -> ThumbnailGrid:
+    # Whole seconds, so the grid of a file is the same on every run
+    interval_ms = max(MIN_INTERVAL_MS, math.ceil(duration_ms / MAX_TILES / 1000) * 1000)
+    return ThumbnailGrid(interval_ms, max(1, math.ceil(duration_ms / interval_ms)))
+
+
+def _encode_sheet(sheet: QtGui.QImage, present: list[bool], path: Path) -> None:
+    sheet = sheet.copy()
+    sheet.setText(_PRESENT_KEY, "".join("1" if p else "0" for p in present))
+    # The temporary file's suffix says nothing about the format
+    writer = QtGui.QImageWriter(str(path), b"png")
+    if not writer.write(sheet):
+        msg = f"Failed to encode thumbnail sheet {path}: {writer.errorString()}"
+        raise OSError(msg)
+
+
+class ThumbnailSheetCache:
+    # Sprite sheets of the thumbnails of each media file, keyed by its path,
+    # size and modification time. Partial sheets are stored too and
+    # completed on a later run.
+
+    def __init__(
+        self, cache_dir: Path | None = None, max_bytes: int = CACHE_MAX_BYTES
+    ) -> None:
+        self._disk_cache = DiskCache("thumbnails", CACHE_SUFFIX, max_bytes, cache_dir)
+
+    def _entry_path(self, media_path: Path, grid: ThumbnailGrid) -> Path:
+        stat = media_path.stat()
+        return self._disk_cache.entry_path(
+            media_path,
+            f"{stat.st_size}:{stat.st_mtime_ns}:{grid.interval_ms}:{grid.tiles}:"
+            f"{TILE_WIDTH}x{TILE_HEIGHT}",
+        )
+
+    def load(
+        self, media_path: Path, grid: ThumbnailGrid
+    ) -> tuple[QtGui.QImage, list[bool]] | None:
+        try:
+            entry_path = self._entry_path(media_path, grid)
+        except OSError:
+            return None
+        if not entry_path.exists():
+            return None
+
+        sheet = QtGui.QImage(str(entry_path))
+        present = [flag == "1" for flag in sheet.text(_PRESENT_KEY)]
+        expected = grid.new_sheet()
+        if len(present) != grid.tiles or sheet.size() != expected.size():
+            logger.info("Discarding unreadable thumbnail cache %s", entry_path)
+            entry_path.unlink(missing_ok=True)
+            return None
+
+        self._disk_cache.touch(entry_path)
+        return sheet.convertToFormat(expected.format()), present
+
+    def store(
+        self,
+        media_path: Path,
+        grid: ThumbnailGrid,
+        sheet: QtGui.QImage,
+        present: list[bool],
+    ) -> None:
+        try:
+            entry_path = self._entry_path(media_path, grid)
+        except OSError as e:
+            logger.info("Failed to write thumbnail cache: %s", e)
+            return
+        self._disk_cache.write(
+            entry_path, lambda path: _encode_sheet(sheet, present, path)
+        )
+
+
+# Global singleton
+thumbnail_cache = ThumbnailSheetCache()
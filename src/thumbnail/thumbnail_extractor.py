@@ -0,0 +1,199 @@
+import logging
+from pathlib import Path
+
+from PySide6 import QtCore, QtGui
+from PySide6.QtMultimedia import QMediaPlayer, QVideoFrame, QVideoSink
+
+from thumbnail.thumbnail_cache import (
+    TILE_HEIGHT,
+    TILE_WIDTH,
+    ThumbnailGrid,
+    grid_for_duration,
+    thumbnail_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+# Skip a grid point whose frame doesn't arrive, e.g. past a broken keyframe
+FRAME_TIMEOUT_MS = 3000
+# Partial sheets are written out now and then, so an early exit keeps them
+SAVE_EVERY_TILES = 50
+
+
+def refinement_order(count: int) -> list[int]:
+    # Every 2^k-th grid point before the ones between them, so the whole
+    # duration is covered coarsely first and filled in after
+    order = []
+    seen = set()
+    step = 1 << max(0, count - 1).bit_length()
+    while step:
+        for index in range(0, count, step):
+            if index not in seen:
+                seen.add(index)
+                order.append(index)
+        step //= 2
+    return order
+
+
+def _make_tile(frame: QtGui.QImage) -> QtGui.QImage:
+    tile = QtGui.QImage(TILE_WIDTH, TILE_HEIGHT, QtGui.QImage.Format.Format_RGB888)
+    tile.fill(QtCore.Qt.GlobalColor.black)
+    scaled = frame.scaled(
+        TILE_WIDTH,
+        TILE_HEIGHT,
+        QtCore.Qt.AspectRatioMode.KeepAspectRatio,
+        QtCore.Qt.TransformationMode.SmoothTransformation,
+    )
+    painter = QtGui.QPainter(tile)
+    painter.drawImage(
+        (TILE_WIDTH - scaled.width()) // 2, (TILE_HEIGHT - scaled.height()) // 2, scaled
+    )
+    painter.end()
+    return tile
+
+
+class ThumbnailExtractor(QtCore.QObject):
+    # Lives on a thread of its own, where a second player without audio output
+    # steps through the grid of the media while paused and renders each frame
+    # into a sprite sheet. Decoding, scaling and the sheet cache never touch
+    # the GUI thread; finished tiles are handed over through tile_ready.
+
+    tile_ready = QtCore.Signal(str, int, QtGui.QImage)
+
+    def __init__(self) -> None:
+        super().__init__()
+        # Created on first use, on the extractor thread
+        self._player: QMediaPlayer | None = None
+        # Moves to the extractor thread along with its parent
+        self._timeout_timer = QtCore.QTimer(self)
+        self._timeout_timer.setSingleShot(True)
+        self._timeout_timer.setInterval(FRAME_TIMEOUT_MS)
+        self._timeout_timer.timeout.connect(self._on_timeout)
+
+        self._media_path = ""
+        self._grid: ThumbnailGrid | None = None
+        self._sheet: QtGui.QImage | None = None
+        self._present: list[bool] = []
+        self._queue: list[int] = []
+        self._target_ms: int | None = None
+        self._unsaved_tiles = 0
+
+    def _ensure_player(self) -> QMediaPlayer:
+        if self._player is None:
+            self._player = QMediaPlayer(self)
+            sink = QVideoSink(self)
+            self._player.setVideoSink(sink)
+            sink.videoFrameChanged.connect(self._on_frame)
+            self._player.mediaStatusChanged.connect(self._on_media_status)
+            self._player.errorOccurred.connect(self._on_error)
+        return self._player
+
+    @QtCore.Slot(str, int)
+    def extract(self, media_path: str, duration_ms: int) -> None:
+        # An empty path or unknown duration just stops the current extraction
+        self._stop()
+        if not media_path or duration_ms <= 0:
+            return
+
+        self._media_path = media_path
+        self._grid = grid_for_duration(duration_ms)
+        cached = thumbnail_cache.load(Path(media_path), self._grid)
+        if cached is not None:
+            self._sheet, self._present = cached
+        else:
+            self._sheet = self._grid.new_sheet()
+            self._present = [False] * self._grid.tiles
+
+        for index, present in enumerate(self._present):
+            if present:
+                tile = self._sheet.copy(self._grid.tile_rect(index))
+                self.tile_ready.emit(media_path, index, tile)
+
+        self._queue = [
+            index
+            for index in refinement_order(self._grid.tiles)
+            if not self._present[index]
+        ]
+        if self._queue:
+            logger.debug("Extracting %d thumbnails of %s", len(self._queue), media_path)
+            self._ensure_player().setSource(QtCore.QUrl.fromLocalFile(media_path))
+
+    @QtCore.Slot()
+    def shutdown(self) -> None:
+        self._stop()
+
+    def _stop(self) -> None:
+        self._save_sheet()
+        self._queue = []
+        self._target_ms = None
+        self._media_path = ""
+        self._timeout_timer.stop()
+        if self._player is not None:
+            self._player.setSource(QtCore.QUrl())
+
+    def _on_media_status(self, status: QMediaPlayer.MediaStatus) -> None:
+        if status == QMediaPlayer.MediaStatus.LoadedMedia and self._target_ms is None:
+            # Paused, the player renders the frame at every position it is set to
+            self._ensure_player().pause()
+            self._next()
+
+    def _on_error(self, _error: QMediaPlayer.Error, message: str) -> None:
+        if self._media_path:
+            logger.info(
+                "Thumbnail extraction failed for %s: %s", self._media_path, message
+            )
+            self._stop()
+
+    def _next(self) -> None:
+        grid = self._grid
+        if not self._queue or grid is None:
+            self._stop()
+            return
+        self._target_ms = self._queue[0] * grid.interval_ms
+        self._timeout_timer.start()
+        self._ensure_player().setPosition(self._target_ms)
+
+    def _on_frame(self, frame: QVideoFrame) -> None:
+        grid = self._grid
+        sheet = self._sheet
+        if (
+            self._target_ms is None
+            or grid is None
+            or sheet is None
+            or not frame.isValid()
+        ):
+            return
+        # Frames still on their way from before the seek are skipped
+        start_ms = frame.startTime() // 1000
+        if frame.startTime() >= 0 and abs(start_ms - self._target_ms) > (
+            grid.interval_ms // 2
+        ):
+            return
+        image = frame.toImage()
+        if image.isNull():
+            return
+
+        index = self._queue.pop(0)
+        tile = _make_tile(image)
+        painter = QtGui.QPainter(sheet)
+        painter.drawImage(grid.tile_rect(index).topLeft(), tile)
+        painter.end()
+        self._present[index] = True
+        self.tile_ready.emit(self._media_path, index, tile)
+
+        self._unsaved_tiles += 1
+        if self._unsaved_tiles >= SAVE_EVERY_TILES:
+            self._save_sheet()
+        self._next()
+
+    def _on_timeout(self) -> None:
+        if self._queue:
+            self._queue.pop(0)
+        self._next()
+
+    def _save_sheet(self) -> None:
+        grid = self._grid
+        sheet = self._sheet
+        if self._unsaved_tiles and self._media_path and grid and sheet is not None:
+            thumbnail_cache.store(Path(self._media_path), grid, sheet, self._present)
+        self._unsaved_tiles = 0
@@ -0,0 +1,98 @@
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+from PySide6 import QtCore, QtGui
+
+from thumbnail.thumbnail_cache import ThumbnailGrid, grid_for_duration
+from thumbnail.thumbnail_extractor import ThumbnailExtractor
+
+# Tiles kept in memory across recently played files; more than one file's grid
+MEMORY_TILES = 1024
+
+
+class ThumbnailProvider(QtCore.QObject):
+    # The GUI side of thumbnail extraction: collects the tiles the extractor
+    # thread produces and answers hover lookups with the nearest one so far
+
+    _extract_requested = QtCore.Signal(str, int)
+    _shutdown_requested = QtCore.Signal()
+
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self._tiles: OrderedDict[tuple[str, int], QtGui.QImage] = OrderedDict()
+        self._media_path = ""
+        self._duration_ms = 0
+        self._grid: ThumbnailGrid | None = None
+        self._indices: list[int] = []  # sorted grid indices of the media's tiles
+
+        self._thread = QtCore.QThread(self)
+        self._thread.setObjectName("thumbnail-extractor")
+        self._extractor = ThumbnailExtractor()
+        self._extractor.moveToThread(self._thread)
+        self._thread.finished.connect(self._extractor.deleteLater)
+        self._extract_requested.connect(self._extractor.extract)
+        self._shutdown_requested.connect(
+            self._extractor.shutdown,
+            QtCore.Qt.ConnectionType.BlockingQueuedConnection,
+        )
+        self._extractor.tile_ready.connect(self._on_tile_ready)
+        self._thread.start(QtCore.QThread.Priority.LowPriority)
+
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def set_media(self, media_path: str) -> None:
+        self._media_path = media_path
+        self._duration_ms = 0
+        self._grid = None
+        self._indices = []
+        self._extract_requested.emit("", 0)
+
+    def set_duration(self, duration_ms: int) -> None:
+        # Extraction waits for the duration, which fixes the grid
+        if duration_ms <= 0 or duration_ms == self._duration_ms or not self._media_path:
+            return
+        self._duration_ms = duration_ms
+        self._grid = grid_for_duration(duration_ms)
+        self._indices = sorted(
+            index
+            for path, index in self._tiles
+            if path == self._media_path and index < self._grid.tiles
+        )
+        self._extract_requested.emit(self._media_path, duration_ms)
+
+    def thumbnail_at(self, position_ms: int) -> QtGui.QImage | None:
+        indices = self._indices
+        grid = self._grid
+        if not indices or grid is None:
+            return None
+
+        wanted = position_ms / grid.interval_ms
+        pos = bisect_left(indices, wanted)
+        if pos == len(indices) or (
+            pos > 0 and wanted - indices[pos - 1] < indices[pos] - wanted
+        ):
+            pos -= 1
+        key = (self._media_path, indices[pos])
+        self._tiles.move_to_end(key)
+        return self._tiles[key]
+
+    def shutdown(self) -> None:
+        if self._thread.isRunning():
+            self._shutdown_requested.emit()
+            self._thread.quit()
+            self._thread.wait()
+
+    def _on_tile_ready(self, media_path: str, index: int, tile: QtGui.QImage) -> None:
+        key = (media_path, index)
+        is_current = media_path == self._media_path and self._grid is not None
+        if is_current and key not in self._tiles:
+            insort(self._indices, index)
+        self._tiles[key] = tile
+        self._tiles.move_to_end(key)
+
+        while len(self._tiles) > MEMORY_TILES:
+            (path, evicted), _ = self._tiles.popitem(last=False)
+            if path == self._media_path and evicted in self._indices:
+                self._indices.remove(evicted)
@@ -0,0 +1,103 @@
+import contextlib
+import hashlib
+import logging
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from PySide6 import QtCore
+
+logger = logging.getLogger(__name__)
+
+STALE_TEMP_FILE_AGE_S = 3600
+
+
+def path_hash(value: str) -> str:
+    return hashlib.sha1(value.encode(), usedforsecurity=False).hexdigest()[:16]
+
+
+class DiskCache:
+    # A directory of files derived from source files, one entry per source
+    # named after its resolved path and a version key, e.g. its size and
+    # mtime. Entries are written to a temporary file and renamed into place,
+    # so readers never see a partial one. Writing an entry drops the other
+    # versions of the same source, then the least recently used entries
+    # until the directory fits into max_bytes.
+
+    def __init__(
+        self,
+        name: str,
+        suffix: str,
+        max_bytes: int,
+        cache_dir: Path | None = None,
+    ) -> None:
+        self.name = name
+        self.suffix = suffix
+        self.max_bytes = max_bytes
+        self._cache_dir = cache_dir
+
+    @property
+    def cache_dir(self) -> Path:
+        if self._cache_dir is None:
+            location = QtCore.QStandardPaths.writableLocation(
+                QtCore.QStandardPaths.StandardLocation.CacheLocation
+            )
+            self._cache_dir = Path(location) / self.name
+        return self._cache_dir
+
+    def entry_path(self, source_path: Path, version_key: str) -> Path:
+        path_prefix = path_hash(str(source_path.resolve()))
+        return self.cache_dir / f"{path_prefix}-{path_hash(version_key)}{self.suffix}"
+
+    def touch(self, entry_path: Path) -> None:
+        # Marks the entry as recently used
+        with contextlib.suppress(OSError):
+            entry_path.touch()
+
+    def write(self, entry_path: Path, write_file: Callable[[Path], object]) -> bool:
+        # write_file fills the temporary file at the path it is given and
+        # raises OSError when it can't
+        temp_path = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=self.cache_dir, suffix=f"{self.suffix}.tmp", delete=False
+            ) as file:
+                temp_path = Path(file.name)
+            write_file(temp_path)
+            temp_path.replace(entry_path)
+            self._evict(entry_path)
+        except OSError as e:
+            logger.info("Failed to write %s cache: %s", self.name, e)
+            if temp_path:
+                temp_path.unlink(missing_ok=True)
+            return False
+        return True
+
+    def _evict(self, keep: Path) -> None:
+        stale_prefix = keep.name.split("-")[0]
+        now = time.time()
+        cached_files = []
+
+        for path in self.cache_dir.iterdir():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+
+            if path.name.endswith(".tmp"):
+                if now - stat.st_mtime > STALE_TEMP_FILE_AGE_S:
+                    path.unlink(missing_ok=True)
+            elif path != keep and path.name.startswith(f"{stale_prefix}-"):
+                path.unlink(missing_ok=True)
+            elif path.suffix == self.suffix:
+                cached_files.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in cached_files)
+        for _, size, path in sorted(cached_files):
+            if total_size <= self.max_bytes:
+                break
+            if path != keep:
+                path.unlink(missing_ok=True)
+                total_size -= size
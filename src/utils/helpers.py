@@ -13,7 +13,7 @@ if TYPE_CHECKING:
 
 
 def format_time(seconds: float) -> str:
-    mins = seconds // 60
+    mins = int(seconds // 60)
     secs = int(seconds % 60)
     return f"{mins}:{secs:02d}"
 
@@ -31,6 +31,12 @@ def setup_shortcuts(window: ApplicationWindow) -> None:
     mute_key = settings_manager.get_str(SettingKeys.TOGGLE_MUTE_SHORTCUT)
     fullscreen_key = settings_manager.get_str(SettingKeys.FULLSCREEN_SHORTCUT)
     subtitles_key = settings_manager.get_str(SettingKeys.TOGGLE_SUBTITLES_SHORTCUT)
+    decrease_delay_key = settings_manager.get_str(
+        SettingKeys.DECREASE_SUBTITLE_DELAY_SHORTCUT
+    )
+    increase_delay_key = settings_manager.get_str(
+        SettingKeys.INCREASE_SUBTITLE_DELAY_SHORTCUT
+    )
     seek_step = settings_manager.get_int(SettingKeys.SEEK_STEP)
 
     play_pause_shortcut: QtGui.QShortcut = QtGui.QShortcut(
@@ -43,9 +49,7 @@ def setup_shortcuts(window: ApplicationWindow) -> None:
         QtGui.QKeySequence.fromString(str(seek_forward_key)), window
     )
     seek_forward_shortcut.activated.connect(
-        lambda: window.media_controller.mediaPlayer.setPosition(
-            window.media_controller.mediaPlayer.position() + seek_step * 1000
-        )
+        lambda: window.media_controller.seek_engine.seek_by(seek_step * 1000)
     )
     window.shortcuts.append(seek_forward_shortcut)
 
@@ -53,9 +57,7 @@ def setup_shortcuts(window: ApplicationWindow) -> None:
         QtGui.QKeySequence.fromString(str(seek_backward_key)), window
     )
     seek_backward_shortcut.activated.connect(
-        lambda: window.media_controller.mediaPlayer.setPosition(
-            window.media_controller.mediaPlayer.position() - seek_step * 1000
-        )
+        lambda: window.media_controller.seek_engine.seek_by(-seek_step * 1000)
     )
     window.shortcuts.append(seek_backward_shortcut)
 
@@ -86,21 +88,50 @@ def setup_shortcuts(window: ApplicationWindow) -> None:
     )
     window.shortcuts.append(toggle_subtitles_shortcut)
 
+    decrease_delay_shortcut: QtGui.QShortcut = QtGui.QShortcut(
+        QtGui.QKeySequence.fromString(str(decrease_delay_key)), window
+    )
+    decrease_delay_shortcut.activated.connect(
+        lambda: window.media_controller.adjust_subtitle_delay(
+            -settings_manager.get_int(SettingKeys.SUBTITLE_DELAY_STEP)
+        )
+    )
+    window.shortcuts.append(decrease_delay_shortcut)
+
+    increase_delay_shortcut: QtGui.QShortcut = QtGui.QShortcut(
+        QtGui.QKeySequence.fromString(str(increase_delay_key)), window
+    )
+    increase_delay_shortcut.activated.connect(
+        lambda: window.media_controller.adjust_subtitle_delay(
+            settings_manager.get_int(SettingKeys.SUBTITLE_DELAY_STEP)
+        )
+    )
+    window.shortcuts.append(increase_delay_shortcut)
+
 
-def open_and_load_file(parent: QWidget, load_media: Callable[str]) -> None:
+def _default_media_dir() -> Path:
     videos_dir = Path.home() / "Videos"
     if Path.exists(videos_dir):
-        default_dir = videos_dir
-    else:
-        home_dir = Path.home()
-        default_dir = home_dir if Path.exists(home_dir) else Path.cwd()
+        return videos_dir
+    home_dir = Path.home()
+    return home_dir if Path.exists(home_dir) else Path.cwd()
 
+
+def open_and_load_file(parent: QWidget, load_media: Callable[[str], None]) -> None:
     file_dialog = QtWidgets.QFileDialog(parent)
     file_path, _ = file_dialog.getOpenFileName(
         parent,
         "Select Video File",
-        str(default_dir),
+        str(_default_media_dir()),
         "Video files (*.mp4 *.mkv *.avi *.webm *.mov);;All files (*)",
     )
     if file_path:
         load_media(file_path)
+
+
+def open_and_load_folder(parent: QWidget, load_folder: Callable[[str], None]) -> None:
+    folder_path = QtWidgets.QFileDialog.getExistingDirectory(
+        parent, "Select Video Folder", str(_default_media_dir())
+    )
+    if folder_path:
+        load_folder(folder_path)
@@ -0,0 +1,19 @@
+import logging
+from typing import TYPE_CHECKING
+
+logger = logging.getLogger(__name__)
+
+# NumPy only speeds up subtitle parsing and indexing; without it np is None and
+# callers take their pure Python paths, checking NUMPY_AVAILABLE first
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    if not TYPE_CHECKING:
+        np = None
+
+    NUMPY_AVAILABLE = False
+    logger.info("NumPy not available. Using pure Python subtitle processing.")
+
+__all__ = ["NUMPY_AVAILABLE", "np"]
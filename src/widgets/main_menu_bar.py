@@ -1,10 +1,20 @@
+import math
 from collections.abc import Callable
+from typing import TYPE_CHECKING
 
 from PySide6 import QtCore, QtGui, QtWidgets
 from PySide6.QtWidgets import QWidget
 
 from settings.setting_keys import SettingKeys
 from settings.settings_manager import settings_manager
+from subtitle.subtitle_timing import RATE_PRESETS, SubtitleTiming
+
+if TYPE_CHECKING:
+    from media_controller import MediaController
+
+
+def _format_timing(timing: SubtitleTiming) -> str:
+    return f"Delay: {timing.delay_ms:+d} ms, Speed: x{timing.rate:.4f}"
 
 
 class MainMenuBar(QtWidgets.QMenuBar):
@@ -21,6 +31,13 @@ class MainMenuBar(QtWidgets.QMenuBar):
 
         self.open_action = file_menu.addAction("Open File")
         self.open_action.setShortcut(QtGui.QKeySequence.StandardKey.Open)
+        self.open_folder_action = file_menu.addAction("Open Folder")
+        file_menu.addSeparator()
+        self.next_action = file_menu.addAction("Next")
+        self.next_action.setShortcut(QtCore.Qt.Key.Key_MediaNext)
+        self.previous_action = file_menu.addAction("Previous")
+        self.previous_action.setShortcut(QtCore.Qt.Key.Key_MediaPrevious)
+        file_menu.addSeparator()
         exit_action = file_menu.addAction("Exit")
         exit_action.setShortcut(QtGui.QKeySequence.StandardKey.Quit)
 
@@ -29,6 +46,32 @@ class MainMenuBar(QtWidgets.QMenuBar):
 
         self.toggle_subtitles_action = subtitles_menu.addAction("Toggle Subtitles")
         self.toggle_subtitles_action.setCheckable(True)
+        self.subtitle_track_menu = subtitles_menu.addMenu("Track")
+        self.subtitle_track_group = QtGui.QActionGroup(self)
+        self.subtitle_track_menu.menuAction().setEnabled(False)
+        subtitles_menu.addSeparator()
+
+        self.subtitle_timing_action = subtitles_menu.addAction(
+            _format_timing(SubtitleTiming())
+        )
+        self.subtitle_timing_action.setEnabled(False)
+        self.decrease_delay_action = subtitles_menu.addAction("Decrease Delay")
+        self.increase_delay_action = subtitles_menu.addAction("Increase Delay")
+
+        self.subtitle_speed_menu = subtitles_menu.addMenu("Speed")
+        self.subtitle_speed_group = QtGui.QActionGroup(self)
+        for label, rate in RATE_PRESETS.items():
+            action = self.subtitle_speed_menu.addAction(label)
+            action.setCheckable(True)
+            action.setData(rate)
+            self.subtitle_speed_group.addAction(action)
+
+        self.reset_timing_action = subtitles_menu.addAction("Reset Timing")
+        subtitles_menu.addSeparator()
+
+        self.search_subtitles_action = subtitles_menu.addAction("Search…")
+        self.search_subtitles_action.setShortcut(QtGui.QKeySequence.StandardKey.Find)
+        self.set_subtitle_timing(None)
         self.refresh_ui()
 
         self.settings_action = options_menu.addAction("Settings")
@@ -53,12 +96,96 @@ class MainMenuBar(QtWidgets.QMenuBar):
         self.about_action.triggered.connect(about_handler)
         fullscreen_toggled.connect(self.on_fullscreen_toggle)
 
+    def connect_media_controller(self, media_controller: "MediaController") -> None:
+        self.next_action.triggered.connect(media_controller.next_track)
+        self.previous_action.triggered.connect(media_controller.previous_track)
+        media_controller.playlist.changed.connect(
+            lambda: self.set_playlist_position(media_controller)
+        )
+        self.set_playlist_position(media_controller)
+
+        self.subtitle_track_group.triggered.connect(
+            lambda action: media_controller.select_subtitle_track(action.data())
+        )
+        media_controller.subtitle_tracks_changed.connect(
+            lambda: self.set_subtitle_tracks(media_controller)
+        )
+
+        def step() -> int:
+            return settings_manager.get_int(SettingKeys.SUBTITLE_DELAY_STEP)
+
+        self.decrease_delay_action.triggered.connect(
+            lambda: media_controller.adjust_subtitle_delay(-step())
+        )
+        self.increase_delay_action.triggered.connect(
+            lambda: media_controller.adjust_subtitle_delay(step())
+        )
+        self.subtitle_speed_group.triggered.connect(
+            lambda action: media_controller.set_subtitle_rate(action.data())
+        )
+        self.reset_timing_action.triggered.connect(
+            media_controller.reset_subtitle_timing
+        )
+        media_controller.subtitles_changed.connect(
+            lambda subtitles: self.set_subtitle_timing(
+                subtitles.timing if subtitles else None
+            )
+        )
+        media_controller.subtitle_timing_changed.connect(self.set_subtitle_timing)
+
     def _toggle_subtitles(self) -> None:
         current = settings_manager.get_bool(SettingKeys.ENABLE_SUBTITLES)
         new_value = not current
         settings_manager.set_value(SettingKeys.ENABLE_SUBTITLES, new_value)
         self.toggle_subtitles_action.setChecked(new_value)
 
+    def set_subtitle_tracks(self, media_controller: "MediaController") -> None:
+        for action in self.subtitle_track_group.actions():
+            self.subtitle_track_group.removeAction(action)
+        self.subtitle_track_menu.clear()
+
+        current_track = media_controller.current_subtitle_track
+        for track in media_controller.subtitle_tracks:
+            label = track.label
+            if media_controller.is_subtitle_track_loading(track):
+                label = f"{label} (loading)"
+
+            action = self.subtitle_track_menu.addAction(label)
+            action.setCheckable(True)
+            action.setData(track)
+            action.setChecked(track == current_track)
+            action.setEnabled(
+                media_controller.is_subtitle_track_loading(track)
+                or media_controller.is_subtitle_track_readable(track)
+            )
+            self.subtitle_track_group.addAction(action)
+
+        self.subtitle_track_menu.menuAction().setEnabled(
+            bool(media_controller.subtitle_tracks)
+        )
+
+    def set_playlist_position(self, media_controller: "MediaController") -> None:
+        playlist = media_controller.playlist
+        self.next_action.setEnabled(playlist.peek(1) is not None)
+        self.previous_action.setEnabled(playlist.current() is not None)
+
+    def set_subtitle_timing(self, timing: SubtitleTiming | None) -> None:
+        has_subtitles = timing is not None
+        timing = timing or SubtitleTiming()
+
+        self.subtitle_timing_action.setText(_format_timing(timing))
+        for action in (
+            self.decrease_delay_action,
+            self.increase_delay_action,
+            self.subtitle_speed_menu.menuAction(),
+            self.reset_timing_action,
+            self.search_subtitles_action,
+        ):
+            action.setEnabled(has_subtitles)
+
+        for action in self.subtitle_speed_group.actions():
+            action.setChecked(math.isclose(action.data(), timing.rate))
+
     # TODO: consolidate these bottom two functions
     def on_settings_changed(self, key: str, value: bool) -> None:
         if key == SettingKeys.ENABLE_SUBTITLES:
@@ -2,14 +2,17 @@ from typing import TYPE_CHECKING
 
 from PySide6 import QtCore, QtMultimedia, QtWidgets
 from PySide6.QtCore import QPoint
+from PySide6.QtGui import QHideEvent, QResizeEvent, QShowEvent
 from PySide6.QtWidgets import QWidget
 
 if TYPE_CHECKING:
     from media_controller import MediaController
+    from playback_clock import ClockSubscription
 from primitive.slider import ClickableSlider
 from utils.helpers import format_time
 
 MOUSE_NEAR_THRESHOLD: int = 50
+TIME_LABEL_GRANULARITY_MS: int = 1000
 
 
 class VideoControls(QtWidgets.QFrame):
@@ -112,13 +115,29 @@ class VideoControls(QtWidgets.QFrame):
             QtWidgets.QStyle.StandardPixmap.SP_MediaVolumeMuted
         )
 
+        self._time_label_subscription: ClockSubscription | None = None
+        self._seek_slider_subscription: ClockSubscription | None = None
+
         self.set_enabled(False)
 
     def connect_signals(self, media_controller: MediaController) -> None:
+        # Dragging seeks live; the engine keeps only the latest position
+        self.seek_slider.sliderMoved.connect(media_controller.seek_engine.seek_to)
         self.seek_slider.sliderReleased.connect(
-            lambda: media_controller.mediaPlayer.setPosition(self.seek_slider.value())
+            lambda: media_controller.seek_engine.seek_to(self.seek_slider.value())
+        )
+        self.seek_slider.set_preview_provider(
+            media_controller.thumbnail_provider.thumbnail_at
         )
         self.play_button.clicked.connect(media_controller.toggle_playback)
+        clock = media_controller.playback_clock
+        self._time_label_subscription = clock.subscribe(
+            self._show_current_time, TIME_LABEL_GRANULARITY_MS
+        )
+        self._seek_slider_subscription = clock.subscribe(
+            self._move_seek_slider, self._seek_slider_granularity()
+        )
+        self._set_clock_active(self.isVisible())
         self.volume_slider.valueChanged.connect(
             lambda v: media_controller.audioOutput.setVolume(v / 100.0)
         )
@@ -128,14 +147,48 @@ class VideoControls(QtWidgets.QFrame):
             )
         )
 
-    def set_current_time(self, time: float) -> None:
-        self.current_time_label.setText(format_time(time))
+    def _show_current_time(self, position_ms: int) -> None:
+        self.current_time_label.setText(format_time(position_ms // 1000))
+
+    def _move_seek_slider(self, position_ms: int) -> None:
         if not self.seek_slider.isSliderDown():
-            self.seek_slider.setValue(int(time * 1000))
+            self.seek_slider.setValue(position_ms)
+
+    def _seek_slider_granularity(self) -> int:
+        # The slider only needs updating once the handle moves a pixel
+        return max(1, self.seek_slider.maximum() // max(1, self.seek_slider.width()))
+
+    def _update_seek_slider_granularity(self) -> None:
+        if self._seek_slider_subscription:
+            self._seek_slider_subscription.set_granularity(
+                self._seek_slider_granularity()
+            )
+
+    def _set_clock_active(self, active: bool) -> None:
+        # Hidden controls, e.g. in fullscreen, skip position updates entirely
+        for subscription in (
+            self._time_label_subscription,
+            self._seek_slider_subscription,
+        ):
+            if subscription:
+                subscription.set_active(active)
+
+    def showEvent(self, event: QShowEvent) -> None:  # noqa: N802
+        super().showEvent(event)
+        self._set_clock_active(True)
+
+    def hideEvent(self, event: QHideEvent) -> None:  # noqa: N802
+        super().hideEvent(event)
+        self._set_clock_active(False)
+
+    def resizeEvent(self, event: QResizeEvent) -> None:  # noqa: N802
+        super().resizeEvent(event)
+        self._update_seek_slider_granularity()
 
     def set_duration(self, duration: float) -> None:
         self.duration_label.setText(format_time(duration))
         self.seek_slider.setMaximum(int(duration * 1000))
+        self._update_seek_slider_granularity()
 
     def set_playback_status(
         self, status: QtMultimedia.QMediaPlayer.PlaybackState
@@ -1,4 +1,5 @@
 from collections.abc import Callable
+from enum import Flag, auto
 
 from PySide6 import QtCore, QtGui, QtMultimedia, QtMultimediaWidgets, QtWidgets
 from PySide6.QtGui import QEnterEvent, QMouseEvent, QResizeEvent
@@ -9,7 +10,20 @@ from settings.setting_keys import SettingKeys
 from settings.settings_manager import settings_manager
 from subtitle.subtitle import Subtitle
 from subtitle.subtitle_entry import SubtitleEntry
-from subtitle.subtitle_graphics_item import SubtitleGraphicsItem
+from subtitle.subtitle_layer import SubtitleLayer
+from subtitle.subtitle_prerenderer import SubtitlePrerenderer
+from subtitle.subtitle_scheduler import SubtitleScheduler
+from subtitle.subtitle_sync_probe import SubtitleSyncProbe
+
+LAYOUT_INTERVAL_MS = 16
+
+
+class _LayoutPart(Flag):
+    NONE = 0
+    SCENE = auto()
+    CENTER_TEXT = auto()
+    SUBTITLES = auto()
+    ALL = SCENE | CENTER_TEXT | SUBTITLES
 
 
 class VideoDisplay(QtWidgets.QGraphicsView):
@@ -30,6 +44,9 @@ class VideoDisplay(QtWidgets.QGraphicsView):
         self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setStyleSheet("background-color: black;")
+        self.setViewportUpdateMode(
+            QtWidgets.QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate
+        )
 
         self.video_item = QtMultimediaWidgets.QGraphicsVideoItem()
         self.graphics_scene.addItem(self.video_item)
@@ -39,9 +56,15 @@ class VideoDisplay(QtWidgets.QGraphicsView):
         self.center_text.setFont(QtGui.QFont("Arial", 20))
         self.graphics_scene.addItem(self.center_text)
 
-        self.subtitle_item = SubtitleGraphicsItem()
-        self.current_subtitle_entries = []
-        self.graphics_scene.addItem(self.subtitle_item)
+        self.subtitle_layer = SubtitleLayer()
+        self.subtitle_layer.setVisible(
+            settings_manager.get_bool(SettingKeys.ENABLE_SUBTITLES)
+        )
+        self.subtitle_scheduler = SubtitleScheduler(self)
+        self.subtitle_prerenderer = SubtitlePrerenderer(self.subtitle_layer.render_key)
+        self.graphics_scene.addItem(self.subtitle_layer)
+        self.subtitle_sync_probe: SubtitleSyncProbe | None = None
+        self._frame_signal_connected = False
 
         # self.busyProxy = QtWidgets.QGraphicsProxyWidget()
         # self.busyIndicator = QtWidgets.QProgressBar()
@@ -54,7 +77,17 @@ class VideoDisplay(QtWidgets.QGraphicsView):
 
         self.video_item.setZValue(0)
         self.center_text.setZValue(1)
-        self.subtitle_item.setZValue(2)
+        self.subtitle_layer.setZValue(2)
+
+        # Layout runs at most once per LAYOUT_INTERVAL_MS: the first change is
+        # applied right away and the rest of a resize storm is folded into one
+        # pass when the interval ends
+        self._dirty_layout = _LayoutPart.NONE
+        self._layout_size = QtCore.QSize()
+        self._layout_timer = QtCore.QTimer(self)
+        self._layout_timer.setSingleShot(True)
+        self._layout_timer.setInterval(LAYOUT_INTERVAL_MS)
+        self._layout_timer.timeout.connect(self._flush_layout)
 
         self.cursor_hide_timer = QtCore.QTimer(self)
         self.cursor_hide_timer.timeout.connect(self.hide_cursor)
@@ -68,61 +101,107 @@ class VideoDisplay(QtWidgets.QGraphicsView):
         file_dialog_handler: Callable,
     ) -> None:
         settings_manager.settings_changed.connect(self.on_settings_changed)
+        self.subtitle_scheduler.cues_changed.connect(self.on_new_subtitles)
+        self.subtitle_scheduler.cues_changed.connect(self._measure_cue_change)
+        self.subtitle_scheduler.position_advanced.connect(
+            self.subtitle_prerenderer.update
+        )
 
         self.fullscreen_toggled.connect(toggle_fullscreen)
         self.file_dialog_requested.connect(file_dialog_handler)
         self.play_toggled.connect(media_controller.toggle_playback)
+        self.update_frame_sync()
 
     def on_settings_changed(self, key: str, value: bool) -> None:
         if key == SettingKeys.ENABLE_SUBTITLES:
-            self.subtitle_item.setVisible(value)
-
-    def update_subtitle(self, position_ms: int, subtitles: Subtitle) -> None:
-        if subtitles:
-            entries = subtitles.get_all_at_time(position_ms)
-            if entries != self.current_subtitle_entries:
-                self.on_new_subtitles(entries)
+            self.subtitle_layer.setVisible(value)
+        elif key in (SettingKeys.SUBTITLE_FRAME_SYNC, SettingKeys.SUBTITLE_SYNC_STATS):
+            self.update_frame_sync()
+
+    def update_frame_sync(self) -> None:
+        frame_sync = settings_manager.get_bool(SettingKeys.SUBTITLE_FRAME_SYNC)
+        measure = settings_manager.get_bool(SettingKeys.SUBTITLE_SYNC_STATS)
+        self.subtitle_scheduler.set_frame_sync(frame_sync)
+
+        # Switching modes reports the numbers for the previous one and starts over
+        if self.subtitle_sync_probe:
+            self.subtitle_sync_probe.log_report()
+        self.subtitle_sync_probe = SubtitleSyncProbe() if measure else None
+
+        # Only pay for a Python call per frame when something needs it
+        video_sink = self.video_item.videoSink()
+        if (frame_sync or measure) != self._frame_signal_connected:
+            if self._frame_signal_connected:
+                video_sink.videoFrameChanged.disconnect(self.on_video_frame)
+            else:
+                video_sink.videoFrameChanged.connect(self.on_video_frame)
+            self._frame_signal_connected = frame_sync or measure
 
-    def on_new_subtitles(self, entries: list[SubtitleEntry]) -> None:
-        enable_subtitles = settings_manager.get_bool(SettingKeys.ENABLE_SUBTITLES)
-        if len(entries) == 0 or not enable_subtitles:
-            self.subtitle_item.setVisible(False)
-            self.current_subtitle_entries = []
+    def on_video_frame(self, frame: QtMultimedia.QVideoFrame) -> None:
+        start_us = frame.startTime()
+        if not frame.isValid() or start_us < 0:
             return
 
-        # TODO: loop
-        self.current_subtitle_entries = entries
-        entry = entries[0]
-        self.subtitle_item.setPlainText(entry.text)
-        self.update_scene_rect()
+        frame_ms = start_us // 1000
+        self.subtitle_scheduler.present_frame(frame_ms)
+        if self.subtitle_sync_probe:
+            self.subtitle_sync_probe.frame_presented(frame_ms)
 
-    def set_media_status(self, status: QtMultimedia.QMediaPlayer.MediaStatus) -> None:
-        self.mediaStatus = status
-        self.center_text.setVisible(
-            status == QtMultimedia.QMediaPlayer.MediaStatus.NoMedia
-        )
-        self.update_scene_rect()
+    def _measure_cue_change(self, _entries: list[SubtitleEntry]) -> None:
+        if self.subtitle_sync_probe:
+            self.subtitle_sync_probe.cue_changed(self.subtitle_scheduler.change_ms())
 
-    def update_scene_rect(self) -> None:
-        self.graphics_scene.setSceneRect(0, 0, self.width(), self.height())
-        self.video_item.setSize(QtCore.QSizeF(self.width(), self.height()))
+    def set_subtitles(self, subtitles: Subtitle | None, position_ms: int) -> None:
+        if self.subtitle_sync_probe:
+            self.subtitle_sync_probe.reset()
+        self.subtitle_prerenderer.set_subtitle(subtitles)
+        self.subtitle_scheduler.set_subtitles(subtitles, position_ms)
 
-        center_x = self.width() / 2
-        center_y = self.height() / 2
-
-        self.center_text.setPos(
-            center_x - self.center_text.boundingRect().width() / 2,
-            center_y - self.center_text.boundingRect().height() / 2,
-        )
+    def refresh_subtitles(self, position_ms: int) -> None:
+        # The subtitles were edited in place
+        if self.subtitle_sync_probe:
+            self.subtitle_sync_probe.reset()
+        self.subtitle_prerenderer.invalidate()
+        self.subtitle_scheduler.refresh(position_ms)
 
-        subtitle_max_width = self.width() * 0.9
-        self.subtitle_item.setTextWidth(subtitle_max_width)
+    def on_new_subtitles(self, entries: list[SubtitleEntry]) -> None:
+        # The layer is hidden while subtitles are disabled but keeps following
+        # the cues, so enabling them again shows the current ones right away
+        self.subtitle_layer.set_entries(entries)
 
-        self.subtitle_item.set_view_height(self.height())
-        self.subtitle_item.setPos(
-            center_x - self.subtitle_item.boundingRect().width() / 2,
-            (self.height() * 0.95) - self.subtitle_item.boundingRect().height(),
-        )
+    def set_media_status(self, status: QtMultimedia.QMediaPlayer.MediaStatus) -> None:
+        self.mediaStatus = status
+        show_center_text = status == QtMultimedia.QMediaPlayer.MediaStatus.NoMedia
+        if show_center_text != self.center_text.isVisible():
+            self.center_text.setVisible(show_center_text)
+            self.invalidate_layout(_LayoutPart.CENTER_TEXT)
+
+    def invalidate_layout(self, parts: _LayoutPart = _LayoutPart.ALL) -> None:
+        self._dirty_layout |= parts
+        if not self._layout_timer.isActive():
+            self._layout_timer.start()
+            self._flush_layout()
+
+    def _flush_layout(self) -> None:
+        dirty = self._dirty_layout
+        self._dirty_layout = _LayoutPart.NONE
+        width, height = self.width(), self.height()
+
+        if dirty & _LayoutPart.SCENE:
+            self.graphics_scene.setSceneRect(0, 0, width, height)
+            self.video_item.setSize(QtCore.QSizeF(width, height))
+
+        if dirty & _LayoutPart.CENTER_TEXT and self.center_text.isVisible():
+            text_rect = self.center_text.boundingRect()
+            self.center_text.setPos(
+                (width - text_rect.width()) / 2, (height - text_rect.height()) / 2
+            )
+
+        if dirty & _LayoutPart.SUBTITLES:
+            self.subtitle_layer.set_geometry(
+                QtCore.QSizeF(width, height), self.devicePixelRatioF()
+            )
+            self.subtitle_prerenderer.update(self.subtitle_scheduler.position_ms())
 
         # self.busyProxy.setPos(
         #   center_x - self.busyProxy.boundingRect().width() / 2,
@@ -176,4 +255,6 @@ class VideoDisplay(QtWidgets.QGraphicsView):
 
     def resizeEvent(self, event: QResizeEvent) -> None:  # noqa: N802
         super().resizeEvent(event)
-        self.update_scene_rect()
+        if event.size() != self._layout_size:
+            self._layout_size = event.size()
+            self.invalidate_layout()
@@ -1,25 +1,28 @@
 from PySide6 import QtCore, QtWidgets
 from PySide6.QtCore import QEvent
+from PySide6.QtGui import QDragEnterEvent, QDropEvent, QShortcut
 from PySide6.QtWidgets import QApplication
 
 from media_controller import MediaController
 from shortcut_manager import ShortcutManager
-from utils.helpers import open_and_load_file
+from utils.helpers import open_and_load_file, open_and_load_folder
 from widgets.main_layout import MainLayout
 from widgets.main_menu_bar import MainMenuBar
 from widgets.video_controls import VideoControls
 from widgets.video_display import VideoDisplay
 from window.about_window import AboutDialog
 from window.settings_window import SettingsWindow
+from window.subtitle_search_dialog import SubtitleSearchDialog
 
 
 class ApplicationWindow(QtWidgets.QMainWindow):
     fullscreen_toggled = QtCore.Signal(bool)
 
-    def __init__(self, file_path: str | None = None) -> None:
+    def __init__(self, file_paths: list[str] | None = None) -> None:
         super().__init__()
 
         self.setWindowTitle(QApplication.applicationName())
+        self.setAcceptDrops(True)
 
         self.menu_bar = MainMenuBar(self.isFullScreen())
         self.setMenuBar(self.menu_bar)
@@ -36,13 +39,16 @@ class ApplicationWindow(QtWidgets.QMainWindow):
 
         self.settings_window = SettingsWindow(self)
         self.about_dialog = AboutDialog(self)
+        self.subtitle_search_dialog = SubtitleSearchDialog(self.media_controller, self)
 
+        # Rebuilt by setup_shortcuts whenever a shortcut setting changes
+        self.shortcuts: list[QShortcut] = []
         self.shortcut_manager = ShortcutManager(self)
 
         self.connect_signals()
 
-        if file_path:
-            self.media_controller.load_media(file_path)
+        if file_paths:
+            self.media_controller.play_files(file_paths)
 
     def connect_signals(self) -> None:
         self.shortcut_manager.connect_signals()
@@ -53,7 +59,7 @@ class ApplicationWindow(QtWidgets.QMainWindow):
 
         def file_dialog_handler() -> None:
             return open_and_load_file(
-                self, lambda file_path: self.media_controller.load_media(file_path)
+                self, lambda file_path: self.media_controller.play_files([file_path])
             )
 
         self.video_display.connect_signals(
@@ -66,6 +72,15 @@ class ApplicationWindow(QtWidgets.QMainWindow):
             self.about_dialog.exec,
             self.fullscreen_toggled,
         )
+        self.menu_bar.connect_media_controller(self.media_controller)
+        self.menu_bar.search_subtitles_action.triggered.connect(
+            self.subtitle_search_dialog.open_search
+        )
+        self.menu_bar.open_folder_action.triggered.connect(
+            lambda: open_and_load_folder(
+                self, lambda folder: self.media_controller.play_files([folder])
+            )
+        )
         self.main_layout.connect_signals(self.fullscreen_toggled)
 
     def changeEvent(self, event: QEvent) -> None:  # noqa: N802
@@ -73,6 +88,19 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         if event.type() == QtCore.QEvent.Type.WindowStateChange:
             self.fullscreen_toggled.emit(self.isFullScreen())
 
+    def dragEnterEvent(self, event: QDragEnterEvent) -> None:  # noqa: N802
+        if any(url.isLocalFile() for url in event.mimeData().urls()):
+            event.acceptProposedAction()
+
+    def dropEvent(self, event: QDropEvent) -> None:  # noqa: N802
+        # Dropped files and folders replace the playlist, in the dropped order
+        paths = [
+            url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()
+        ]
+        if paths:
+            event.acceptProposedAction()
+            self.media_controller.play_files(paths)
+
     def toggle_fullscreen(self) -> None:
         if self.isFullScreen():
             self.showNormal()
@@ -59,6 +59,13 @@ class SettingsWindow(QtWidgets.QDialog):
         scale_layout.addWidget(self.subtitle_scale_spinbox)
         layout.addLayout(scale_layout)
 
+        outline_layout = QtWidgets.QHBoxLayout()
+        outline_layout.addWidget(QtWidgets.QLabel("Subtitle Outline Size:"))
+        self.subtitle_outline_spinbox = QtWidgets.QSpinBox()
+        self.subtitle_outline_spinbox.setRange(0, 12)
+        outline_layout.addWidget(self.subtitle_outline_spinbox)
+        layout.addLayout(outline_layout)
+
         layout.addStretch()
         self.tab_widget.addTab(tab, "Appearance")
 
@@ -72,9 +79,40 @@ class SettingsWindow(QtWidgets.QDialog):
 
         self.save_position_checkbox = QtWidgets.QCheckBox("Save position on exit")
 
+        subtitle_delay_step_label = QtWidgets.QLabel("Subtitle Delay Step (ms):")
+        self.subtitle_delay_step_spinbox = QtWidgets.QSpinBox()
+        self.subtitle_delay_step_spinbox.setRange(10, 5000)
+        self.subtitle_delay_step_spinbox.setSingleStep(10)
+
         layout.addWidget(seek_step_label)
         layout.addWidget(self.seek_step_spinbox)
         layout.addWidget(self.save_position_checkbox)
+        subtitle_subdirectories_label = QtWidgets.QLabel(
+            "Subtitle Folders (comma separated):"
+        )
+        self.subtitle_subdirectories_edit = QtWidgets.QLineEdit()
+
+        layout.addWidget(subtitle_delay_step_label)
+        layout.addWidget(self.subtitle_delay_step_spinbox)
+        subtitle_lookahead_label = QtWidgets.QLabel(
+            "Subtitle Pre-render Lookahead (seconds):"
+        )
+        self.subtitle_lookahead_spinbox = QtWidgets.QSpinBox()
+        self.subtitle_lookahead_spinbox.setRange(0, 120)
+
+        layout.addWidget(subtitle_subdirectories_label)
+        layout.addWidget(self.subtitle_subdirectories_edit)
+        layout.addWidget(subtitle_lookahead_label)
+        layout.addWidget(self.subtitle_lookahead_spinbox)
+
+        self.subtitle_frame_sync_checkbox = QtWidgets.QCheckBox(
+            "Sync subtitles to video frames"
+        )
+        self.subtitle_sync_stats_checkbox = QtWidgets.QCheckBox(
+            "Log subtitle presentation error"
+        )
+        layout.addWidget(self.subtitle_frame_sync_checkbox)
+        layout.addWidget(self.subtitle_sync_stats_checkbox)
         layout.addStretch()
 
         self.tab_widget.addTab(tab, "Behavior")
@@ -104,6 +142,8 @@ class SettingsWindow(QtWidgets.QDialog):
         self.toggle_mute_edit = _create_key_sequence_edit()
         self.fullscreen_edit = _create_key_sequence_edit()
         self.toggle_subtitles_edit = _create_key_sequence_edit()
+        self.decrease_delay_edit = _create_key_sequence_edit()
+        self.increase_delay_edit = _create_key_sequence_edit()
 
         form_layout.addRow("Play/Pause:", self.play_pause_edit)
         form_layout.addRow("Seek Forward:", self.seek_forward_edit)
@@ -111,6 +151,8 @@ class SettingsWindow(QtWidgets.QDialog):
         form_layout.addRow("Toggle Mute:", self.toggle_mute_edit)
         form_layout.addRow("Toggle Fullscreen:", self.fullscreen_edit)
         form_layout.addRow("Toggle Subtitles:", self.toggle_subtitles_edit)
+        form_layout.addRow("Decrease Subtitle Delay:", self.decrease_delay_edit)
+        form_layout.addRow("Increase Subtitle Delay:", self.increase_delay_edit)
 
         main_layout.addLayout(form_layout)
         main_layout.addStretch()
@@ -141,10 +183,28 @@ class SettingsWindow(QtWidgets.QDialog):
         self.subtitle_scale_spinbox.setValue(
             settings_manager.get_float(SettingKeys.SUBTITLE_FONT_SCALE)
         )
+        self.subtitle_outline_spinbox.setValue(
+            settings_manager.get_int(SettingKeys.SUBTITLE_OUTLINE_SIZE)
+        )
         self.seek_step_spinbox.setValue(settings_manager.get_int(SettingKeys.SEEK_STEP))
         self.save_position_checkbox.setChecked(
             settings_manager.get_bool(SettingKeys.SAVE_POSITION_ON_EXIT)
         )
+        self.subtitle_delay_step_spinbox.setValue(
+            settings_manager.get_int(SettingKeys.SUBTITLE_DELAY_STEP)
+        )
+        self.subtitle_subdirectories_edit.setText(
+            settings_manager.get_str(SettingKeys.SUBTITLE_SUBDIRECTORIES)
+        )
+        self.subtitle_lookahead_spinbox.setValue(
+            settings_manager.get_int(SettingKeys.SUBTITLE_LOOKAHEAD)
+        )
+        self.subtitle_frame_sync_checkbox.setChecked(
+            settings_manager.get_bool(SettingKeys.SUBTITLE_FRAME_SYNC)
+        )
+        self.subtitle_sync_stats_checkbox.setChecked(
+            settings_manager.get_bool(SettingKeys.SUBTITLE_SYNC_STATS)
+        )
 
         _load_shortcut(self.play_pause_edit, SettingKeys.PLAY_PAUSE_SHORTCUT)
         _load_shortcut(self.seek_forward_edit, SettingKeys.SEEK_FORWARD_SHORTCUT)
@@ -154,6 +214,12 @@ class SettingsWindow(QtWidgets.QDialog):
         _load_shortcut(
             self.toggle_subtitles_edit, SettingKeys.TOGGLE_SUBTITLES_SHORTCUT
         )
+        _load_shortcut(
+            self.decrease_delay_edit, SettingKeys.DECREASE_SUBTITLE_DELAY_SHORTCUT
+        )
+        _load_shortcut(
+            self.increase_delay_edit, SettingKeys.INCREASE_SUBTITLE_DELAY_SHORTCUT
+        )
 
     def reset_shortcuts_to_defaults(self) -> None:
         shortcuts = {
@@ -163,6 +229,8 @@ class SettingsWindow(QtWidgets.QDialog):
             self.toggle_mute_edit: SettingKeys.TOGGLE_MUTE_SHORTCUT,
             self.fullscreen_edit: SettingKeys.FULLSCREEN_SHORTCUT,
             self.toggle_subtitles_edit: SettingKeys.TOGGLE_SUBTITLES_SHORTCUT,
+            self.decrease_delay_edit: SettingKeys.DECREASE_SUBTITLE_DELAY_SHORTCUT,
+            self.increase_delay_edit: SettingKeys.INCREASE_SUBTITLE_DELAY_SHORTCUT,
         }
 
         for edit, key in shortcuts.items():
@@ -179,6 +247,9 @@ class SettingsWindow(QtWidgets.QDialog):
         settings_manager.set_value(
             SettingKeys.SUBTITLE_FONT_SCALE, self.subtitle_scale_spinbox.value()
         )
+        settings_manager.set_value(
+            SettingKeys.SUBTITLE_OUTLINE_SIZE, self.subtitle_outline_spinbox.value()
+        )
         settings_manager.set_value(
             SettingKeys.SEEK_STEP, self.seek_step_spinbox.value()
         )
@@ -186,6 +257,24 @@ class SettingsWindow(QtWidgets.QDialog):
             SettingKeys.SAVE_POSITION_ON_EXIT,
             self.save_position_checkbox.isChecked(),
         )
+        settings_manager.set_value(
+            SettingKeys.SUBTITLE_DELAY_STEP, self.subtitle_delay_step_spinbox.value()
+        )
+        settings_manager.set_value(
+            SettingKeys.SUBTITLE_SUBDIRECTORIES,
+            self.subtitle_subdirectories_edit.text(),
+        )
+        settings_manager.set_value(
+            SettingKeys.SUBTITLE_LOOKAHEAD, self.subtitle_lookahead_spinbox.value()
+        )
+        settings_manager.set_value(
+            SettingKeys.SUBTITLE_FRAME_SYNC,
+            self.subtitle_frame_sync_checkbox.isChecked(),
+        )
+        settings_manager.set_value(
+            SettingKeys.SUBTITLE_SYNC_STATS,
+            self.subtitle_sync_stats_checkbox.isChecked(),
+        )
 
         _save_shortcut(self.play_pause_edit, SettingKeys.PLAY_PAUSE_SHORTCUT)
         _save_shortcut(self.seek_forward_edit, SettingKeys.SEEK_FORWARD_SHORTCUT)
@@ -195,5 +284,11 @@ class SettingsWindow(QtWidgets.QDialog):
         _save_shortcut(
             self.toggle_subtitles_edit, SettingKeys.TOGGLE_SUBTITLES_SHORTCUT
         )
+        _save_shortcut(
+            self.decrease_delay_edit, SettingKeys.DECREASE_SUBTITLE_DELAY_SHORTCUT
+        )
+        _save_shortcut(
+            self.increase_delay_edit, SettingKeys.INCREASE_SUBTITLE_DELAY_SHORTCUT
+        )
 
         super().accept()
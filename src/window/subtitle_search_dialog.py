@@ -0,0 +1,98 @@
+from typing import TYPE_CHECKING
+
+from PySide6 import QtCore, QtWidgets
+from PySide6.QtWidgets import QWidget
+
+from subtitle.subtitle_search_index import MAX_RESULTS, SubtitleSearchIndex
+from utils.helpers import format_time
+
+if TYPE_CHECKING:
+    from media_controller import MediaController
+
+
+class SubtitleSearchDialog(QtWidgets.QDialog):
+    # Lists the cues matching the query as it is typed; activating one seeks
+    # the player to its start. Stays open alongside the player.
+
+    def __init__(
+        self, media_controller: "MediaController", parent: QWidget | None = None
+    ) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Search Subtitles")
+        self.setModal(False)
+        self.resize(480, 400)
+
+        self.media_controller = media_controller
+
+        layout = QtWidgets.QVBoxLayout(self)
+
+        self.query_edit = QtWidgets.QLineEdit()
+        self.query_edit.setPlaceholderText("Search subtitles")
+        self.query_edit.setClearButtonEnabled(True)
+        layout.addWidget(self.query_edit)
+
+        self.results_list = QtWidgets.QListWidget()
+        self.results_list.setUniformItemSizes(True)
+        layout.addWidget(self.results_list)
+
+        self.status_label = QtWidgets.QLabel()
+        layout.addWidget(self.status_label)
+
+        self.query_edit.textChanged.connect(self.refresh_results)
+        self.query_edit.returnPressed.connect(self._seek_to_first_result)
+        self.results_list.itemActivated.connect(self._seek_to_item)
+        media_controller.search_index_changed.connect(lambda _: self.refresh_results())
+        media_controller.subtitle_timing_changed.connect(
+            lambda _: self.refresh_results()
+        )
+
+        self.refresh_results()
+
+    def open_search(self) -> None:
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.query_edit.setFocus()
+        self.query_edit.selectAll()
+
+    def refresh_results(self) -> None:
+        self.results_list.clear()
+
+        subtitles = self.media_controller.subtitles
+        index: SubtitleSearchIndex | None = self.media_controller.search_index
+        if subtitles is None:
+            self.status_label.setText("No subtitles")
+            return
+        if index is None:
+            self.status_label.setText("Indexing…")
+            return
+
+        query = self.query_edit.text()
+        if not query.strip():
+            self.status_label.clear()
+            return
+
+        cue_ids = index.search(query)
+        columns = subtitles.columns
+        timing = subtitles.timing
+        for cue_id in cue_ids:
+            start_ms = max(0, timing.to_media_time(columns.start_times[cue_id]))
+            text = columns.text(cue_id).replace("\n", " ")
+            item = QtWidgets.QListWidgetItem(f"{format_time(start_ms // 1000)}  {text}")
+            item.setData(QtCore.Qt.ItemDataRole.UserRole, cue_id)
+            self.results_list.addItem(item)
+
+        if len(cue_ids) >= MAX_RESULTS:
+            self.status_label.setText(f"First {MAX_RESULTS} matches")
+        else:
+            self.status_label.setText(f"{len(cue_ids)} matches")
+
+    def _seek_to_first_result(self) -> None:
+        item = self.results_list.currentItem() or self.results_list.item(0)
+        if item is not None:
+            self._seek_to_item(item)
+
+    def _seek_to_item(self, item: QtWidgets.QListWidgetItem) -> None:
+        self.media_controller.seek_to_subtitle(
+            item.data(QtCore.Qt.ItemDataRole.UserRole)
+        )
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from PySide6 import QtCore, QtGui
+
+from thumbnail.thumbnail_cache import ThumbnailSheetCache, grid_for_duration
+from utils.disk_cache import DiskCache
+
+
+def test_write_replaces_other_versions_and_evicts_old_entries(tmp_path: Path) -> None:
+    cache = DiskCache("test", ".bin", max_bytes=250, cache_dir=tmp_path / "cache")
+    sources = [tmp_path / f"{i}.txt" for i in range(3)]
+
+    first = cache.entry_path(sources[0], "v1")
+    assert cache.write(first, lambda path: path.write_bytes(b"x" * 100))
+    second = cache.entry_path(sources[0], "v2")
+    assert cache.write(second, lambda path: path.write_bytes(b"x" * 100))
+    assert not first.exists()
+
+    for source in sources[1:]:
+        entry = cache.entry_path(source, "v1")
+        assert cache.write(entry, lambda path: path.write_bytes(b"x" * 100))
+
+    assert sorted(cache.cache_dir.iterdir()) == sorted(
+        cache.entry_path(source, "v1") for source in sources[1:]
+    )
+
+
+def test_failed_write_leaves_nothing_behind(tmp_path: Path) -> None:
+    cache = DiskCache("test", ".bin", max_bytes=1000, cache_dir=tmp_path / "cache")
+
+    def fail(_path: Path) -> None:
+        raise OSError
+
+    assert not cache.write(cache.entry_path(tmp_path / "a", "v1"), fail)
+    assert list(cache.cache_dir.iterdir()) == []
+
+
+def test_thumbnail_sheet_round_trip(tmp_path: Path) -> None:
+    cache = ThumbnailSheetCache(tmp_path / "cache")
+    media_path = tmp_path / "a.mkv"
+    media_path.write_bytes(b"video")
+    grid = grid_for_duration(60_000)
+    sheet = grid.new_sheet()
+    sheet.fill(QtCore.Qt.GlobalColor.red)
+    present = [index % 2 == 0 for index in range(grid.tiles)]
+
+    cache.store(media_path, grid, sheet, present)
+    loaded = cache.load(media_path, grid)
+
+    assert loaded is not None
+    loaded_sheet, loaded_present = loaded
+    assert loaded_present == present
+    assert loaded_sheet.pixelColor(0, 0) == QtGui.QColor("red")
@@ -0,0 +1,26 @@
+from PySide6 import QtGui
+
+from primitive.outlined_text import layout_outlined_text
+from subtitle.subtitle_markup import parse_markup
+
+RED = QtGui.QColor("red").rgba()
+
+
+def _glyph_count(text: str) -> int:
+    return len(layout_outlined_text(text, QtGui.QFont(), -1).glyphs)
+
+
+def test_text_outside_the_bmp_keeps_all_glyphs() -> None:
+    text = "\U0001d400" * 10 + " hello world"
+
+    assert _glyph_count(text) == _glyph_count("A" * 10 + " hello world")
+
+
+def test_runs_after_text_outside_the_bmp_color_the_right_glyphs() -> None:
+    styled = parse_markup('\U0001d400\U0001d400 ab <font color="red">cd</font>')
+    assert styled is not None
+
+    outlined = layout_outlined_text(styled.text, QtGui.QFont(), -1, styled.runs)
+
+    assert outlined.colors[-2:] == (RED, RED)
+    assert RED not in outlined.colors[:-2]
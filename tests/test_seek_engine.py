@@ -0,0 +1,89 @@
+import pytest
+from PySide6 import QtCore
+
+from playback_clock import PlaybackClock
+from seek_engine import SEEK_TIMEOUT_MS, SeekEngine
+
+
+class FakePlayer(QtCore.QObject):
+    positionChanged = QtCore.Signal(int)  # noqa: N815
+
+    def __init__(self, position_ms: int = 0) -> None:
+        super().__init__()
+        self._position_ms = position_ms
+        self.issued: list[int] = []
+
+    def position(self) -> int:
+        return self._position_ms
+
+    def duration(self) -> int:
+        return 3_600_000
+
+    def playbackRate(self) -> float:  # noqa: N802
+        return 1.0
+
+    def setPosition(self, position_ms: int) -> None:  # noqa: N802
+        self.issued.append(position_ms)
+
+    def report(self, position_ms: int) -> None:
+        self._position_ms = position_ms
+        self.positionChanged.emit(position_ms)
+
+
+@pytest.fixture
+def player() -> FakePlayer:
+    return FakePlayer(10_000)
+
+
+@pytest.fixture
+def engine(player: FakePlayer) -> SeekEngine:
+    return SeekEngine(player, PlaybackClock(player))
+
+
+def test_playback_tick_near_target_is_not_a_landing(
+    player: FakePlayer, engine: SeekEngine
+) -> None:
+    engine.seek_to(11_500)
+    player.report(10_040)
+    engine.seek_to(12_000)
+
+    assert player.issued == [11_500]
+    assert engine.metrics().median_ms is None
+
+
+def test_requests_coalesce_until_the_seek_lands(
+    player: FakePlayer, engine: SeekEngine
+) -> None:
+    for target in range(10_500, 13_000, 100):
+        engine.seek_to(target)
+    assert player.issued == [10_500]
+
+    player.report(10_500)
+    assert player.issued == [10_500, 12_900]
+    assert engine.target_ms() == 12_900
+
+    player.report(12_900)
+    metrics = engine.metrics()
+    assert (metrics.requested, metrics.issued, metrics.timed_out) == (25, 2, 0)
+
+
+def test_seek_backwards_lands(player: FakePlayer, engine: SeekEngine) -> None:
+    engine.seek_to(4_000)
+    player.report(10_040)
+    engine.seek_to(5_000)
+    player.report(4_000)
+
+    assert player.issued == [4_000, 5_000]
+
+
+def test_seek_that_never_reports_back_times_out(
+    player: FakePlayer, engine: SeekEngine
+) -> None:
+    engine.seek_to(10_100)
+    engine.seek_to(10_200)
+    loop = QtCore.QEventLoop()
+    QtCore.QTimer.singleShot(SEEK_TIMEOUT_MS + 200, loop.quit)
+    loop.exec()
+
+    assert player.issued == [10_100, 10_200]
+    assert engine.metrics().timed_out == 1
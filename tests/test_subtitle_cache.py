@@ -0,0 +1,34 @@
+import os
+from pathlib import Path
+
+from subtitle.subtitle import Subtitle
+from subtitle.subtitle_cache import SubtitleCache
+
+ORIGINAL = "1\n00:00:01,000 --> 00:00:02,000\nold\n"
+SAVED = "1\n00:00:01,000 --> 00:00:02,000\nnew text\n"
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    cache = SubtitleCache(tmp_path / "cache")
+    path = tmp_path / "a.srt"
+    path.write_text(ORIGINAL, encoding="utf-8")
+    stat = path.stat()
+    cache.store(path, stat, Subtitle.from_file(path).columns)
+
+    columns = cache.load(path, path.stat())
+    assert columns is not None
+    assert columns.text(0) == "old"
+
+
+def test_parse_is_filed_under_the_version_it_read(tmp_path: Path) -> None:
+    cache = SubtitleCache(tmp_path / "cache")
+    path = tmp_path / "a.srt"
+    path.write_text(ORIGINAL, encoding="utf-8")
+    stat = path.stat()
+    columns = Subtitle.from_file(path).columns
+    # Saved while the old contents were being parsed
+    path.write_text(SAVED, encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    cache.store(path, stat, columns)
+
+    assert cache.load(path, path.stat()) is None
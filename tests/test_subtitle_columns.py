@@ -0,0 +1,17 @@
+from subtitle.subtitle import Subtitle
+from subtitle.subtitle_entry import SubtitleEntry
+
+
+def test_snapshot_is_unaffected_by_patches() -> None:
+    subtitle = Subtitle(
+        [SubtitleEntry(i, i * 1000, i * 1000 + 500, f"cue {i}") for i in range(5)]
+    )
+    snapshot = subtitle.columns.snapshot()
+
+    subtitle.replace_cues([2], [SubtitleEntry(3, 2000, 2500, "<i>edited</i>")])
+    subtitle.replace_cues([0], [SubtitleEntry(9, 9000, 9500, "moved")])
+
+    assert [snapshot.text(i) for i in range(len(snapshot))] == [
+        f"cue {i}" for i in range(5)
+    ]
+    assert list(snapshot.start_times) == [0, 1000, 2000, 3000, 4000]
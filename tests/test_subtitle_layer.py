@@ -0,0 +1,29 @@
+from PySide6 import QtCore
+
+from subtitle.subtitle_entry import SubtitleEntry
+from subtitle.subtitle_graphics_item import SubtitleGraphicsItem
+from subtitle.subtitle_layer import SubtitleLayer
+
+
+def _stack(layer: SubtitleLayer) -> list[tuple[str, float]]:
+    return sorted(
+        (item.text, item.pos().y())
+        for item in layer.childItems()
+        if isinstance(item, SubtitleGraphicsItem) and item.isVisible()
+    )
+
+
+def test_empty_cue_leaves_no_gap() -> None:
+    layer = SubtitleLayer()
+    layer.set_geometry(QtCore.QSizeF(800, 600), 1.0)
+    first = SubtitleEntry(1, 0, 1000, "first line\nof a tall cue")
+    second = SubtitleEntry(3, 0, 1000, "second")
+    layer.set_entries([first, second])
+    expected = _stack(layer)
+
+    # The item that showed the tall cue is reused for the empty one
+    layer.set_entries([])
+    layer.set_entries([first, SubtitleEntry(2, 0, 1000, ""), second])
+    layer.set_entries([SubtitleEntry(2, 0, 1000, ""), first, second])
+
+    assert _stack(layer) == expected
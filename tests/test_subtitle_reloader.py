@@ -0,0 +1,148 @@
+import random
+from pathlib import Path
+
+import pytest
+from PySide6 import QtCore
+
+from subtitle.subtitle import Subtitle
+from subtitle.subtitle_reloader import SubtitleReloader, diff_blocks, snapshot_blocks
+
+Cue = tuple[int, int, str]
+
+CUES = [(1000, 2000, "one"), (3000, 4000, "<i>two</i>"), (5000, 6000, "three")]
+
+
+def _timestamp(ms: int) -> str:
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
+
+
+def _srt(cues: list[Cue]) -> str:
+    blocks = [
+        f"{i}\n{_timestamp(start)} --> {_timestamp(end)}\n{text}"
+        for i, (start, end, text) in enumerate(cues, 1)
+    ]
+    return "\n\n".join(blocks) + "\n"
+
+
+def _wait_for(signal: QtCore.SignalInstance) -> list[object]:
+    received = []
+    loop = QtCore.QEventLoop()
+    signal.connect(lambda *args: (received.extend(args), loop.quit()))
+    QtCore.QTimer.singleShot(5000, loop.quit)
+    loop.exec()
+    return received
+
+
+def _random_cue(rng: random.Random) -> Cue:
+    # Few distinct start times, so cues often start together
+    start = rng.randrange(0, 40) * 75
+    text = rng.choice(["a", "b", "<i>c</i>", "d\ne", "<b>f</b> g"])
+    return start, start + rng.randrange(0, 400), text
+
+
+def _edit(rng: random.Random, cues: list[Cue]) -> list[Cue]:
+    cues = list(cues)
+    for _ in range(rng.randrange(1, 4)):
+        position = rng.randrange(len(cues) + 1)
+        action = rng.randrange(4) if cues else 0
+        if action == 0:
+            cues.insert(position, _random_cue(rng))
+        elif action == 1:
+            del cues[position % len(cues)]
+        elif action == 2:
+            start, end, _ = cues[position % len(cues)]
+            cues[position % len(cues)] = (start, end, _random_cue(rng)[2])
+        else:
+            cues[position % len(cues)] = _random_cue(rng)
+    return cues
+
+
+def _visible(subtitle: Subtitle) -> list[tuple[int, int, int, str]]:
+    columns = subtitle.columns
+    return [
+        (
+            columns.start_times[i],
+            columns.end_times[i],
+            columns.indices[i],
+            columns.text(i),
+        )
+        for i in range(len(subtitle))
+    ]
+
+
+def _times(subtitle: Subtitle) -> set[int]:
+    columns = subtitle.columns
+    return {
+        time_ms
+        for i in range(len(subtitle))
+        for time_ms in (
+            columns.start_times[i] - 1,
+            columns.start_times[i],
+            columns.end_times[i],
+            columns.end_times[i] + 1,
+        )
+    }
+
+
+def test_snapshot_matches_fresh_load(tmp_path: Path) -> None:
+    path = tmp_path / "a.srt"
+    path.write_text(_srt(CUES), encoding="utf-8")
+
+    assert snapshot_blocks(path, Subtitle.from_file(path).columns) is not None
+
+
+def test_snapshot_rejects_text_edited_after_load(tmp_path: Path) -> None:
+    path = tmp_path / "a.srt"
+    path.write_text(_srt(CUES), encoding="utf-8")
+    subtitle = Subtitle.from_file(path)
+    path.write_text(_srt([*CUES[:2], (5000, 6000, "edited")]), encoding="utf-8")
+
+    assert snapshot_blocks(path, subtitle.columns) is None
+
+
+def test_watching_stale_subtitles_reloads_them(tmp_path: Path) -> None:
+    path = tmp_path / "a.srt"
+    path.write_text(_srt(CUES), encoding="utf-8")
+    subtitle = Subtitle.from_file(path)
+    path.write_text(_srt([*CUES[:2], (5000, 6000, "edited")]), encoding="utf-8")
+
+    reloader = SubtitleReloader()
+    reloader.watch(subtitle)
+    old, new = _wait_for(reloader.subtitles_replaced)
+    reloader.watch(None)
+    reloader.deleteLater()
+
+    assert old is subtitle
+    assert new.entry(2).text == "edited"
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_patches_match_a_fresh_load(tmp_path: Path, seed: int) -> None:
+    rng = random.Random(seed)
+    cues = [_random_cue(rng) for _ in range(rng.randrange(0, 30))]
+    path = tmp_path / "a.srt"
+    path.write_text(_srt(cues), encoding="utf-8")
+
+    subtitle = Subtitle.from_file(path)
+    reloader = SubtitleReloader()
+    reloader._subtitle = subtitle  # noqa: SLF001
+    reloader._snapshot = snapshot_blocks(path, subtitle.columns)  # noqa: SLF001
+    assert reloader._snapshot is not None  # noqa: SLF001
+
+    for _ in range(15):
+        cues = _edit(rng, cues)
+        path.write_text(_srt(cues), encoding="utf-8")
+        patch = diff_blocks(path, reloader._snapshot)  # noqa: SLF001
+        assert patch is not None
+        reloader._apply_patch(patch)  # noqa: SLF001
+
+        expected = Subtitle.from_file(path)
+        assert _visible(subtitle) == _visible(expected)
+        for time_ms in sorted(_times(subtitle) | _times(expected)):
+            assert [e.text for e in subtitle.get_all_at_time(time_ms)] == [
+                e.text for e in expected.get_all_at_time(time_ms)
+            ], time_ms
+    reloader.deleteLater()
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from subtitle import subtitle_columns, subtitle_timeline
+from subtitle.subtitle import Subtitle
+from subtitle.subtitle_entry import SubtitleEntry
+from subtitle.subtitle_timeline import SubtitleTimeline
+
+
+def _random_entry(rng: random.Random, index: int) -> SubtitleEntry:
+    start = rng.randrange(0, 50) * 40
+    return SubtitleEntry(index, start, start + rng.randrange(-20, 300), f"cue {index}")
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def numpy_available(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> bool:
+    if request.param and not subtitle_timeline.NUMPY_AVAILABLE:
+        pytest.skip("numpy is not installed")
+    monkeypatch.setattr(subtitle_timeline, "NUMPY_AVAILABLE", request.param)
+    monkeypatch.setattr(subtitle_columns, "NUMPY_AVAILABLE", request.param)
+    return request.param
+
+
+@pytest.mark.usefixtures("numpy_available")
+@pytest.mark.parametrize("seed", range(40))
+def test_patched_timeline_matches_a_fresh_one(seed: int) -> None:
+    rng = random.Random(seed)
+    subtitle = Subtitle([_random_entry(rng, i) for i in range(rng.randrange(0, 25))])
+    next_index = len(subtitle)
+
+    for _ in range(20):
+        removed = rng.sample(
+            range(len(subtitle)), min(len(subtitle), rng.randrange(0, 4))
+        )
+        entries = [
+            _random_entry(rng, next_index + i) for i in range(rng.randrange(0, 4))
+        ]
+        next_index += len(entries)
+        subtitle.replace_cues(removed, entries)
+
+        columns = subtitle.columns
+        assert list(columns.start_times) == sorted(columns.start_times)
+        fresh = SubtitleTimeline(columns.start_times, columns.end_times)
+        for time_ms in range(-1, 2400, 7):
+            assert sorted(subtitle.timeline.active_at(time_ms)) == sorted(
+                fresh.active_at(time_ms)
+            ), time_ms
@@ -0,0 +1,15 @@
+import pytest
+
+from subtitle.subtitle_timing import RATE_PRESETS, SubtitleTiming
+
+BOUNDARIES = [*range(0, 3_600_000, 997), *range(0, 3_600_000, 1001)]
+
+
+@pytest.mark.parametrize("rate", RATE_PRESETS.values(), ids=RATE_PRESETS.keys())
+@pytest.mark.parametrize("delay_ms", [0, 1234, -987])
+def test_media_time_is_first_to_reach_subtitle_time(rate: float, delay_ms: int) -> None:
+    timing = SubtitleTiming(delay_ms, rate)
+    for subtitle_ms in BOUNDARIES:
+        media_ms = timing.to_media_time(subtitle_ms)
+        assert timing.to_subtitle_time(media_ms) >= subtitle_ms
+        assert timing.to_subtitle_time(media_ms - 1) < subtitle_ms